@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+FuelFarm batch.py
+
+Purpose: Run many fuel farm "what-if" scenarios across a process pool.
+
+A scenario is a dictionary:
+    levels: Optional mapping of tank name ("tank1", "tank2") to initial level, in feet
+    actions: Sequence of functionality function names, run in order, e.g. ["gate1_open", "pump1_on"]
+    duration: Optional simulated seconds to run the scan engine after the actions
+    dt: Optional scan period for the engine, in seconds (default 1.0)
+
+Results are returned column-wise: a dictionary of NumPy arrays with one row per scenario, in submission order.
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import concurrent.futures
+import os
+import random
+import time
+
+import numpy as np
+
+import Models.FuelFarm.functionality as fff
+import Models.FuelFarm.simulation as ffs
+
+from Models.FuelFarm.components import FuelFarm
+from PipingSystems.component_state import get_state, set_state
+
+TANKS = ("tank1", "tank2")
+VALVES = ("gate1", "gate2", "gate3", "gate4", "gate5", "gate6", "gate7", "gate8", "gate9", "gate10")
+PUMPS = ("pump1", "pump2", "pump3")
+ACTIONS = frozenset(["{}_{}".format(valve, state) for valve in VALVES for state in ("open", "close")] +
+                    ["{}_{}".format(pump, state) for pump in PUMPS for state in ("on", "off")])
+
+# Result columns: (column name, component name, attribute)
+COLUMNS = tuple([("{}_{}".format(tank, field), tank, field) for tank in TANKS
+                 for field in ("level", "static_tank_press", "flow_out")] +
+                [("{}_{}".format(valve, field), valve, field) for valve in VALVES
+                 for field in ("position", "press_in", "flow_in", "press_out", "flow_out")] +
+                [("{}_{}".format(pump, field), pump, field) for pump in PUMPS
+                 for field in ("speed", "flow", "outlet_pressure", "power")])
+
+# Per-process farm, reset to its initial state before every scenario instead of being rebuilt
+_farm = None
+_initial_state = None
+
+
+def _capture(farm):
+    """Record the attribute values of every component in a farm."""
+    return {name: get_state(component) for name, component in vars(farm).items()}
+
+
+def _restore(farm, state):
+    """Return every component in a farm to a recorded state."""
+    for name, attributes in state.items():
+        set_state(getattr(farm, name), attributes)
+
+
+def _worker_farm():
+    """Get this process's farm, creating it on first use."""
+    global _farm, _initial_state
+    if _farm is None:
+        _farm = FuelFarm()
+        _initial_state = _capture(_farm)
+    return _farm
+
+
+def validate(scenario):
+    """Check a scenario before it is sent to a worker.
+
+    :except ValueError: Unknown tank or action name
+    """
+    for tank in scenario.get("levels", {}):
+        if tank not in TANKS:
+            raise ValueError("Unknown tank: {}".format(tank))
+    for action in scenario.get("actions", ()):
+        if action not in ACTIONS:
+            raise ValueError("Unknown action: {}".format(action))
+
+
+def run_scenario(scenario, farm=None):
+    """Run one scenario on a farm reset to its initial conditions.
+
+    :param scenario: Scenario dictionary
+    :param farm: Farm to use; defaults to this process's reusable farm
+
+    :return: Final value of every result column, then elapsed wall time in seconds
+    :rtype: list
+    """
+    start = time.perf_counter()
+    if farm is None:
+        farm = _worker_farm()
+        _restore(farm, _initial_state)
+    for tank, level in scenario.get("levels", {}).items():
+        fff.change_tank_level(getattr(farm, tank), level, farm)
+    for action in scenario.get("actions", ()):
+        getattr(fff, action)(farm)
+    if scenario.get("duration"):
+        ffs.build_engine(scenario.get("dt", 1.0), farm).run(scenario["duration"])
+    row = [getattr(getattr(farm, component), field) for _, component, field in COLUMNS]
+    row.append(time.perf_counter() - start)
+    return row
+
+
+def _run_chunk(scenarios):
+    """Run a list of scenarios in a worker process."""
+    return [run_scenario(scenario) for scenario in scenarios]
+
+
+def run_batch(scenarios, workers=None, chunksize=None):
+    """Run scenarios in parallel and collect their final states.
+
+    Scenarios are sent to the pool in chunks so each worker process reuses one farm for many scenarios.
+
+    :param scenarios: Sequence of scenario dictionaries
+    :param workers: Number of worker processes; defaults to the CPU count. 1 runs everything in this process.
+    :param chunksize: Scenarios per task; defaults to spreading the work over about 4 tasks per worker
+
+    :return: Column name: array of one value per scenario. Includes "scenario" (index) and "elapsed" (seconds).
+    :rtype: dict
+    """
+    scenarios = list(scenarios)
+    for scenario in scenarios:
+        validate(scenario)
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(scenarios) // (workers * 4))
+    chunks = [scenarios[i:i + chunksize] for i in range(0, len(scenarios), chunksize)]
+
+    if workers == 1:
+        rows = [row for chunk in chunks for row in _run_chunk(chunk)]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = [row for result in pool.map(_run_chunk, chunks) for row in result]
+
+    names = [name for name, _, _ in COLUMNS] + ["elapsed"]
+    table = np.array(rows, dtype=np.float64).reshape(len(rows), len(names))
+    results = {"scenario": np.arange(len(rows))}
+    for index, name in enumerate(names):
+        results[name] = table[:, index]
+    return results
+
+
+def random_scenarios(count, seed=None, max_actions=8, duration=0.0):
+    """Generate Monte Carlo scenarios with random tank levels, valve lineups, and pump start orders.
+
+    :param count: Number of scenarios
+    :param seed: Random seed, for repeatable studies
+    :param max_actions: Most actions in one scenario
+    :param duration: Simulated seconds to run each scenario after its actions
+
+    :return: Scenario dictionaries
+    :rtype: list
+    """
+    rng = random.Random(seed)
+    actions = sorted(ACTIONS)
+    return [{"levels": {tank: rng.uniform(0.0, 36.0) for tank in TANKS},
+             "actions": [rng.choice(actions) for _ in range(rng.randint(1, max_actions))],
+             "duration": duration}
+            for _ in range(count)]
+
+
+if __name__ == "__main__":
+    study = run_batch(random_scenarios(1000, seed=1, duration=600))
+    print("Ran {} scenarios; mean tank 1 level {:.2f} ft; mean scenario time {:.1f} us".format(
+        study["scenario"].size, study["tank1_level"].mean(), study["elapsed"].mean() * 1e6))
@@ -8,10 +8,13 @@ Author: Cody Jackson
 
 Date: 6/12/18
 #################################
+Version 0.2
+    Component history is stored in SQLite by Simulation.historian, logged through hmi.dispatcher
 Version 0.1
     Initial build
 """
-# TODO: rewrite to use a SQLite database
+import os
+
 import utility_formulas
 
 from PipingSystems.pump import pump
@@ -22,79 +25,110 @@ from PipingSystems.storage_tank import tank
 DENSITY = 1.629869
 SPEC_GRAVITY = 0.840
 
-# Storage tanks
-# Assumes 36 ft tall tank w/ 1 million gallon capacity = 27778 gallons per foot
-# Assumes 16 inch diam transfer piping
-tank1 = tank.Tank("Tank 1", level=36.0, fluid_density=DENSITY, spec_gravity=SPEC_GRAVITY, outlet_diam=16,
-                  outlet_slope=0.25)
-tank1.static_tank_press = tank1.level
-tank1.gravity_flow(tank1.pipe_diam, tank1.pipe_slope, tank1.pipe_coeff)
-
-tank2 = tank.Tank("Tank 2", level=36.0, fluid_density=DENSITY, spec_gravity=SPEC_GRAVITY, outlet_diam=16,
-                  outlet_slope=0.25)
-tank2.static_tank_press = tank2.level
-tank2.gravity_flow(tank2.pipe_diam, tank2.pipe_slope, tank2.pipe_coeff)
-
-# Pump inlet manifold
-# 16 inch to 4 inch connections
-gate1 = valve.Gate("Gate valve 1", sys_flow_in=tank1.flow_out, press_in=tank1.static_tank_press)
-gate1.calc_coeff(16)
-
-gate2 = valve.Gate("Gate valve 2", sys_flow_in=tank2.flow_out, press_in=tank2.static_tank_press)
-gate2.calc_coeff(16)
-
-gate3 = valve.Gate("Gate valve 3")
-gate3.calc_coeff(16)
-
-gate4 = valve.Gate("Gate valve 4")
-gate4.calc_coeff(16)
-
-gate5 = valve.Gate("Gate valve 5")
-gate5.calc_coeff(4)
-
-gate6 = valve.Gate("Gate valve 6", sys_flow_in=gate3.flow_out + gate4.flow_out,
-                   press_in=gate3.press_out + gate4.press_out)
-gate6.calc_coeff(4)
-
-gate7 = valve.Gate("Gate valve 7")
-gate7.calc_coeff(4)
-
-# Fuel pumps
-# 1480 rpm
-pump1 = pump.PositiveDisplacement("Pump 1",
-                                  flow_rate_out=0.0,
-                                  pump_head_in=utility_formulas.press_to_head(gate5.press_out),
-                                  displacement=0.24)
-
-pump2 = pump.PositiveDisplacement("Pump 2",
-                                  flow_rate_out=0.0,
-                                  pump_head_in=utility_formulas.press_to_head(gate6.press_out),
-                                  displacement=0.24)
-
-pump3 = pump.PositiveDisplacement("Pump 3",
-                                  flow_rate_out=0.0,
-                                  pump_head_in=utility_formulas.press_to_head(gate7.press_out),
-                                  displacement=0.24)
-
-# Pump outlet manifold
-relief1 = valve.Relief("Relief 1", sys_flow_in=pump1.flow, flow_coeff=0.81)
-relief2 = valve.Relief("Relief 2", sys_flow_in=pump2.flow, flow_coeff=0.81)
-relief3 = valve.Relief("Relief 3", sys_flow_in=pump3.flow, flow_coeff=0.81)
-
-throttle1 = valve.Globe("Flow Control 1", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure, flow_coeff=165)
-throttle2 = valve.Globe("Flow Control 2", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure, flow_coeff=165)
-throttle3 = valve.Globe("Flow Control 3", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure, flow_coeff=165)
-
-gate8 = valve.Gate("Gate valve 8", sys_flow_in=pump2.flow + pump3.flow,
-                   press_in=pump2.outlet_pressure or pump3.outlet_pressure)
-gate8.calc_coeff(4)
-
-gate9 = valve.Gate("Gate valve 9", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure)
-gate9.calc_coeff(4)
-
-gate10 = valve.Gate("Gate valve 10", sys_flow_in=pump2.flow + pump3.flow,
-                    press_in=pump2.outlet_pressure or pump3.outlet_pressure)
-gate10.calc_coeff(4)
+# Declarative description of the same plant, for PipingSystems.plant_loader.load_plant()
+PLANT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fuel_farm.json")
+
+
+class FuelFarm:
+    """Independent instance of the fuel farm.
+
+    Every instance builds its own tanks, valves, and pumps with the default topology and initial conditions, so many
+    farms can be simulated in one process. The functions in Models.FuelFarm.functionality accept a farm as their last
+    argument; they default to the module-level farm below.
+
+    Variables: tank1, tank2, gate1 - gate10, pump1 - pump3, relief1 - relief3, throttle1 - throttle3
+    """
+    def __init__(self):
+        # Storage tanks
+        # Assumes 36 ft tall tank w/ 1 million gallon capacity = 27778 gallons per foot
+        # Assumes 16 inch diam transfer piping
+        self.tank1 = tank.Tank("Tank 1", level=36.0, fluid_density=DENSITY, spec_gravity=SPEC_GRAVITY, outlet_diam=16,
+                               outlet_slope=0.25)
+        self.tank1.static_tank_press = self.tank1.level
+        self.tank1.gravity_flow(self.tank1.pipe_diam, self.tank1.pipe_slope, self.tank1.pipe_coeff)
+
+        self.tank2 = tank.Tank("Tank 2", level=36.0, fluid_density=DENSITY, spec_gravity=SPEC_GRAVITY, outlet_diam=16,
+                               outlet_slope=0.25)
+        self.tank2.static_tank_press = self.tank2.level
+        self.tank2.gravity_flow(self.tank2.pipe_diam, self.tank2.pipe_slope, self.tank2.pipe_coeff)
+
+        # Pump inlet manifold
+        # 16 inch to 4 inch connections
+        self.gate1 = valve.Gate("Gate valve 1", sys_flow_in=self.tank1.flow_out, press_in=self.tank1.static_tank_press)
+        self.gate1.calc_coeff(16)
+
+        self.gate2 = valve.Gate("Gate valve 2", sys_flow_in=self.tank2.flow_out, press_in=self.tank2.static_tank_press)
+        self.gate2.calc_coeff(16)
+
+        self.gate3 = valve.Gate("Gate valve 3")
+        self.gate3.calc_coeff(16)
+
+        self.gate4 = valve.Gate("Gate valve 4")
+        self.gate4.calc_coeff(16)
+
+        self.gate5 = valve.Gate("Gate valve 5")
+        self.gate5.calc_coeff(4)
+
+        self.gate6 = valve.Gate("Gate valve 6", sys_flow_in=self.gate3.flow_out + self.gate4.flow_out,
+                                press_in=self.gate3.press_out + self.gate4.press_out)
+        self.gate6.calc_coeff(4)
+
+        self.gate7 = valve.Gate("Gate valve 7")
+        self.gate7.calc_coeff(4)
+
+        # Fuel pumps
+        # 1480 rpm
+        self.pump1 = pump.PositiveDisplacement("Pump 1",
+                                               flow_rate_out=0.0,
+                                               pump_head_in=utility_formulas.press_to_head(self.gate5.press_out),
+                                               displacement=0.24)
+
+        self.pump2 = pump.PositiveDisplacement("Pump 2",
+                                               flow_rate_out=0.0,
+                                               pump_head_in=utility_formulas.press_to_head(self.gate6.press_out),
+                                               displacement=0.24)
+
+        self.pump3 = pump.PositiveDisplacement("Pump 3",
+                                               flow_rate_out=0.0,
+                                               pump_head_in=utility_formulas.press_to_head(self.gate7.press_out),
+                                               displacement=0.24)
+
+        # Pump outlet manifold
+        self.relief1 = valve.Relief("Relief 1", sys_flow_in=self.pump1.flow, flow_coeff=0.81)
+        self.relief2 = valve.Relief("Relief 2", sys_flow_in=self.pump2.flow, flow_coeff=0.81)
+        self.relief3 = valve.Relief("Relief 3", sys_flow_in=self.pump3.flow, flow_coeff=0.81)
+
+        self.throttle1 = valve.Globe("Flow Control 1", sys_flow_in=self.pump1.flow, press_in=self.pump1.outlet_pressure,
+                                     flow_coeff=165)
+        self.throttle2 = valve.Globe("Flow Control 2", sys_flow_in=self.pump1.flow, press_in=self.pump1.outlet_pressure,
+                                     flow_coeff=165)
+        self.throttle3 = valve.Globe("Flow Control 3", sys_flow_in=self.pump1.flow, press_in=self.pump1.outlet_pressure,
+                                     flow_coeff=165)
+
+        self.gate8 = valve.Gate("Gate valve 8", sys_flow_in=self.pump2.flow + self.pump3.flow,
+                                press_in=self.pump2.outlet_pressure or self.pump3.outlet_pressure)
+        self.gate8.calc_coeff(4)
+
+        self.gate9 = valve.Gate("Gate valve 9", sys_flow_in=self.pump1.flow, press_in=self.pump1.outlet_pressure)
+        self.gate9.calc_coeff(4)
+
+        self.gate10 = valve.Gate("Gate valve 10", sys_flow_in=self.pump2.flow + self.pump3.flow,
+                                 press_in=self.pump2.outlet_pressure or self.pump3.outlet_pressure)
+        self.gate10.calc_coeff(4)
+
+
+# Default farm; its components are also available as module attributes for existing code
+default_farm = FuelFarm()
+
+tank1, tank2 = default_farm.tank1, default_farm.tank2
+gate1, gate2, gate3, gate4, gate5 = (default_farm.gate1, default_farm.gate2, default_farm.gate3, default_farm.gate4,
+                                     default_farm.gate5)
+gate6, gate7, gate8, gate9, gate10 = (default_farm.gate6, default_farm.gate7, default_farm.gate8, default_farm.gate9,
+                                      default_farm.gate10)
+pump1, pump2, pump3 = default_farm.pump1, default_farm.pump2, default_farm.pump3
+relief1, relief2, relief3 = default_farm.relief1, default_farm.relief2, default_farm.relief3
+throttle1, throttle2, throttle3 = default_farm.throttle1, default_farm.throttle2, default_farm.throttle3
+
 
 if __name__ == "__main__":
     pass
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+FuelFarm dependencies.py
+
+Purpose: Describe which fuel farm components feed which, so a valve or pump change only re-evaluates what it affects.
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+
+from Simulation.propagation import DependencyGraph
+
+
+def build_graph(farm=ffc):
+    """Build the fuel farm dependency graph.
+
+    Tank 1 feeds gate 1, which feeds gates 3 and 5; tank 2 feeds gate 2, which feeds gates 4 and 7. Gates 3 and 4
+    combine into gate 6. Gates 5, 6, and 7 supply pumps 1, 2, and 3. Pump 1 discharges through gate 9; pumps 2 and 3
+    discharge through gates 8 and 10.
+
+    :param farm: Fuel farm to describe
+
+    :return: Dependency graph over the fuel farm components
+    :rtype: DependencyGraph
+    """
+    graph = DependencyGraph()
+    links = ((farm.tank1, farm.gate1), (farm.tank2, farm.gate2),
+             (farm.gate1, farm.gate3), (farm.gate1, farm.gate5), (farm.gate2, farm.gate4), (farm.gate2, farm.gate7),
+             (farm.gate3, farm.gate6), (farm.gate4, farm.gate6),
+             (farm.gate5, farm.pump1), (farm.gate6, farm.pump2), (farm.gate7, farm.pump3),
+             (farm.pump1, farm.gate9), (farm.pump2, farm.gate8), (farm.pump3, farm.gate8), (farm.pump2, farm.gate10),
+             (farm.pump3, farm.gate10))
+    for upstream, downstream in links:
+        graph.connect(upstream, downstream)
+    return graph
+
+
+def run_action(graph, device, state, farm=ffc):
+    """Operate a valve or pump and propagate the change through the graph.
+
+    :param graph: Graph from build_graph()
+    :param device: Device name, e.g. "gate1" or "pump2"
+    :param state: True to open/start, False to close/stop
+    :param farm: Fuel farm the graph was built from
+
+    :return: Number of components re-evaluated
+    :rtype: int
+    """
+    if device.startswith("pump"):
+        action = getattr(fff, "{}_{}".format(device, "on" if state else "off"))
+    else:
+        action = getattr(fff, "{}_{}".format(device, "open" if state else "close"))
+    return graph.run(lambda: action(farm), getattr(farm, device))
@@ -4,231 +4,236 @@ FuelFarm_functionality.py
 
 Purpose: Ensure valve/pump changes are passed to the rest of the system.
 
+Every function takes an optional farm (components.FuelFarm instance) to act on; the default is the module-level farm in
+components.
+
 Author: Cody Jackson
 
 Date: 6/18/18
 #################################
+Version 0.3
+    Valve/pump changes are logged by hmi.dispatcher with a historian
+Version 0.2
+    Tank flow in/out is integrated by simulation.py
 Version 0.1
     Initial build
 """
 import utility_formulas
 import Models.FuelFarm.components as ffc
 
-# TODO: log valve/pump changes
-
 
 # Gate valve 1
-def gate1_open():
-    ffc.gate1.open()
-    if ffc.tank2.static_tank_press > ffc.tank1.static_tank_press:
-        ffc.gate1.flow_in = ffc.gate1.flow_out = 0.0
-        ffc.gate3.press_in = ffc.gate4.press_out
-        ffc.gate3.flow_in = 0.0  # No flow because of check valves after valves 1 & 2
+def gate1_open(farm=ffc):
+    farm.gate1.open()
+    if farm.tank2.static_tank_press > farm.tank1.static_tank_press:
+        farm.gate1.flow_in = farm.gate1.flow_out = 0.0
+        farm.gate3.press_in = farm.gate4.press_out
+        farm.gate3.flow_in = 0.0  # No flow because of check valves after valves 1 & 2
     else:
-        ffc.gate3.press_in = ffc.gate1.press_out
-        ffc.gate3.flow_in = ffc.gate1.flow_out
-        ffc.gate5.press_in = ffc.gate1.press_out
-        ffc.gate5.flow_in = ffc.gate1.flow_out
+        farm.gate3.press_in = farm.gate1.press_out
+        farm.gate3.flow_in = farm.gate1.flow_out
+        farm.gate5.press_in = farm.gate1.press_out
+        farm.gate5.flow_in = farm.gate1.flow_out
 
 
-def gate1_close():
-    ffc.gate1.close()
-    ffc.gate3.press_in = ffc.gate4.press_out
-    ffc.gate3.flow_in = ffc.gate4.flow_out
-    ffc.gate5.press_in = ffc.gate3.press_out
-    ffc.gate5.flow_in = ffc.gate3.flow_out
+def gate1_close(farm=ffc):
+    farm.gate1.close()
+    farm.gate3.press_in = farm.gate4.press_out
+    farm.gate3.flow_in = farm.gate4.flow_out
+    farm.gate5.press_in = farm.gate3.press_out
+    farm.gate5.flow_in = farm.gate3.flow_out
 
 
 # Gate valve 2
-def gate2_open():
-    ffc.gate2.open()
-    if ffc.tank2.static_tank_press < ffc.tank1.static_tank_press:
-        ffc.gate2.flow_in = ffc.gate2.flow_out = 0.0
-        ffc.gate4.press_in = ffc.gate3.press_out
-        ffc.gate4.flow_in = 0.0  # No flow because of check valves after valves 1 & 2
+def gate2_open(farm=ffc):
+    farm.gate2.open()
+    if farm.tank2.static_tank_press < farm.tank1.static_tank_press:
+        farm.gate2.flow_in = farm.gate2.flow_out = 0.0
+        farm.gate4.press_in = farm.gate3.press_out
+        farm.gate4.flow_in = 0.0  # No flow because of check valves after valves 1 & 2
     else:
-        ffc.gate4.press_in = ffc.gate2.press_out
-        ffc.gate4.flow_in = ffc.gate2.flow_out
-        ffc.gate7.press_in = ffc.gate2.press_out
-        ffc.gate7.flow_in = ffc.gate2.flow_out
+        farm.gate4.press_in = farm.gate2.press_out
+        farm.gate4.flow_in = farm.gate2.flow_out
+        farm.gate7.press_in = farm.gate2.press_out
+        farm.gate7.flow_in = farm.gate2.flow_out
 
 
-def gate2_close():
-    ffc.gate2.close()
-    ffc.gate4.press_in = ffc.gate4.press_out
-    ffc.gate4.flow_in = ffc.gate4.flow_out
-    ffc.gate7.press_in = ffc.gate4.press_out
-    ffc.gate7.flow_in = ffc.gate4.flow_out
+def gate2_close(farm=ffc):
+    farm.gate2.close()
+    farm.gate4.press_in = farm.gate4.press_out
+    farm.gate4.flow_in = farm.gate4.flow_out
+    farm.gate7.press_in = farm.gate4.press_out
+    farm.gate7.flow_in = farm.gate4.flow_out
 
 
 # Gate valve 3
-def gate3_open():
-    ffc.gate3.open()
-    if ffc.gate1.position == 100 and ffc.gate2.position == 100 and ffc.gate4.position == 100:  # dual input
-        if ffc.gate3.press_out > ffc.gate4.press_out:  # pressure from tank 1 > tank 2
-            ffc.gate6.press_in = ffc.gate3.press_out
-            ffc.gate4.press_in = ffc.gate3.press_out
-        elif ffc.gate3.press_out < ffc.gate4.press_out:  # pressure from tank 1 < tank 2
-            ffc.gate3.press_in = ffc.gate4.press_out
-            ffc.gate6.press_in = ffc.gate4.press_out
+def gate3_open(farm=ffc):
+    farm.gate3.open()
+    if farm.gate1.position == 100 and farm.gate2.position == 100 and farm.gate4.position == 100:  # dual input
+        if farm.gate3.press_out > farm.gate4.press_out:  # pressure from tank 1 > tank 2
+            farm.gate6.press_in = farm.gate3.press_out
+            farm.gate4.press_in = farm.gate3.press_out
+        elif farm.gate3.press_out < farm.gate4.press_out:  # pressure from tank 1 < tank 2
+            farm.gate3.press_in = farm.gate4.press_out
+            farm.gate6.press_in = farm.gate4.press_out
     else:  # Pout from valves 3 & 4 is equal
-        ffc.gate6.press_in = ffc.gate3.press_out  # doesn't matter which Pout to use
-    # ffc.gate6.flow_in = ffc.gate3.flow_out + ffc.gate4.flow_out  # combined flow from valves 3 & 4
-    if ffc.gate1.position == 0 and (ffc.gate2.position == 0 or ffc.gate4.position == 0): # no input flow
-        ffc.gate3.press_in = ffc.gate3.flow_in = ffc.gate3.press_out = ffc.gate3.flow_out = 0.0  # Ensure null values
-    if ffc.gate2.position == 0:  # valve 3 provides flow to valve 4
-        ffc.gate4.press_in = ffc.gate3.press_out
-        ffc.gate4.flow_in = ffc.gate6.flow_in = ffc.gate3.flow_out
-    if ffc.gate1.position == 0:  # valve 4 provides flow to valve 3
-        ffc.gate5.press_in = ffc.gate3.press_out
-        ffc.gate5.flow_in = ffc.gate6.flow_in = ffc.gate3.flow_out
-
-
-def gate3_close():
-    ffc.gate3.close()
-    ffc.gate6.press_in = ffc.gate4.press_out
-    ffc.gate6.flow_in = ffc.gate4.flow_out
-    if ffc.gate2.position == 0:
-        ffc.gate4.press_in = 0.0
-        ffc.gate4.flow_in = 0.0
+        farm.gate6.press_in = farm.gate3.press_out  # doesn't matter which Pout to use
+    # farm.gate6.flow_in = farm.gate3.flow_out + farm.gate4.flow_out  # combined flow from valves 3 & 4
+    if farm.gate1.position == 0 and (farm.gate2.position == 0 or farm.gate4.position == 0): # no input flow
+        # Ensure null values
+        farm.gate3.press_in = farm.gate3.flow_in = farm.gate3.press_out = farm.gate3.flow_out = 0.0
+    if farm.gate2.position == 0:  # valve 3 provides flow to valve 4
+        farm.gate4.press_in = farm.gate3.press_out
+        farm.gate4.flow_in = farm.gate6.flow_in = farm.gate3.flow_out
+    if farm.gate1.position == 0:  # valve 4 provides flow to valve 3
+        farm.gate5.press_in = farm.gate3.press_out
+        farm.gate5.flow_in = farm.gate6.flow_in = farm.gate3.flow_out
+
+
+def gate3_close(farm=ffc):
+    farm.gate3.close()
+    farm.gate6.press_in = farm.gate4.press_out
+    farm.gate6.flow_in = farm.gate4.flow_out
+    if farm.gate2.position == 0:
+        farm.gate4.press_in = 0.0
+        farm.gate4.flow_in = 0.0
 
 
 # Gate valve 4
-def gate4_open():
-    ffc.gate4.open()
-    if ffc.gate2.position == 100 and ffc.gate1.position == 100 and ffc.gate3.position == 100:  # dual input
-        if ffc.gate3.press_out > ffc.gate4.press_out:  # pressure from tank 1 > tank 2
-            ffc.gate6.press_in = ffc.gate3.press_out
-            ffc.gate4.press_in = ffc.gate3.press_out
-        elif ffc.gate3.press_out < ffc.gate4.press_out:  # pressure from tank 1 < tank 2
-            ffc.gate6.press_in = ffc.gate4.press_out
-            ffc.gate3.press_in = ffc.gate4.press_out
+def gate4_open(farm=ffc):
+    farm.gate4.open()
+    if farm.gate2.position == 100 and farm.gate1.position == 100 and farm.gate3.position == 100:  # dual input
+        if farm.gate3.press_out > farm.gate4.press_out:  # pressure from tank 1 > tank 2
+            farm.gate6.press_in = farm.gate3.press_out
+            farm.gate4.press_in = farm.gate3.press_out
+        elif farm.gate3.press_out < farm.gate4.press_out:  # pressure from tank 1 < tank 2
+            farm.gate6.press_in = farm.gate4.press_out
+            farm.gate3.press_in = farm.gate4.press_out
     else:  # Pout from valves 3 & 4 is equal
-        ffc.gate6.press_in = ffc.gate4.press_out  # doesn't matter which Pout to use
-    # ffc.gate6.flow_in = ffc.gate4.flow_out + ffc.gate3.flow_out  # combined flow from valves 3 & 4
-    if ffc.gate2.position == 0 and (ffc.gate1.position == 0 or ffc.gate3.position == 0):  # no input flow
-        ffc.gate4.press_in = ffc.gate4.flow_in = ffc.gate4.press_out = ffc.gate4.flow_out = 0.0  # ensure null values
-    if ffc.gate1.position == 0:  # valve 4 provides flow to valve 3
-        ffc.gate3.press_in = ffc.gate4.press_out
-        ffc.gate3.flow_in = ffc.gate6.flow_in = ffc.gate4.flow_out
-    if ffc.gate2.position == 0:  # valve 3 provides flow to valve 4
-        ffc.gate7.press_in = ffc.gate4.press_out
-        ffc.gate7.flow_in = ffc.gate6.flow_in = ffc.gate4.flow_out
-
-
-def gate4_close():
-    ffc.gate4.close()
-    ffc.gate6.press_in = ffc.gate3.press_out
-    ffc.gate6.flow_in = ffc.gate3.flow_out
-    if ffc.gate1.position == 0:
-        ffc.gate3.press_in = 0.0
-        ffc.gate3.flow_in = 0.0
+        farm.gate6.press_in = farm.gate4.press_out  # doesn't matter which Pout to use
+    # farm.gate6.flow_in = farm.gate4.flow_out + farm.gate3.flow_out  # combined flow from valves 3 & 4
+    if farm.gate2.position == 0 and (farm.gate1.position == 0 or farm.gate3.position == 0):  # no input flow
+        # ensure null values
+        farm.gate4.press_in = farm.gate4.flow_in = farm.gate4.press_out = farm.gate4.flow_out = 0.0
+    if farm.gate1.position == 0:  # valve 4 provides flow to valve 3
+        farm.gate3.press_in = farm.gate4.press_out
+        farm.gate3.flow_in = farm.gate6.flow_in = farm.gate4.flow_out
+    if farm.gate2.position == 0:  # valve 3 provides flow to valve 4
+        farm.gate7.press_in = farm.gate4.press_out
+        farm.gate7.flow_in = farm.gate6.flow_in = farm.gate4.flow_out
+
+
+def gate4_close(farm=ffc):
+    farm.gate4.close()
+    farm.gate6.press_in = farm.gate3.press_out
+    farm.gate6.flow_in = farm.gate3.flow_out
+    if farm.gate1.position == 0:
+        farm.gate3.press_in = 0.0
+        farm.gate3.flow_in = 0.0
 
 
 # Gate valve 5
-def gate5_open():
-    ffc.gate5.open()
-    ffc.pump1.head_in = utility_formulas.press_to_head(ffc.gate5.press_out)
+def gate5_open(farm=ffc):
+    farm.gate5.open()
+    farm.pump1.head_in = utility_formulas.press_to_head(farm.gate5.press_out)
 
 
-def gate5_close():
-    ffc.gate5.close()
+def gate5_close(farm=ffc):
+    farm.gate5.close()
 
 
 # Gate valve 6
-def gate6_open():
-    ffc.gate6.open()
-    ffc.pump2.head_in = utility_formulas.press_to_head(ffc.gate6.press_out)
+def gate6_open(farm=ffc):
+    farm.gate6.open()
+    farm.pump2.head_in = utility_formulas.press_to_head(farm.gate6.press_out)
 
 
-def gate6_close():
-    ffc.gate6.close()
-    ffc.pump2.head_in = 0.0
+def gate6_close(farm=ffc):
+    farm.gate6.close()
+    farm.pump2.head_in = 0.0
 
 
 # Gate valve 7
-def gate7_open():
-    ffc.gate7.open()
-    ffc.pump3.head_in = utility_formulas.press_to_head(ffc.gate7.press_out)
-
+def gate7_open(farm=ffc):
+    farm.gate7.open()
+    farm.pump3.head_in = utility_formulas.press_to_head(farm.gate7.press_out)
 
-def gate7_close():
-    ffc.gate7.close()
-    ffc.pump3.head_in = 0.0
 
-# TODO: Account for flow in/out of tanks
+def gate7_close(farm=ffc):
+    farm.gate7.close()
+    farm.pump3.head_in = 0.0
 
 
 # Gate valve 8
-def gate8_open():
-    ffc.gate8.open()
+def gate8_open(farm=ffc):
+    farm.gate8.open()
 
 
-def gate8_close():
-    ffc.gate8.close()
+def gate8_close(farm=ffc):
+    farm.gate8.close()
 
 
 # Gate valve 9
-def gate9_open():
-    ffc.gate9.open()
+def gate9_open(farm=ffc):
+    farm.gate9.open()
 
 
-def gate9_close():
-    ffc.gate9.close()
+def gate9_close(farm=ffc):
+    farm.gate9.close()
 
 
 # Gate valve 10
-def gate10_open():
-    ffc.gate10.open()
+def gate10_open(farm=ffc):
+    farm.gate10.open()
 
 
-def gate10_close():
-    ffc.gate10.close()
+def gate10_close(farm=ffc):
+    farm.gate10.close()
 
 
 # Change tank level
-def change_tank_level(tank, level):
+def change_tank_level(tank, level, farm=ffc):
     tank.level = level
     tank.static_tank_press = tank.level
-    if tank == ffc.tank1:
-        ffc.gate1.press_in = ffc.tank1.static_tank_press
-    elif tank == ffc.tank2:
-        ffc.gate2.press_in = ffc.tank2.static_tank_press
+    if tank == farm.tank1:
+        farm.gate1.press_in = farm.tank1.static_tank_press
+    elif tank == farm.tank2:
+        farm.gate2.press_in = farm.tank2.static_tank_press
     else:
         return "Invalid tank number."
 
 
 # Pump 1
-def pump1_on():
-    ffc.pump1.adjust_speed(1480)
-    ffc.pump1.outlet_pressure = ffc.gate9.press_in = 50
-    ffc.gate9.flow_in = ffc.pump1.flow
+def pump1_on(farm=ffc):
+    farm.pump1.adjust_speed(1480)
+    farm.pump1.outlet_pressure = farm.gate9.press_in = 50
+    farm.gate9.flow_in = farm.pump1.flow
 
 
-def pump1_off():
-    ffc.pump1.adjust_speed(0)
-    ffc.pump1.outlet_pressure = 0
+def pump1_off(farm=ffc):
+    farm.pump1.adjust_speed(0)
+    farm.pump1.outlet_pressure = 0
 
 
 # Pump 2
-def pump2_on():
-    ffc.pump2.adjust_speed(1480)
-    ffc.pump2.outlet_pressure = ffc.gate8.press_in = 50
-    ffc.gate8.flow_in = ffc.pump2.flow + ffc.pump3.flow
+def pump2_on(farm=ffc):
+    farm.pump2.adjust_speed(1480)
+    farm.pump2.outlet_pressure = farm.gate8.press_in = 50
+    farm.gate8.flow_in = farm.pump2.flow + farm.pump3.flow
 
 
-def pump2_off():
-    ffc.pump2.adjust_speed(0)
-    ffc.pump2.outlet_pressure = 0
+def pump2_off(farm=ffc):
+    farm.pump2.adjust_speed(0)
+    farm.pump2.outlet_pressure = 0
 
 
 # Pump 3
-def pump3_on():
-    ffc.pump3.adjust_speed(1480)
-    ffc.pump3.outlet_pressure = ffc.gate8.press_in = 50
-    ffc.gate8.flow_in = ffc.pump3.flow + ffc.pump2.flow
+def pump3_on(farm=ffc):
+    farm.pump3.adjust_speed(1480)
+    farm.pump3.outlet_pressure = farm.gate8.press_in = 50
+    farm.gate8.flow_in = farm.pump3.flow + farm.pump2.flow
 
 
-def pump3_off():
-    ffc.pump3.adjust_speed(0)
-    ffc.pump3.outlet_pressure = 0
+def pump3_off(farm=ffc):
+    farm.pump3.adjust_speed(0)
+    farm.pump3.outlet_pressure = 0
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+FuelFarm network.py
+
+Purpose: Describe the fuel farm as a hydraulic network so the whole plant can be solved in one call.
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import Models.FuelFarm.components as ffc
+
+from Simulation.network import HydraulicNetwork
+
+# Assumes the fueling hydrants downstream of gates 8, 9, and 10 are held at the pump discharge pressure used by
+# functionality.pump1_on() etc.
+HYDRANT_PRESS = 50.0
+
+
+def build_network(farm=ffc):
+    """Build the fuel farm network.
+
+    Tank 1 -> gate 1 -> header A; tank 2 -> gate 2 -> header B; gates 3 and 4 join headers A and B to header C.
+    Pump 1 draws from header A through gate 5, pump 2 from header C through gate 6, pump 3 from header B through gate 7.
+    Pump 1 discharges through gate 9; pumps 2 and 3 share a discharge header feeding gates 8 and 10.
+
+    :param farm: Fuel farm to describe
+
+    :return: Network referencing the fuel farm components
+    :rtype: HydraulicNetwork
+    """
+    network = HydraulicNetwork(spec_grav=ffc.SPEC_GRAVITY)
+    network.add_tank(farm.tank1, "tank1")
+    network.add_tank(farm.tank2, "tank2")
+    network.add_node("hydrant", pressure=HYDRANT_PRESS)
+
+    network.add_valve(farm.gate1, "tank1", "header A")
+    network.add_valve(farm.gate2, "tank2", "header B")
+    network.add_valve(farm.gate3, "header A", "header C")
+    network.add_valve(farm.gate4, "header B", "header C")
+    network.add_valve(farm.gate5, "header A", "pump1 suction")
+    network.add_valve(farm.gate6, "header C", "pump2 suction")
+    network.add_valve(farm.gate7, "header B", "pump3 suction")
+
+    network.add_pump(farm.pump1, "pump1 suction", "pump1 discharge")
+    network.add_pump(farm.pump2, "pump2 suction", "discharge header")
+    network.add_pump(farm.pump3, "pump3 suction", "discharge header")
+
+    network.add_valve(farm.gate9, "pump1 discharge", "hydrant")
+    network.add_valve(farm.gate8, "discharge header", "hydrant")
+    network.add_valve(farm.gate10, "discharge header", "hydrant")
+    return network
+
+
+def solve(network=None):
+    """Solve the fuel farm and write the consistent state onto its valves and pumps.
+
+    :param network: Network from build_network(); built if not provided
+
+    :return: Solved state
+    :rtype: Simulation.network.NetworkSolution
+    """
+    if network is None:
+        network = build_network()
+    solution = network.solve()
+    network.apply(solution)
+    return solution
+
+
+if __name__ == "__main__":
+    for gate in (ffc.gate1, ffc.gate5, ffc.gate9):
+        gate.open()
+    ffc.pump1.adjust_speed(1480)
+    result = solve()
+    print("Converged in {} iterations".format(result.iterations))
+    for name in ("header A", "pump1 suction", "pump1 discharge"):
+        print("{}: {:.3f} psi".format(name, result.pressure(name)))
+    print("Pump 1 flow: {:.1f} gpm".format(ffc.pump1.flow))
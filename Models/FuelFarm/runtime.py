@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+FuelFarm runtime.py
+
+Purpose: Run the fuel farm in real time under the asyncio PLC runtime.
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.2
+    Optional historian for valve and pump changes
+Version 0.1
+    Initial build
+"""
+import asyncio
+
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.simulation as ffs
+
+from Models.FuelFarm.batch import COLUMNS
+from Simulation.runtime import PLCRuntime
+from hmi.dispatcher import fuel_farm_dispatcher
+
+
+def telemetry(farm=ffc):
+    """Make a snapshot function for the farm's tank, valve, and pump values.
+
+    :return: Callable returning {"tank1_level": ..., "gate1_position": ..., ...}
+    """
+    fields = [(name, getattr(farm, component), field) for name, component, field in COLUMNS]
+    return lambda: {name: getattr(component, field) for name, component, field in fields}
+
+
+def recorder_fields(farm=ffc):
+    """Fields captured by a telemetry recorder: tank levels, valve positions, and pump speeds, flows, and power.
+
+    :return: (name, component, attribute) for Simulation.recorder.TelemetryRecorder
+    :rtype: list
+    """
+    return [(name, getattr(farm, component), field) for name, component, field in COLUMNS
+            if field in ("level", "position", "speed", "flow", "power")]
+
+
+def build_runtime(period=0.01, farm=ffc, history=None, historian=None):
+    """Create a real-time runtime for the fuel farm.
+
+    Simulated time advances by one scan period per scan, so the plant runs at real-time speed.
+
+    :param period: Seconds per scan
+    :param farm: Fuel farm to run
+    :param history: Optional history writer, see PLCRuntime
+    :param historian: Optional Simulation.historian.Historian logging every valve and pump change
+
+    :return: Configured runtime; device commands are (group, state) pairs, e.g. ("gate1", True)
+    :rtype: PLCRuntime
+    """
+    return PLCRuntime(ffs.build_engine(period, farm), period, telemetry(farm), fuel_farm_dispatcher(farm, historian),
+                      history)
+
+
+if __name__ == "__main__":
+    async def demo():
+        runtime = build_runtime()
+        server = await runtime.serve_telemetry(port=5020)
+        print("Telemetry on {}:{}".format(*server.sockets[0].getsockname()[:2]))
+        for command in (("gate1", True), ("gate5", True), ("pump1", True)):
+            runtime.submit(command)
+        stats = await runtime.run(duration=5)
+        server.close()
+        print("Tank 1 level: {:.4f} ft".format(ffc.tank1.level))
+        print(stats)
+
+    asyncio.run(demo())
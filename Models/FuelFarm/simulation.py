@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+FuelFarm simulation.py
+
+Purpose: Connect the fuel farm model to the scan-cycle engine so tank levels respond to pump flow.
+
+Every scan the new tank levels are passed down the dependency graph (dependencies.py), so the valves after each tank
+and the suction head of each pump follow the draining tanks. A running pump whose suction tanks are all empty loses
+suction and delivers no flow until one of them holds fuel again.
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.2
+    Tank level changes propagate to downstream valves and pump suction; pumps lose suction at empty tanks
+Version 0.1
+    Initial build
+"""
+import utility_formulas
+import Models.FuelFarm.components as ffc
+
+from Models.FuelFarm.dependencies import build_graph
+from Simulation.engine import ScanEngine
+
+# Assumes 36 ft tall tank w/ 1 million gallon capacity = 27778 gallons per foot
+GALLONS_PER_FOOT = 27778
+
+
+# Suction lineups for each valve position combination; there are only 2**7 of them
+_lineups = {}
+
+
+def _trace_lineup(farm):
+    """Trace which tanks each pump can reach through open suction valves.
+
+    Manifold layout: tank 1 -> gate 1 -> header A; tank 2 -> gate 2 -> header B; gates 3 and 4 join headers A and B
+    to header C. Pump 1 draws from header A (gate 5), pump 2 from header C (gate 6), pump 3 from header B (gate 7).
+
+    :return: Tank indexes (0 = tank 1, 1 = tank 2) reachable by each pump
+    :rtype: tuple
+    """
+    links = ((0, "A", farm.gate1), (1, "B", farm.gate2), ("A", "C", farm.gate3), ("B", "C", farm.gate4),
+             ("A", "pump1", farm.gate5), ("C", "pump2", farm.gate6), ("B", "pump3", farm.gate7))
+    open_links = [(end1, end2) for end1, end2, gate in links if gate.position == 100]
+    lineup = []
+    for pump in ("pump1", "pump2", "pump3"):
+        visited = {pump}
+        frontier = [pump]
+        while frontier:
+            node = frontier.pop()
+            for end1, end2 in open_links:
+                for here, there in ((end1, end2), (end2, end1)):
+                    if here == node and there not in visited:
+                        visited.add(there)
+                        frontier.append(there)
+        lineup.append(tuple(sorted(node for node in visited if node in (0, 1))))
+    return tuple(lineup)
+
+
+def _current_lineup(farm):
+    """Get the traced suction lineup for the current valve positions."""
+    key = (farm.gate1.position, farm.gate2.position, farm.gate3.position, farm.gate4.position, farm.gate5.position,
+           farm.gate6.position, farm.gate7.position)
+    try:
+        return _lineups[key]
+    except KeyError:
+        lineup = _lineups[key] = _trace_lineup(farm)
+        return lineup
+
+
+def suction_tanks(pump, farm=ffc):
+    """Find the tanks a pump can draw from through open suction valves.
+
+    :param pump: Pump 1, 2, or 3
+    :param farm: Fuel farm the pump belongs to
+
+    :return: Tanks lined up to the pump
+    :rtype: list
+    """
+    pumps = (farm.pump1, farm.pump2, farm.pump3)
+    tanks = (farm.tank1, farm.tank2)
+    sources = _current_lineup(farm)[[p is pump for p in pumps].index(True)]
+    return [tanks[index] for index in sources]
+
+
+def tank_draw(tank, farm=ffc):
+    """Total flow drawn from a tank by running pumps, in gpm.
+
+    Each pump's flow is split equally between the tanks lined up to it that still hold fuel.
+    """
+    tanks = (farm.tank1, farm.tank2)
+    index = tanks.index(tank)
+    draw = 0.0
+    for pump, sources in zip((farm.pump1, farm.pump2, farm.pump3), _current_lineup(farm)):
+        filled = [source for source in sources if tanks[source].level > 0]
+        if index in filled and pump.speed > 0:
+            draw += pump.flow / len(filled)
+    return draw
+
+
+def suction_head(pump, farm=ffc):
+    """Suction head of a pump, in ft: the pressure of the fullest tank lined up to it, or 0 if none are."""
+    press = max((tank.static_tank_press for tank in suction_tanks(pump, farm)), default=0.0)
+    return utility_formulas.press_to_head(press)
+
+
+def build_suction_graph(farm=ffc):
+    """Build the fuel farm dependency graph with pump suction taken from the traced lineups.
+
+    The dependency graph follows the valves from each tank to its usual pump. Through the cross-connecting gates 3 and
+    4 a pump can also draw from the other tank, so every pump is connected to both tanks and takes its suction head
+    from suction_head().
+
+    :param farm: Fuel farm to describe
+
+    :return: Dependency graph over the fuel farm components
+    :rtype: DependencyGraph
+    """
+    def gather(pump, upstream):
+        pump.head_in = suction_head(pump, farm)
+
+    graph = build_graph(farm)
+    for pump in (farm.pump1, farm.pump2, farm.pump3):
+        graph.add_component(pump, gather=gather)
+        graph.connect(farm.tank1, pump)
+        graph.connect(farm.tank2, pump)
+    return graph
+
+
+def check_suction(starved, farm=ffc):
+    """Stop the flow of running pumps whose suction tanks are all empty, and restore it once they are not.
+
+    :param starved: Flow each starved pump delivered before losing suction, keyed by id(); kept between calls
+    :param farm: Fuel farm to check
+
+    :return: Pumps whose flow changed
+    :rtype: list
+    """
+    tanks = (farm.tank1, farm.tank2)
+    changed = []
+    for pump, sources in zip((farm.pump1, farm.pump2, farm.pump3), _current_lineup(farm)):
+        key = id(pump)
+        dry = pump.speed > 0 and bool(sources) and all(tanks[source].level <= 0 for source in sources)
+        if dry and pump.flow != 0:
+            starved[key] = pump.flow
+            pump.flow = 0.0
+            changed.append(pump)
+        elif not dry and key in starved:
+            flow = starved.pop(key)
+            if pump.speed > 0 and pump.flow == 0:
+                pump.flow = flow
+                changed.append(pump)
+    return changed
+
+
+def refresh(farm=ffc, graph=None, starved=None):
+    """Pass new tank levels on to the valves and pumps downstream of the tanks.
+
+    :param farm: Fuel farm to refresh
+    :param graph: Graph from build_suction_graph(); built for this call if not given
+    :param starved: Flows of pumps that lost suction, as kept by check_suction(); a fresh record if not given
+
+    :return: Number of components re-evaluated
+    :rtype: int
+    """
+    if graph is None:
+        graph = build_suction_graph(farm)
+    pumps = check_suction({} if starved is None else starved, farm)
+    return graph.changed(farm.tank1, farm.tank2, *pumps)
+
+
+def build_engine(dt=1.0, farm=ffc):
+    """Create a scan engine that drains the fuel farm tanks through the running pumps.
+
+    :param dt: Simulated seconds per scan
+    :param farm: Fuel farm to simulate
+
+    :return: Configured engine
+    :rtype: ScanEngine
+    """
+    engine = ScanEngine(dt)
+    graph = build_suction_graph(farm)
+    starved = {}
+    engine.add_tank(farm.tank1, GALLONS_PER_FOOT, outflows=[lambda: tank_draw(farm.tank1, farm)])
+    engine.add_tank(farm.tank2, GALLONS_PER_FOOT, outflows=[lambda: tank_draw(farm.tank2, farm)])
+    engine.add_task(lambda: refresh(farm, graph, starved))
+    return engine
+
+
+if __name__ == "__main__":
+    import Models.FuelFarm.functionality as fff
+
+    fff.gate1_open()
+    fff.gate5_open()
+    fff.pump1_on()
+    stats = build_engine().run(3600)
+    print("Tank 1 level after 1 hour: {:.2f} ft".format(ffc.tank1.level))
+    print("{:.0f} scans/s, {:.0f}x real time, {} overruns".format(stats.scan_rate, stats.speed, stats.overruns))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC component_state.py
+
+Purpose: Read and write the stored attributes of slotted components (valves, pumps, tanks).
+
+The component classes use __slots__ instead of a per-instance __dict__, so vars() no longer works on them. These helpers
+return the same attribute names vars() used to, including name-mangled private attributes such as "_Valve__position".
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+_names = {}  # Class: attribute names
+
+
+def attribute_names(cls):
+    """Get the stored attribute names of a class, base classes first.
+
+    :param cls: Component class
+
+    :return: Attribute names, with private names mangled the way Python stores them
+    :rtype: tuple
+    """
+    try:
+        return _names[cls]
+    except KeyError:
+        pass
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for slot in slots:
+            if slot in ("__dict__", "__weakref__"):
+                continue
+            if slot.startswith("__") and not slot.endswith("__"):
+                slot = "_{}{}".format(klass.__name__.lstrip("_"), slot)
+            names.append(slot)
+    _names[cls] = tuple(names)
+    return _names[cls]
+
+
+def get_state(component):
+    """Copy a component's stored attributes into a dictionary.
+
+    :param component: Valve, pump, tank, or any object using __slots__ or __dict__
+
+    :return: Attribute name: value
+    :rtype: dict
+    """
+    state = {name: getattr(component, name) for name in attribute_names(type(component)) if hasattr(component, name)}
+    state.update(getattr(component, "__dict__", {}))
+    return state
+
+
+def set_state(component, state):
+    """Write attributes previously read with get_state() back onto a component.
+
+    Values are stored directly, bypassing property validation.
+    """
+    for name, value in state.items():
+        setattr(component, name, value)
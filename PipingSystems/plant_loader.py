@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC plant_loader.py
+
+Purpose: Build a complete plant from a declarative file.
+
+A plant file (JSON; TOML, and YAML when PyYAML is installed) holds a list of components:
+
+    {"components": [
+        {"id": "tank1", "type": "tank", "name": "Tank 1", "level": 36.0, "outlet_diam": 16, "outlet_slope": 0.25},
+        {"id": "gate1", "type": "gate", "name": "Gate valve 1", "diameter": 16, "inlets": ["tank1"]},
+        {"id": "pump1", "type": "positive_displacement", "displacement": 0.24, "inlets": ["gate1"]}
+    ]}
+
+Every component needs a unique "id" and a "type": tank, gate, globe, relief, centrifugal, or positive_displacement.
+Other keys are the class's constructor parameters, plus:
+    inlets: ids of the components feeding this one
+    diameter: valves only; sets Cv with Valve.calc_coeff()
+    pipe_coeff: tanks only; outlet pipe roughness coefficient
+
+Tanks get their static pressure and gravity flow calculated, and valves at position 100 are opened. A valve without
+sys_flow_in/press_in, or a pump without pump_head_in, takes them from its inlets: total upstream flow and highest
+upstream pressure.
+
+Files are compiled once (validated, ordered, reduced to constructor calls) and the compiled form is cached next to the
+file as JSON, keyed by a hash of the file's contents, so later loads skip parsing and validation. The cache holds data
+only, never code, and is skipped when it cannot be read or written (e.g. a read-only install).
+
+Classes:
+    Plant: Loaded components and their connections
+
+Functions:
+    parse_plant(), compile_plant(), build_plant(), load_plant()
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.3
+    tomllib imported only where available, so JSON and YAML plants load on Python 3.10
+Version 0.2
+    Compiled cache stored as JSON instead of pickle; cache write failures are ignored
+Version 0.1
+    Initial build
+"""
+import gc
+import hashlib
+import json
+import os
+
+import utility_formulas
+
+from PipingSystems.pump.pump import CentrifPump, PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Gate, Globe, Relief
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10 and earlier: TOML plant files are unavailable
+    tomllib = None
+
+try:
+    import yaml
+except ImportError:  # YAML plant files are optional
+    yaml = None
+
+COMPILED_VERSION = 2
+
+TANK, VALVE, PUMP = range(3)
+
+_VALVE_PARAMETERS = {"name", "sys_flow_in", "sys_flow_out", "drop", "position", "flow_coeff", "press_in"}
+_PUMP_PARAMETERS = {"name", "flow_rate_out", "pump_head_in", "press_out", "pump_speed"}
+_STRUCTURE_KEYS = {"id", "type", "inlets"}
+
+# Type: (class, category, constructor parameters, extra keys)
+COMPONENT_TYPES = {
+    "tank": (Tank, TANK, {"name", "level", "fluid_density", "spec_gravity", "outlet_diam", "outlet_slope",
+                          "drain_coeff"}, {"pipe_coeff"}),
+    "gate": (Gate, VALVE, _VALVE_PARAMETERS, {"diameter"}),
+    "globe": (Globe, VALVE, _VALVE_PARAMETERS, {"diameter"}),
+    "relief": (Relief, VALVE, _VALVE_PARAMETERS | {"open_press", "close_press"}, {"diameter"}),
+    "centrifugal": (CentrifPump, PUMP, _PUMP_PARAMETERS, set()),
+    "positive_displacement": (PositiveDisplacement, PUMP, _PUMP_PARAMETERS | {"displacement"}, set()),
+}
+_ALLOWED_KEYS = {kind: frozenset(parameters | extras | _STRUCTURE_KEYS)
+                 for kind, (_, _, parameters, extras) in COMPONENT_TYPES.items()}
+
+
+class Plant:
+    """A loaded plant.
+
+    Components are also available as attributes named by their ids, so a plant with the fuel farm ids can be passed as
+    the farm argument of Models.FuelFarm.functionality.
+
+    Variables: name, components, inlets
+
+    Methods: connections(), graph()
+    """
+    def __init__(self, name, components, inlets):
+        """
+        :param name: Plant name
+        :param components: Id: component, in build order
+        :param inlets: Id: ids of the components feeding it
+        """
+        self.name = name
+        self.components = components
+        self.inlets = inlets
+
+    def __getattr__(self, name):
+        components = self.__dict__.get("components", {})
+        if name in components:
+            return components[name]
+        raise AttributeError(name)
+
+    def __len__(self):
+        return len(self.components)
+
+    def connections(self):
+        """Get every (upstream id, downstream id) pair."""
+        return [(up, down) for down, ups in self.inlets.items() for up in ups]
+
+    def graph(self):
+        """Build an incremental dependency graph of the plant.
+
+        :rtype: Simulation.propagation.DependencyGraph
+        """
+        from Simulation.propagation import DependencyGraph
+
+        graph = DependencyGraph()
+        for component in self.components.values():
+            graph.add_component(component)
+        for up, down in self.connections():
+            graph.connect(self.components[up], self.components[down])
+        return graph
+
+
+def parse_plant(path, data=None):
+    """Read a plant file into a dictionary.
+
+    :param path: Plant file; the format is chosen by extension (.json, .toml, .yaml/.yml)
+    :param data: File contents, if already read
+
+    :except ValueError: Unsupported format
+
+    :rtype: dict
+    """
+    if data is None:
+        with open(path, "rb") as file:
+            data = file.read()
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        return json.loads(data)
+    if extension == ".toml":
+        if tomllib is None:
+            raise ValueError("TOML plant files need Python 3.11 or later.")
+        return tomllib.loads(data.decode())
+    if extension in (".yaml", ".yml"):
+        if yaml is None:
+            raise ValueError("YAML plant files need PyYAML installed.")
+        return yaml.safe_load(data)
+    raise ValueError("Unsupported plant file format: {}".format(extension))
+
+
+def compile_plant(definition):
+    """Validate a plant definition and reduce it to an ordered list of build steps.
+
+    :param definition: Parsed plant file
+
+    :except ValueError: Invalid definition
+
+    :return: (plant name, steps); each step is (type, category, id, constructor arguments, extras, inlet ids)
+    :rtype: tuple
+    """
+    entries = definition.get("components")
+    if not isinstance(entries, list):
+        raise ValueError("Plant definition needs a 'components' list.")
+    steps = {}
+    for entry in entries:
+        try:
+            component_id = entry["id"]
+            kind = entry["type"]
+        except (KeyError, TypeError):
+            raise ValueError("Every component needs an 'id' and a 'type': {!r}".format(entry))
+        if component_id in steps:
+            raise ValueError("Duplicate component id: {}".format(component_id))
+        try:
+            _, category, _, extras = COMPONENT_TYPES[kind]
+        except KeyError:
+            raise ValueError("Unknown component type '{}' for {}".format(kind, component_id))
+        if not entry.keys() <= _ALLOWED_KEYS[kind]:
+            unknown = sorted(entry.keys() - _ALLOWED_KEYS[kind])[0]
+            raise ValueError("Unknown parameter '{}' for {}".format(unknown, component_id))
+        arguments = dict(entry)
+        del arguments["id"], arguments["type"]
+        inlet_ids = tuple(arguments.pop("inlets", ()))
+        options = {key: arguments.pop(key) for key in extras if key in arguments}
+        arguments.setdefault("name", component_id)
+        steps[component_id] = (kind, category, component_id, arguments, options, inlet_ids)
+
+    # Order so every component is built after its inlets (Kahn's algorithm)
+    waiting = {}
+    downstream = {component_id: [] for component_id in steps}
+    for component_id, step in steps.items():
+        for inlet in step[5]:
+            if inlet not in steps:
+                raise ValueError("Unknown inlet '{}' for {}".format(inlet, component_id))
+            downstream[inlet].append(component_id)
+        waiting[component_id] = len(step[5])
+    ready = [component_id for component_id in steps if waiting[component_id] == 0]
+    ordered = []
+    while ready:
+        component_id = ready.pop()
+        ordered.append(steps[component_id])
+        for child in downstream[component_id]:
+            waiting[child] -= 1
+            if waiting[child] == 0:
+                ready.append(child)
+    if len(ordered) != len(steps):
+        raise ValueError("Plant connections contain a cycle.")
+    return definition.get("name", ""), ordered
+
+
+def build_plant(compiled):
+    """Instantiate a compiled plant.
+
+    :param compiled: Result of compile_plant()
+
+    :rtype: Plant
+    """
+    name, steps = compiled
+    components = {}
+    inlets = {}
+    outlets = {}  # Id: (flow, pressure) delivered downstream
+    press_to_head = utility_formulas.press_to_head
+    for kind, category, component_id, arguments, options, inlet_ids in steps:
+        cls = COMPONENT_TYPES[kind][0]
+        if inlet_ids:
+            if len(inlet_ids) == 1:
+                flow, press = outlets[inlet_ids[0]]
+            else:
+                upstream = [outlets[inlet] for inlet in inlet_ids]
+                flow = sum(flow for flow, _ in upstream)
+                press = max(press for _, press in upstream)
+            inlets[component_id] = list(inlet_ids)
+        if category == TANK:
+            component = cls(**arguments)
+            if "pipe_coeff" in options:
+                component.pipe_coeff = options["pipe_coeff"]
+            component.static_tank_press = component.level
+            component.gravity_flow(component.pipe_diam, component.pipe_slope, component.pipe_coeff)
+            outlets[component_id] = (component.flow_out, component.static_tank_press)
+        elif category == VALVE:
+            component = cls(**arguments)
+            if inlet_ids:  # Same conversions as Valve.__init__()
+                if "sys_flow_in" not in arguments:
+                    component.flow_in = float(flow)
+                if "press_in" not in arguments:
+                    component.press_in = press
+            if "diameter" in options:
+                component.calc_coeff(options["diameter"])
+            if component.position == 100:
+                component.open()  # Pass inlet flow and pressure through to components downstream
+            outlets[component_id] = (component.flow_out, component.press_out)
+        else:
+            if inlet_ids and "pump_head_in" not in arguments:
+                component = cls(pump_head_in=press_to_head(press), **arguments)  # Power depends on head in
+            else:
+                component = cls(**arguments)
+            outlets[component_id] = (component.flow, component.outlet_pressure)
+        components[component_id] = component
+    return Plant(name, components, inlets)
+
+
+def load_plant(path, cache=True):
+    """Load a plant file, using the cached compiled form when the file has not changed.
+
+    :param path: Plant file
+    :param cache: Read and write "<path>.cache"; False always recompiles
+
+    :except ValueError: Invalid plant file
+
+    :rtype: Plant
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    # Loading creates hundreds of thousands of objects and no reference cycles; pausing the cyclic garbage collector
+    # avoids repeated full-heap scans while they are allocated
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        return _load(path, data, cache)
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def _load(path, data, cache):
+    """Compile (or read from cache) and build a plant file's contents."""
+    digest = hashlib.sha256(data).hexdigest()
+    cache_path = path + ".cache"
+    compiled = None
+    if cache:
+        try:
+            with open(cache_path, "rb") as file:
+                cached = json.load(file)
+            if cached["version"] == COMPILED_VERSION and cached["digest"] == digest:
+                compiled = _from_json(cached["compiled"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # Missing, stale, or damaged cache; recompile
+    if compiled is None:
+        compiled = compile_plant(parse_plant(path, data))
+        if cache:
+            _write_cache(cache_path, digest, compiled)
+    return build_plant(compiled)
+
+
+def _from_json(compiled):
+    """Restore the tuples of a compiled plant read back from JSON, which stores them as lists."""
+    name, steps = compiled
+    return name, [(kind, category, component_id, arguments, options, tuple(inlet_ids))
+                  for kind, category, component_id, arguments, options, inlet_ids in steps]
+
+
+def _write_cache(cache_path, digest, compiled):
+    """Store a compiled plant; the cache is optional, so values JSON cannot hold or an unwritable directory skip it."""
+    try:
+        data = json.dumps({"version": COMPILED_VERSION, "digest": digest, "compiled": compiled}).encode()
+    except (TypeError, ValueError):  # E.g. TOML dates
+        return
+    temporary = "{}.{}".format(cache_path, os.getpid())
+    try:
+        with open(temporary, "wb") as file:
+            file.write(data)
+        os.replace(temporary, cache_path)
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
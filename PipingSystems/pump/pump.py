@@ -13,6 +13,8 @@ Author: Cody Jackson
 
 Date: 4/12/18
 #################################
+Version 0.2
+    Optional performance curve; operate() finds the operating point on a system curve
 Version 0.1
     Initial build
 """
@@ -30,11 +32,14 @@ class Pump:
     Displacement is the amount of fluid pushed through the pump per second.
     Horsepower coefficient is the slope of the equivalent pump curve.
 
-    Variables: name, flow_rate_out, pump_head_in, press_out, pump_speed
+    Variables: name, flow_rate_out, pump_head_in, press_out, pump_speed, curve
 
-    Methods: set_speed(), cls_read_speed(), cls_read_press(), cls_read_flow(), cls_read_power(), hp_to_watts()
+    Methods: set_speed(), cls_read_speed(), cls_read_press(), cls_read_flow(), cls_read_power(), hp_to_watts(),
+    operate(), set_operating_point()
     """
-    def __init__(self, name="", flow_rate_out=0.0, pump_head_in=0.0, press_out=0.0, pump_speed=0):
+    __slots__ = ("name", "__flow_rate_out", "head_in", "__outlet_pressure", "__speed", "__wattage", "curve")
+
+    def __init__(self, name="", flow_rate_out=0.0, pump_head_in=0.0, press_out=0.0, pump_speed=0, curve=None):
         """Set initial parameters.
 
         :param name: Instance name
@@ -42,8 +47,10 @@ class Pump:
         :param pump_head_in: Necessary pump head into the pump (feet)
         :param press_out: Pressure created by the pump (psi)
         :param pump_speed: Rotational speed of the pump (rpm)
+        :param curve: Optional pump_curve.PumpCurve, used by operate()
         """
         self.name = name
+        self.curve = curve
         self.__flow_rate_out = float(flow_rate_out)
         self.head_in = float(pump_head_in)
         self.__outlet_pressure = float(press_out)
@@ -130,6 +137,38 @@ class Pump:
         self.power = hyd_power
         return self.power
 
+    def operate(self, static_head, resistance):
+        """Run the pump at its current speed against a system curve, using its performance curve.
+
+        Flow then responds to back-pressure: it settles where the pump curve meets the system curve
+        (static_head + resistance * flow ** 2). Outlet pressure is the inlet head plus the pump head; power is the
+        hydraulic power divided by the curve efficiency, if the curve has one.
+
+        :param static_head: System static head (ft)
+        :param resistance: System resistance coefficient (ft/gpm^2)
+
+        :except ValueError: Pump has no performance curve
+
+        :return: Operating point
+        :rtype: pump_curve.OperatingPoint
+        """
+        if self.curve is None:
+            raise ValueError("Pump has no performance curve.")
+        point = self.curve.operating_point(self.speed, static_head, resistance)
+        self.set_operating_point(point)
+        return point
+
+    def set_operating_point(self, point):
+        """Set flow, outlet pressure, and power from an operating point (see operate()).
+
+        :param point: pump_curve.OperatingPoint
+        """
+        self.flow = point.flow
+        self.outlet_pressure = utility_formulas.head_to_press(self.head_in + point.head)
+        power = self.pump_power(point.flow, point.head)
+        if point.efficiency > 0:  # NaN without efficiency data
+            self.power = power / point.efficiency
+
     @staticmethod
     def diff_press_ft(in_press_ft, out_press_ft):
         """Calculate differential head across pump, converted from feet."""
@@ -158,6 +197,7 @@ class CentrifPump(Pump):
         adjust_speed()
         pump_laws()
     """
+    __slots__ = ()
 
     def get_speed_str(self):
         """Get the current speed of the pump, in rpm."""
@@ -243,9 +283,11 @@ class PositiveDisplacement(Pump):
         set_hp_coeff()
         adjust_speed()
     """
+    __slots__ = ("displacement",)
 
-    def __init__(self, name="", flow_rate_out=0.0, pump_head_in=0.0, press_out=0.0, pump_speed=0, displacement=0.0):
-        super(PositiveDisplacement, self).__init__(name, flow_rate_out, pump_head_in, press_out, pump_speed)
+    def __init__(self, name="", flow_rate_out=0.0, pump_head_in=0.0, press_out=0.0, pump_speed=0, displacement=0.0,
+                 curve=None):
+        super(PositiveDisplacement, self).__init__(name, flow_rate_out, pump_head_in, press_out, pump_speed, curve)
         self.displacement = displacement
 
     def get_speed_str(self):
@@ -282,7 +324,6 @@ class PositiveDisplacement(Pump):
 
         self.flow = self.speed * self.displacement
         self.power = self.pump_power(self.flow, self.diff_press_psi(press_in, self.outlet_pressure))
-# TODO: Account for different flow rates based on outlet pressure
 
 
 if __name__ == "__main__":
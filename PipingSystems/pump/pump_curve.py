@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC pump_curve.py
+
+Purpose: Manufacturer performance curves for pumps, and the operating point where a pump curve meets a system curve.
+
+A curve is given at its rated speed as matching lists of flow (gpm), differential head (ft), and optionally
+efficiency (fraction, 0-1) and NPSH required (ft). Curves at other speeds follow the affinity laws:
+    flow2 = flow1 * (n2 / n1), head2 = head1 * (n2 / n1) ** 2, NPSHr2 = NPSHr1 * (n2 / n1) ** 2,
+    efficiency unchanged at corresponding points
+
+For each speed a dense, evenly spaced table is interpolated once and cached; changing the curve points clears the
+cache. Operating points are found on those tables by bisection, so many pumps can be solved together with a few NumPy
+operations per step.
+
+The system curve is static_head + resistance * flow ** 2 (ft, flow in gpm).
+
+Classes:
+    CurveTable: Dense curve at one speed
+    OperatingPoint: Where a pump runs on a system curve
+    PumpCurve: Performance curve with cached per-speed tables
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import collections
+import math
+
+import numpy as np
+
+CurveTable = collections.namedtuple("CurveTable", ["speed", "flow", "head", "efficiency", "npshr"])
+CurveTable.__doc__ = """Evenly spaced curve points at one speed; efficiency and npshr are None if the curve has none."""
+
+OperatingPoint = collections.namedtuple("OperatingPoint", ["flow", "head", "efficiency", "npshr"])
+OperatingPoint.__doc__ = """Flow (gpm), differential head (ft), efficiency, and NPSH required (ft) at the operating
+point; efficiency and npshr are NaN if the curve has none. Values are arrays for PumpCurve.operating_points()."""
+
+
+class PumpCurve:
+    """Pump performance curve.
+
+    Variables: rated_speed, resolution, max_tables, version, flow, head, efficiency, npshr
+
+    Methods: set_points(), table(), head_at(), efficiency_at(), npshr_at(), operating_point(), operating_points()
+    """
+    def __init__(self, flow, head, efficiency=None, npshr=None, rated_speed=1480, resolution=256, max_tables=64):
+        """Create a curve.
+
+        :param flow: Flow rates of the curve points (gpm), increasing
+        :param head: Differential head at each flow (ft), not increasing with flow
+        :param efficiency: Optional efficiency at each flow (fraction)
+        :param npshr: Optional NPSH required at each flow (ft)
+        :param rated_speed: Speed the points were measured at (rpm)
+        :param resolution: Points per dense table
+        :param max_tables: Per-speed tables kept; the oldest is dropped when more speeds are used
+
+        :except ValueError: Invalid curve points
+        """
+        if rated_speed <= 0:
+            raise ValueError("Rated speed must be > 0.")
+        if resolution < 2:
+            raise ValueError("Resolution must be at least 2.")
+        self.rated_speed = rated_speed
+        self.resolution = int(resolution)
+        self.max_tables = max(int(max_tables), 1)
+        self.version = 0
+        self.__tables = {}
+        self.__stacked = (None, None)  # (speeds, stacked tables) of the last operating_points() call
+        self.set_points(flow, head, efficiency, npshr)
+
+    def set_points(self, flow, head, efficiency=None, npshr=None):
+        """Replace the curve points and discard every cached table.
+
+        :except ValueError: Invalid curve points
+        """
+        flow = np.asarray(flow, dtype=float)
+        head = np.asarray(head, dtype=float)
+        if flow.ndim != 1 or len(flow) < 2:
+            raise ValueError("A curve needs at least two points.")
+        columns = {"head": head, "efficiency": efficiency, "npshr": npshr}
+        for name, values in columns.items():
+            if values is not None:
+                columns[name] = np.asarray(values, dtype=float)
+                if columns[name].shape != flow.shape:
+                    raise ValueError("Curve {} needs one value per flow point.".format(name))
+        if np.any(np.diff(flow) <= 0) or flow[0] < 0:
+            raise ValueError("Curve flows must be >= 0 and increasing.")
+        if np.any(np.diff(head) > 0):
+            raise ValueError("Curve head must not rise with flow.")
+        self.flow = flow
+        self.head = columns["head"]
+        self.efficiency = columns["efficiency"]
+        self.npshr = columns["npshr"]
+        self.version += 1
+        self.__tables.clear()
+        self.__stacked = (None, None)
+
+    def table(self, speed):
+        """Get the dense curve table at a speed, building and caching it on first use.
+
+        :param speed: Pump speed (rpm)
+
+        :rtype: CurveTable
+        """
+        try:
+            return self.__tables[speed]
+        except KeyError:
+            pass
+        ratio = speed / self.rated_speed
+        rated_flow = np.linspace(self.flow[0], self.flow[-1], self.resolution)
+        table = CurveTable(speed, rated_flow * ratio, np.interp(rated_flow, self.flow, self.head) * ratio ** 2,
+                           None if self.efficiency is None else np.interp(rated_flow, self.flow, self.efficiency),
+                           None if self.npshr is None else np.interp(rated_flow, self.flow, self.npshr) * ratio ** 2)
+        if len(self.__tables) >= self.max_tables:
+            del self.__tables[next(iter(self.__tables))]
+        self.__tables[speed] = table
+        return table
+
+    def head_at(self, flow, speed):
+        """Get the differential head (ft) at a flow and speed; flows beyond the curve get its end values."""
+        table = self.table(speed)
+        return np.interp(flow, table.flow, table.head)
+
+    def efficiency_at(self, flow, speed):
+        """Get the efficiency at a flow and speed, or None if the curve has no efficiency data."""
+        table = self.table(speed)
+        return None if table.efficiency is None else np.interp(flow, table.flow, table.efficiency)
+
+    def npshr_at(self, flow, speed):
+        """Get the NPSH required (ft) at a flow and speed, or None if the curve has no NPSHr data."""
+        table = self.table(speed)
+        return None if table.npshr is None else np.interp(flow, table.flow, table.npshr)
+
+    def operating_point(self, speed, static_head, resistance):
+        """Find where the pump curve at a speed crosses a system curve.
+
+        If the pump cannot overcome the static head it delivers no flow (shutoff head); if the system curve stays
+        below the pump curve, the pump runs out at the end of its curve.
+
+        :param speed: Pump speed (rpm)
+        :param static_head: System static head (ft)
+        :param resistance: System resistance coefficient (ft/gpm^2)
+
+        :rtype: OperatingPoint
+        """
+        table = self.table(speed)
+        excess = table.head - static_head - resistance * table.flow * table.flow
+        if excess[0] < 0:  # Shutoff
+            return OperatingPoint(0.0, float(table.head[0]), *_point_values(table, 0, 0, 0.0))
+        if excess[-1] >= 0:  # Runout
+            return OperatingPoint(float(table.flow[-1]), float(table.head[-1]), *_point_values(table, -1, -1, 0.0))
+        high = int(np.argmax(excess < 0))
+        low = high - 1
+        fraction = float(excess[low] / (excess[low] - excess[high]))
+        return OperatingPoint(*_point_values(table, low, high, fraction, ("flow", "head", "efficiency", "npshr")))
+
+    def operating_points(self, speeds, static_head, resistance):
+        """Find the operating points of many pumps sharing this curve.
+
+        Each distinct speed uses its cached table; the crossing is then bracketed for every pump at once by bisection
+        over the table rows and interpolated linearly within the bracket.
+
+        :param speeds: Speed of each pump (rpm)
+        :param static_head: Static head of each pump's system, or one value for all (ft)
+        :param resistance: Resistance of each pump's system, or one value for all (ft/gpm^2)
+
+        :return: Arrays of flow, head, efficiency, and NPSHr
+        :rtype: OperatingPoint
+        """
+        speeds = np.asarray(speeds, dtype=float)
+        count = len(speeds)
+        static_head = np.broadcast_to(np.asarray(static_head, dtype=float), (count,))
+        resistance = np.broadcast_to(np.asarray(resistance, dtype=float), (count,))
+        unique, rows = np.unique(speeds, return_inverse=True)
+        flows, heads, efficiencies, npshrs = self._stack(unique)
+
+        def excess(index):
+            """Pump head above system head at each pump's table row."""
+            flow = flows[rows, index]
+            return heads[rows, index] - static_head - resistance * flow * flow
+
+        last = self.resolution - 1
+        low = np.zeros(count, dtype=np.intp)
+        high = np.full(count, last, dtype=np.intp)
+        while np.any(high - low > 1):  # Where a crossing exists: excess(low) >= 0 > excess(high)
+            middle = (low + high) >> 1
+            above = excess(middle) >= 0
+            low = np.where(above, middle, low)
+            high = np.where(above, high, middle)
+        low_excess = excess(low)
+        high_excess = excess(high)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.where(low_excess > high_excess, low_excess / (low_excess - high_excess), 0.0)
+        fraction = np.clip(fraction, 0.0, 1.0)
+        fraction[low_excess < 0] = 0.0  # Cannot overcome static head: shutoff
+        fraction[high_excess >= 0] = 1.0  # System curve below the whole pump curve: runout
+        flow = _lerp(flows, rows, low, high, fraction)
+        flow[low_excess < 0] = 0.0
+        nan = np.full(count, np.nan)
+        return OperatingPoint(flow, _lerp(heads, rows, low, high, fraction),
+                              nan if efficiencies is None else _lerp(efficiencies, rows, low, high, fraction),
+                              nan if npshrs is None else _lerp(npshrs, rows, low, high, fraction))
+
+    def _stack(self, speeds):
+        """Get the tables for a set of speeds as 2-D arrays, one row per speed; the last set used is kept."""
+        key = speeds.tobytes()
+        cached_key, stacked = self.__stacked
+        if key == cached_key:
+            return stacked
+        tables = [self.table(float(speed)) for speed in speeds]
+        stacked = (np.stack([table.flow for table in tables]), np.stack([table.head for table in tables]),
+                   None if self.efficiency is None else np.stack([table.efficiency for table in tables]),
+                   None if self.npshr is None else np.stack([table.npshr for table in tables]))
+        self.__stacked = (key, stacked)
+        return stacked
+
+
+def _point_values(table, low, high, fraction, fields=("efficiency", "npshr")):
+    """Interpolate table columns between two rows; NaN for columns the curve does not have."""
+    values = []
+    for field in fields:
+        column = getattr(table, field)
+        if column is None:
+            values.append(math.nan)
+        else:
+            values.append(float(column[low] + (column[high] - column[low]) * fraction))
+    return values
+
+
+def _lerp(values, rows, low, high, fraction):
+    """Interpolate each pump's table row between two columns."""
+    start = values[rows, low]
+    return start + (values[rows, high] - start) * fraction
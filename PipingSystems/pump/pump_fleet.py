@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC pump_fleet.py
+
+Purpose: Column-oriented storage and vectorized pump laws for large numbers of pumps.
+
+Classes:
+    PumpFleet: Holds speed, flow, pressure, and power for many pumps in NumPy arrays
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import numbers
+
+import numpy as np
+
+import utility_formulas
+
+from PipingSystems.pump.pump import GRAVITY, PositiveDisplacement
+
+_COLUMNS = ("speed", "flow", "head_in", "outlet_pressure", "power", "displacement")
+
+
+class PumpFleet:
+    """Many centrifugal and positive displacement pumps stored column-wise.
+
+    adjust_speed() applies the same equations as CentrifPump.adjust_speed() (affinity laws) and
+    PositiveDisplacement.adjust_speed() (flow = speed * displacement) to every selected pump in one call, with results
+    identical to the scalar classes.
+
+    Variables: names, speed, flow, head_in, outlet_pressure, power, displacement, positive
+
+    Methods: add_pump(), from_pumps(), update_pumps(), pump_power(), adjust_speed()
+    """
+    def __init__(self, capacity=16):
+        """Allocate empty columns.
+
+        :param capacity: Number of pumps to reserve space for; columns grow automatically
+        """
+        capacity = max(int(capacity), 1)
+        self.names = []
+        self.__size = 0
+        self.__columns = {column: np.zeros(capacity) for column in _COLUMNS}
+        self.__columns["positive"] = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return self.__size
+
+    def __getattr__(self, column):
+        """Expose each column, trimmed to the number of pumps, as an attribute."""
+        columns = self.__dict__.get("_PumpFleet__columns", {})
+        if column in columns:
+            return columns[column][:self.__size]
+        raise AttributeError(column)
+
+    def add_pump(self, name="", flow_rate_out=0.0, pump_head_in=0.0, press_out=0.0, pump_speed=0, displacement=0.0,
+                 positive=False, power=0.0):
+        """Append a pump. Parameters match Pump(); positive selects positive displacement behavior.
+
+        :return: Index of the new pump
+        :rtype: int
+        """
+        if self.__size == self.__columns["speed"].size:
+            for column, values in self.__columns.items():
+                grown = np.zeros(values.size * 2, dtype=values.dtype)
+                grown[:values.size] = values
+                self.__columns[column] = grown
+        index = self.__size
+        self.__size += 1
+        self.names.append(name)
+        row = {"speed": pump_speed, "flow": flow_rate_out, "head_in": pump_head_in, "outlet_pressure": press_out,
+               "power": power, "displacement": displacement, "positive": positive}
+        for column, value in row.items():
+            self.__columns[column][index] = value
+        return index
+
+    @classmethod
+    def from_pumps(cls, pumps):
+        """Build a fleet from existing pump objects, copying their current state.
+
+        :param pumps: Iterable of CentrifPump and PositiveDisplacement instances
+
+        :return: New pump fleet
+        :rtype: PumpFleet
+        """
+        pumps = list(pumps)
+        fleet = cls(capacity=len(pumps))
+        for pump in pumps:
+            positive = isinstance(pump, PositiveDisplacement)
+            fleet.add_pump(pump.name, pump.flow, pump.head_in, pump.outlet_pressure, pump.speed,
+                           pump.displacement if positive else 0.0, positive, pump.power)
+        return fleet
+
+    def update_pumps(self, pumps):
+        """Copy the fleet's speed, flow, outlet pressure, and power back onto pump objects, in from_pumps() order.
+
+        :param pumps: Sequence of pump instances, one per row
+        """
+        speeds, flows = self.speed.tolist(), self.flow.tolist()
+        pressures, powers = self.outlet_pressure.tolist(), self.power.tolist()
+        for index, pump in enumerate(pumps):
+            pump.speed = speeds[index]
+            pump.flow = flows[index]
+            pump.outlet_pressure = pressures[index]
+            pump.power = powers[index]
+
+    def _rows(self, which):
+        """Convert an index array, boolean mask, or None (all rows) to a boolean mask."""
+        mask = np.zeros(self.__size, dtype=bool)
+        if which is None:
+            mask[:] = True
+        else:
+            mask[which] = True
+        return mask
+
+    @staticmethod
+    def pump_power(flow_rate, diff_head, fluid_spec_weight=62.4):
+        """Calculate pump power in kW for arrays of pumps, using the same formula as Pump.pump_power().
+
+        :param flow_rate: System flow rates, in gpm
+        :param diff_head: Change in pressure across each pump
+        :param fluid_spec_weight: Specific weight of fluid; default assumes water
+
+        :return: Pump power requirements, in kW
+        :rtype: numpy.ndarray
+        """
+        flow_rate = np.asarray(flow_rate, dtype=np.float64) / 15852
+        density = fluid_spec_weight / 0.0624
+        head = np.asarray(diff_head, dtype=np.float64) / 3.2808
+        return (100 * (flow_rate * density * GRAVITY * head) / 1000) / 100
+
+    def adjust_speed(self, new_speed, which=None):
+        """Change pump speeds and recalculate flow, outlet pressure, and power.
+
+        Centrifugal pumps follow the affinity laws: flow scales with speed, outlet pressure with speed squared. A
+        stopped centrifugal pump is treated as turning at 1 rpm, as in CentrifPump.adjust_speed(). Positive
+        displacement pumps deliver speed * displacement at constant outlet pressure.
+
+        :param new_speed: Speed, or array of speeds (one per pump)
+        :param which: Rows to change; defaults to all
+
+        :except TypeError: Non-numeric value provided
+        :except ValueError: Speed < 0
+        """
+        if isinstance(new_speed, numbers.Number):
+            new_speed = float(new_speed)
+        else:
+            new_speed = np.asarray(new_speed)
+            if new_speed.dtype.kind not in "iuf":
+                raise TypeError("Numeric values only.")
+        new_speed = np.broadcast_to(np.asarray(new_speed, dtype=np.float64), (self.__size,))
+        rows = self._rows(which)
+        if (new_speed[rows] < 0).any():
+            raise ValueError("Speed must be 0 or greater.")
+        positive = self.positive
+
+        # Evaluate both pump laws for every row, then keep the one matching each pump's type
+        ratio = new_speed / np.where(self.speed == 0, 1.0, self.speed)
+        centrif_flow = self.flow * ratio
+        centrif_press = self.outlet_pressure * np.square(ratio)
+        centrif_dp = np.abs(utility_formulas.press_to_head_array(centrif_press) - self.head_in)
+        positive_flow = new_speed * self.displacement
+        positive_dp = np.abs(self.outlet_pressure - utility_formulas.head_to_press_array(self.head_in))
+
+        flow = np.where(positive, positive_flow, centrif_flow)
+        power = self.pump_power(flow, np.where(positive, positive_dp, centrif_dp))
+        self.flow[rows] = flow[rows]
+        self.outlet_pressure[rows] = np.where(positive, self.outlet_pressure, centrif_press)[rows]
+        self.power[rows] = power[rows]
+        self.speed[rows] = new_speed[rows]
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC drain.py
+
+Purpose: Drain-down of many tanks at once: time to empty and level trajectories, without stepping each tank.
+
+With a drain coefficient K (gpm/sqrt(ft), see Tank.calibrate_drain()) the outlet flow follows the hydraulic head,
+Q = K * sqrt(h), so a tank of plan area A (ft^2) empties as
+    dh/dt = -K * sqrt(h) / (GPM_PER_CFS * A)
+For a constant area this has the closed form
+    sqrt(h(t)) = sqrt(h0) - c * t / 2, c = K / (GPM_PER_CFS * A)
+which is used whenever the area is a number or an array. When the area depends on the level (horizontal cylinders,
+spheres, strapping tables) it is given as a callable area(levels), such as geometry.area_function() returns, and the
+time is integrated over u = sqrt(h), where the integrand stays finite at the empty tank and where the area is zero:
+    dt = -2 * GPM_PER_CFS * A(u ** 2) / K du
+Time to empty is a Gauss-Legendre quadrature of this; trajectories come from a table of elapsed time against u,
+interpolated at the requested times. Both run for every tank in the same NumPy operations.
+
+Levels are in ft, areas in ft^2, flows in gpm, and times in seconds. Tanks with no drain coefficient (K = 0) never
+empty.
+
+Functions:
+    drain_coeffs(), drain_flow(), time_to_empty(), drain_levels()
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import math
+
+import numpy as np
+
+import utility_formulas
+from PipingSystems.storage_tank.tank_farm import TankFarm
+
+GPM_PER_CFS = 448.831  # gpm in 1 ft^3/s
+QUADRATURE_INTERVALS = 64  # Quadrature intervals for time_to_empty() with a level-dependent area
+_NODES = 4  # Gauss-Legendre nodes per interval
+
+
+def drain_coeffs(tanks):
+    """Get the drain coefficient of every tank.
+
+    Tanks without one get the coefficient that matches their outlet pipe's gravity flow at their current level, as
+    Tank.calibrate_drain() would set; empty tanks get 0.
+
+    :param tanks: Iterable of Tank objects, or a TankFarm
+
+    :return: Drain coefficient of each tank, in gpm/sqrt(ft)
+    :rtype: numpy.ndarray
+    """
+    if isinstance(tanks, TankFarm):
+        levels = tanks.levels
+        flows = utility_formulas.gravity_flow_rate_array(tanks.outlet_diameters, tanks.outlet_slopes,
+                                                         tanks.pipe_coeffs)
+        coeffs = tanks.drain_coeffs.copy()
+    else:
+        tanks = list(tanks)
+        levels = np.array([tank.level for tank in tanks], dtype=float)
+        flows = np.array([utility_formulas.cached_gravity_flow_rate(tank.pipe_diam, tank.pipe_slope, tank.pipe_coeff)
+                          for tank in tanks], dtype=float)
+        coeffs = np.array([math.nan if tank.drain_coeff is None else tank.drain_coeff for tank in tanks], dtype=float)
+    unset = np.isnan(coeffs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        calibrated = np.where(levels > 0, flows / np.sqrt(levels), 0.0)
+    coeffs[unset] = calibrated[unset]
+    return coeffs
+
+
+def drain_flow(coeffs, levels):
+    """Get the outlet flow of tanks at given levels.
+
+    :param coeffs: Drain coefficient of each tank (gpm/sqrt(ft))
+    :param levels: Level of each tank (ft); non-positive levels give no flow
+
+    :return: Flow of each tank, in gpm
+    :rtype: numpy.ndarray
+    """
+    return np.asarray(coeffs, dtype=float) * np.sqrt(np.maximum(np.asarray(levels, dtype=float), 0.0))
+
+
+def _drain_table(start, stop, coeffs, area, intervals):
+    """Tabulate the time each tank takes to drain from u = start down to each of intervals + 1 evenly spaced u values.
+
+    Integrates dt/du = 2 * GPM_PER_CFS * A(u ** 2) / K with composite Gauss-Legendre quadrature. Rows are u values
+    and columns tanks, so each call of area() gets one contiguous level per tank.
+
+    :return: (u, elapsed) arrays, both (intervals + 1, tanks); down each column u falls and elapsed rises
+    :rtype: tuple
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(_NODES)
+    u = start + np.linspace(0.0, 1.0, intervals + 1)[:, np.newaxis] * (stop - start)
+    middles = (u[:-1] + u[1:]) / 2
+    half = (start - stop) / (2 * intervals)
+    sums = np.zeros((intervals, len(start)))
+    for node, weight in zip(nodes, weights):
+        points = np.square(middles + half * node)
+        for row, levels in enumerate(points):
+            sums[row] += weight * area(levels)
+    elapsed = np.zeros_like(u)
+    np.cumsum(sums * half, axis=0, out=elapsed[1:])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        elapsed *= 2 * GPM_PER_CFS / coeffs
+    return u, elapsed
+
+
+def time_to_empty(levels, coeffs, area, to_level=0.0):
+    """Get how long each tank takes to drain down to a level.
+
+    :param levels: Starting level of each tank (ft)
+    :param coeffs: Drain coefficient of each tank (gpm/sqrt(ft))
+    :param area: Plan area (ft^2): one for all tanks, one per tank, or a callable taking an array of one level per
+        tank and returning the matching areas
+    :param to_level: Level to stop at (ft), one for all tanks or one per tank; 0 empties them
+
+    :return: Time for each tank, in seconds; 0 if already at or below to_level, inf if it never drains
+    :rtype: numpy.ndarray
+    """
+    levels = np.maximum(np.atleast_1d(np.asarray(levels, dtype=float)), 0.0)
+    coeffs = np.broadcast_to(np.asarray(coeffs, dtype=float), levels.shape)
+    start = np.sqrt(levels)
+    stop = np.minimum(np.sqrt(np.maximum(np.asarray(to_level, dtype=float), 0.0)), start)
+    if callable(area):
+        seconds = _drain_table(start, stop, coeffs, area, QUADRATURE_INTERVALS)[1][-1]
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            seconds = 2 * GPM_PER_CFS * (start - stop) * np.asarray(area, dtype=float) / coeffs
+    return np.where(start > stop, np.where(coeffs > 0, seconds, np.inf), 0.0)
+
+
+def drain_levels(levels, coeffs, area, times, resolution=128):
+    """Get the level of each tank at each of a series of times while it drains.
+
+    :param levels: Starting level of each tank (ft)
+    :param coeffs: Drain coefficient of each tank (gpm/sqrt(ft))
+    :param area: Plan area (ft^2), as for time_to_empty()
+    :param times: Times to report, in seconds from the start
+    :param resolution: Intervals of the drain time table for a level-dependent area; unused for constant areas
+
+    :except ValueError: Negative times
+
+    :return: (tanks, times) array of levels, in ft
+    :rtype: numpy.ndarray
+    """
+    levels = np.maximum(np.atleast_1d(np.asarray(levels, dtype=float)), 0.0)
+    coeffs = np.broadcast_to(np.asarray(coeffs, dtype=float), levels.shape)
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    if np.any(times < 0):
+        raise ValueError("Times must be >= 0.")
+    start = np.sqrt(levels)
+    if not callable(area):
+        rate = np.broadcast_to(coeffs / (2 * GPM_PER_CFS * np.asarray(area, dtype=float)), levels.shape)  # -du/dt
+        return np.square(np.maximum(start[:, np.newaxis] - rate[:, np.newaxis] * times, 0.0))
+    # Invert the drain time table: find where each time falls in its tank's row. Rows are made one sorted array by
+    # offsetting each row past the end of the one before, so every lookup is a single searchsorted().
+    resolution = int(resolution)
+    draining = coeffs > 0
+    u, elapsed = (table.T for table in _drain_table(start, np.zeros_like(start), np.where(draining, coeffs, 1.0),
+                                                    area, resolution))
+    total = elapsed[:, -1]
+    offsets = np.concatenate(([0.0], np.cumsum(total[:-1] + 1.0)))
+    flat = (elapsed + offsets[:, np.newaxis]).ravel()
+    clipped = np.minimum(times, total[:, np.newaxis])  # (tanks, times)
+    index = np.searchsorted(flat, clipped + offsets[:, np.newaxis], side="right") - 1
+    rows = index // (resolution + 1)
+    high = np.minimum(index + 1, (rows + 1) * (resolution + 1) - 1)
+    flat_u = u.ravel()
+    span = flat[high] - flat[index]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(span > 0, (clipped + offsets[:, np.newaxis] - flat[index]) / span, 0.0)
+    result = np.square(flat_u[index] + (flat_u[high] - flat_u[index]) * fraction)
+    result[~draining] = levels[~draining, np.newaxis]
+    return result
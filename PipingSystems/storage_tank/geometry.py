@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC geometry.py
+
+Purpose: Tank shapes and strapping tables, converting between level (ft) and volume (gallons).
+
+A strapping table is a list of measured (level, volume) rows; volumes between rows are interpolated linearly, and
+both directions are binary searches of the rows, so tables of many thousands of rows convert whole arrays of levels
+or volumes in one np.interp() call. Every shape is also a strapping table, tabulated once from its exact volume: levels
+convert to volumes with the exact formula, and volumes to levels by finding the bracketing rows and refining with
+Newton's method, which reaches floating point precision in a few steps.
+
+Every geometry also gives the plan (liquid surface) area at a level, in ft^2, so geometry.area can be passed to
+drain.time_to_empty() and drain.drain_levels().
+
+Levels are clipped to [0, height] and volumes to [0, capacity].
+
+Classes:
+    StrappingTable: Measured level/volume rows
+    VerticalCylinder: Upright cylindrical tank
+    HorizontalCylinder: Cylindrical tank on its side, flat ends
+    Sphere: Spherical tank
+
+Functions:
+    to_volumes(), to_levels(), area_function()
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.2
+    Shape subclasses must implement _volume() and _area()
+Version 0.1
+    Initial build
+"""
+import abc
+import bisect
+import math
+
+import numpy as np
+
+GALLONS_PER_CUBIC_FOOT = 7.480519
+DEFAULT_RESOLUTION = 1024  # Table intervals tabulated for each shape
+MAX_NEWTON_STEPS = 12  # Near a zero area (bottom of a sphere) Newton's method starts slowly
+
+
+def _lookup(value, keys, values):
+    """Interpolate one value in a table with a binary search of plain lists; np.interp() costs more for one value."""
+    if value <= keys[0]:
+        return values[0]
+    if value >= keys[-1]:
+        return values[-1]
+    high = bisect.bisect_right(keys, value)
+    low = high - 1
+    return values[low] + (values[high] - values[low]) * (value - keys[low]) / (keys[high] - keys[low])
+
+
+def _output(values, scalar):
+    """Return a float for scalar input, otherwise the array."""
+    return float(values) if scalar else values
+
+
+class StrappingTable:
+    """Level to volume table of a tank.
+
+    Variables: levels, volumes, height, capacity
+
+    Methods: volume(), level(), area()
+    """
+    def __init__(self, levels, volumes):
+        """
+        :param levels: Table levels (ft), increasing
+        :param volumes: Volume at each level (gallons), increasing
+
+        :except ValueError: Invalid table
+        """
+        levels = np.array(levels, dtype=float)
+        volumes = np.array(volumes, dtype=float)
+        if levels.ndim != 1 or len(levels) < 2 or volumes.shape != levels.shape:
+            raise ValueError("A strapping table needs at least two rows, with one volume per level.")
+        if np.any(np.diff(levels) <= 0) or np.any(np.diff(volumes) <= 0):
+            raise ValueError("Strapping table levels and volumes must be increasing.")
+        if levels[0] < 0 or volumes[0] < 0:
+            raise ValueError("Strapping table levels and volumes must be >= 0.")
+        self.levels = levels
+        self.volumes = volumes
+        self.height = float(levels[-1])
+        self.capacity = float(volumes[-1])
+        self.__rows = (levels.tolist(), volumes.tolist())  # For single conversions
+        # Plan area of each row's segment: the volume gained per foot
+        self.__areas = np.diff(volumes) / np.diff(levels) / GALLONS_PER_CUBIC_FOOT
+
+    def __repr__(self):
+        return "{}({} rows, height={!r}, capacity={!r})".format(type(self).__name__, len(self.levels),
+                                                                self.height, self.capacity)
+
+    def volume(self, level):
+        """Get the volume at a level.
+
+        :param level: Level (ft), or an array of levels
+
+        :return: Volume (gallons); a float for a single level, otherwise an array
+        """
+        if level.__class__ in (float, int):
+            return float(_lookup(level, *self.__rows))
+        return _output(np.interp(level, self.levels, self.volumes), np.ndim(level) == 0)
+
+    def level(self, volume):
+        """Get the level holding a volume.
+
+        :param volume: Volume (gallons), or an array of volumes
+
+        :return: Level (ft); a float for a single volume, otherwise an array
+        """
+        if volume.__class__ in (float, int):
+            return float(_lookup(volume, *reversed(self.__rows)))
+        return _output(np.interp(volume, self.volumes, self.levels), np.ndim(volume) == 0)
+
+    def area(self, level):
+        """Get the plan area at a level: the volume per foot of the table row it falls in.
+
+        :param level: Level (ft), or an array of levels
+
+        :return: Area (ft^2); a float for a single level, otherwise an array
+        """
+        rows = np.searchsorted(self.levels, level, side="right") - 1
+        return _output(self.__areas[np.clip(rows, 0, len(self.__areas) - 1)], np.ndim(level) == 0)
+
+
+class _Shape(StrappingTable, abc.ABC):
+    """Tank with a volume formula; tabulated once to bracket volume to level conversions."""
+    def __init__(self, height, resolution):
+        levels = np.linspace(0.0, height, max(int(resolution), 1) + 1)
+        super().__init__(levels, self._volume(levels))
+
+    @abc.abstractmethod
+    def _volume(self, level):
+        """Exact volume (gallons) at levels already within [0, height]."""
+
+    @abc.abstractmethod
+    def _area(self, level):
+        """Exact plan area (ft^2) at levels already within [0, height]."""
+
+    def volume(self, level):
+        return _output(self._volume(np.clip(level, 0.0, self.height)), np.ndim(level) == 0)
+
+    def area(self, level):
+        return _output(self._area(np.clip(level, 0.0, self.height)), np.ndim(level) == 0)
+
+    def level(self, volume):
+        """Get the level holding a volume.
+
+        The table rows bracket the level; Newton's method then solves volume(level) = volume within the bracket.
+
+        :param volume: Volume (gallons), or an array of volumes
+
+        :return: Level (ft); a float for a single volume, otherwise an array
+        """
+        target = np.clip(volume, 0.0, self.capacity)
+        rows = np.clip(np.searchsorted(self.volumes, target, side="right") - 1, 0, len(self.levels) - 2)
+        low = self.levels[rows]
+        high = self.levels[rows + 1]
+        level = np.interp(target, self.volumes, self.levels)
+        for _ in range(MAX_NEWTON_STEPS):
+            slope = self._area(level) * GALLONS_PER_CUBIC_FOOT
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step = np.where(slope > 0, (self._volume(level) - target) / slope, 0.0)
+            level = np.clip(level - step, low, high)
+            if np.all(np.abs(step) <= 1e-12 * self.height):
+                break
+        return _output(level, np.ndim(volume) == 0)
+
+
+class VerticalCylinder(_Shape):
+    """Upright cylindrical tank with a flat bottom.
+
+    Variables: diameter, height, capacity
+    """
+    def __init__(self, diameter, height, resolution=1):
+        """
+        :param diameter: Inside diameter (ft)
+        :param height: Fill height (ft)
+        :param resolution: Table intervals; the volume is linear in level, so one would be exact
+
+        :except ValueError: Dimensions not > 0
+        """
+        if diameter <= 0 or height <= 0:
+            raise ValueError("Tank dimensions must be > 0.")
+        self.diameter = diameter
+        self.__plan_area = math.pi * diameter * diameter / 4
+        super().__init__(height, resolution)
+
+    @classmethod
+    def from_capacity(cls, capacity, height):
+        """Size a vertical cylinder to hold a capacity (gallons) at a fill height (ft)."""
+        return cls(math.sqrt(4 * capacity / (GALLONS_PER_CUBIC_FOOT * math.pi * height)), height)
+
+    def _volume(self, level):
+        return self.__plan_area * GALLONS_PER_CUBIC_FOOT * level
+
+    def _area(self, level):
+        return np.full_like(level, self.__plan_area, dtype=float)
+
+
+class HorizontalCylinder(_Shape):
+    """Cylindrical tank lying on its side, with flat ends.
+
+    Variables: diameter, length, height, capacity
+    """
+    def __init__(self, diameter, length, resolution=DEFAULT_RESOLUTION):
+        """
+        :param diameter: Inside diameter (ft); also the fill height
+        :param length: Inside length (ft)
+        :param resolution: Table intervals used to bracket volume to level conversions
+
+        :except ValueError: Dimensions not > 0
+        """
+        if diameter <= 0 or length <= 0:
+            raise ValueError("Tank dimensions must be > 0.")
+        self.diameter = diameter
+        self.length = length
+        super().__init__(diameter, resolution)
+
+    def _volume(self, level):
+        radius = self.diameter / 2
+        segment = radius * radius * np.arccos((radius - level) / radius) - (radius - level) * np.sqrt(
+            np.maximum(level * (self.diameter - level), 0.0))
+        return segment * self.length * GALLONS_PER_CUBIC_FOOT
+
+    def _area(self, level):
+        return 2 * self.length * np.sqrt(np.maximum(level * (self.diameter - level), 0.0))
+
+
+class Sphere(_Shape):
+    """Spherical tank.
+
+    Variables: diameter, height, capacity
+    """
+    def __init__(self, diameter, resolution=DEFAULT_RESOLUTION):
+        """
+        :param diameter: Inside diameter (ft); also the fill height
+        :param resolution: Table intervals used to bracket volume to level conversions
+
+        :except ValueError: Diameter not > 0
+        """
+        if diameter <= 0:
+            raise ValueError("Tank dimensions must be > 0.")
+        self.diameter = diameter
+        super().__init__(diameter, resolution)
+
+    def _volume(self, level):
+        return math.pi * level * level * (1.5 * self.diameter - level) / 3 * GALLONS_PER_CUBIC_FOOT
+
+    def _area(self, level):
+        return math.pi * level * (self.diameter - level)
+
+
+def _groups(geometries):
+    """Group tank indices by geometry object, so tanks sharing one are converted in a single call.
+
+    :return: (geometry, index array) pairs; tanks without a geometry are left out
+    :rtype: list
+    """
+    groups = {}
+    for index, geometry in enumerate(geometries):
+        if geometry is not None:
+            groups.setdefault(id(geometry), (geometry, []))[1].append(index)
+    return [(geometry, np.array(indices)) for geometry, indices in groups.values()]
+
+
+def _convert(geometries, values, method):
+    values = np.asarray(values, dtype=float)
+    result = np.full(len(geometries), np.nan)
+    for geometry, indices in _groups(geometries):
+        result[indices] = getattr(geometry, method)(values[indices])
+    return result
+
+
+def to_volumes(geometries, levels):
+    """Convert the level of each tank to its volume.
+
+    :param geometries: Geometry of each tank (None for tanks without one)
+    :param levels: Level of each tank (ft)
+
+    :return: Volume of each tank (gallons); NaN for tanks without a geometry
+    :rtype: numpy.ndarray
+    """
+    return _convert(geometries, levels, "volume")
+
+
+def to_levels(geometries, volumes):
+    """Convert the volume of each tank to its level.
+
+    :param geometries: Geometry of each tank (None for tanks without one)
+    :param volumes: Volume of each tank (gallons)
+
+    :return: Level of each tank (ft); NaN for tanks without a geometry
+    :rtype: numpy.ndarray
+    """
+    return _convert(geometries, volumes, "level")
+
+
+def area_function(geometries):
+    """Build the area(levels) callable of a group of tanks, for drain.time_to_empty() and drain.drain_levels().
+
+    :param geometries: Geometry of each tank
+
+    :except ValueError: A tank has no geometry
+
+    :return: Function of an array of one level per tank, returning the plan area of each (ft^2)
+    """
+    if any(geometry is None for geometry in geometries):
+        raise ValueError("Every tank needs a geometry.")
+    groups = _groups(geometries)
+    count = len(geometries)
+
+    def area(levels):
+        result = np.empty(count)
+        for geometry, indices in groups:
+            result[indices] = geometry.area(levels[indices])
+        return result
+    return area
@@ -8,16 +8,35 @@ Author: Cody Jackson
 
 Date: 5/28/18
 #################################
+Version 0.3
+    Optional geometry (geometry.py) for level/volume conversion
+Version 0.2
+    Optional level-dependent drain flow (drain_coeff, calibrate_drain())
 Version 0.1
     Initial build
 """
-import utility_formulas
+import math
 import numbers
 
+import utility_formulas
+
+_PLAIN_NUMBERS = (float, int)  # Checked before isinstance(numbers.Number), which is slow for the common case
+
 
 class Tank:
-    """Generic storage tank."""
-    def __init__(self, name="", level=0.0, fluid_density=1.94, spec_gravity=1.0, outlet_diam=0.0, outlet_slope=0.0):
+    """Generic storage tank.
+
+    By default the outlet flow is the Hazen-Williams gravity flow of the outlet pipe whenever the tank is not empty,
+    whatever the level. With a drain coefficient K set, the flow follows the hydraulic head instead (Torricelli):
+    flow = K * sqrt(level), in gpm; see calibrate_drain() and drain.py.
+
+    A tank given a geometry (a shape or strapping table from geometry.py) also has a volume, in gallons.
+    """
+    __slots__ = ("name", "__level", "fluid_density", "spec_grav", "__tank_press", "flow_out", "pipe_diam", "pipe_slope",
+                 "pipe_coeff", "drain_coeff", "geometry")
+
+    def __init__(self, name="", level=0.0, fluid_density=1.94, spec_gravity=1.0, outlet_diam=0.0, outlet_slope=0.0,
+                 drain_coeff=None, geometry=None):
         self.name = name
         self.__level = float(level)  # feet
         self.fluid_density = fluid_density  # slugs/ft3
@@ -27,6 +46,8 @@ class Tank:
         self.pipe_diam = outlet_diam
         self.pipe_slope = outlet_slope
         self.pipe_coeff = 140
+        self.drain_coeff = drain_coeff  # gpm/sqrt(ft); None keeps the level-independent gravity flow
+        self.geometry = geometry
 
     @property
     def static_tank_press(self):
@@ -37,7 +58,7 @@ class Tank:
     def static_tank_press(self, level):
         """Calculate the static fluid pressure based on tank level."""
         try:
-            if not isinstance(level, numbers.Number):
+            if level.__class__ not in _PLAIN_NUMBERS and not isinstance(level, numbers.Number):
                 raise TypeError("Numeric values only.")
             elif level <= 0:
                 self.__tank_press = 0.0
@@ -55,7 +76,7 @@ class Tank:
     def level(self, level):
         """Set the level in the tank."""
         try:
-            if not isinstance(level, numbers.Number):
+            if level.__class__ not in _PLAIN_NUMBERS and not isinstance(level, numbers.Number):
                 raise TypeError("Numeric values only.")
             elif level <= 0:
                 self.__level = 0.0
@@ -67,12 +88,54 @@ class Tank:
             self.static_tank_press = self.level
             self.gravity_flow(self.pipe_diam, self.pipe_slope, self.pipe_coeff)
 
+    @property
+    def volume(self):
+        """Return the volume of fluid in the tank, in gallons.
+
+        :except ValueError: Tank has no geometry
+        """
+        if self.geometry is None:
+            raise ValueError("Tank has no geometry.")
+        return self.geometry.volume(self.__level)
+
+    @volume.setter
+    def volume(self, volume):
+        """Set the level that holds a volume, in gallons; volumes beyond the capacity fill the tank.
+
+        :except ValueError: Tank has no geometry
+        """
+        if self.geometry is None:
+            raise ValueError("Tank has no geometry.")
+        self.level = self.geometry.level(volume)
+
     def gravity_flow(self, diameter, slope, pipe_coeff):
         if self.level > 0:
-            self.flow_out = utility_formulas.gravity_flow_rate(diameter, slope, pipe_coeff)
+            if self.drain_coeff is None:
+                self.flow_out = utility_formulas.cached_gravity_flow_rate(diameter, slope, pipe_coeff)
+            else:
+                self.flow_out = self.drain_coeff * math.sqrt(self.level)
         else:
             self.flow_out = 0.0
 
+    def calibrate_drain(self, reference_level=None):
+        """Switch to level-dependent drain flow, matching the outlet pipe's gravity flow at a reference level.
+
+        :param reference_level: Level (ft) where both models give the same flow; defaults to the current level
+
+        :except ValueError: Reference level <= 0
+
+        :return: Drain coefficient, in gpm/sqrt(ft)
+        :rtype: float
+        """
+        if reference_level is None:
+            reference_level = self.level
+        if reference_level <= 0:
+            raise ValueError("Reference level must be > 0.")
+        flow = utility_formulas.cached_gravity_flow_rate(self.pipe_diam, self.pipe_slope, self.pipe_coeff)
+        self.drain_coeff = flow / math.sqrt(reference_level)
+        self.gravity_flow(self.pipe_diam, self.pipe_slope, self.pipe_coeff)
+        return self.drain_coeff
+
 
 if __name__ == "__main__":
     tank1 = Tank("tank1", 10)
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC tank_farm.py
+
+Purpose: Array-backed storage for large numbers of tanks.
+
+Classes:
+    TankFarm: Holds tank parameters in contiguous NumPy columns and recalculates them in one vectorized pass
+    TankView: Tank-compatible view of a single row of a TankFarm
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.4
+    TankView.gravity_flow() uses the cached gravity flow rate, as Tank does
+Version 0.3
+    Tank geometries and vectorized level/volume conversion
+Version 0.2
+    Drain coefficients (level-dependent flow, as Tank.drain_coeff)
+Version 0.1
+    Initial build
+"""
+import math
+import numbers
+
+import numpy as np
+
+import utility_formulas
+from PipingSystems.storage_tank import geometry
+
+_COLUMNS = ("level", "fluid_density", "spec_grav", "tank_press", "flow_out", "pipe_diam", "pipe_slope", "pipe_coeff",
+            "drain_coeff")
+
+
+class TankFarm:
+    """Collection of storage tanks stored column-wise.
+
+    Each tank parameter is a NumPy array indexed by tank number, so static pressure and gravity flow for every tank are
+    recalculated with one call to recalculate(). Individual tanks are reached through TankView objects, which behave
+    like PipingSystems.storage_tank.tank.Tank.
+
+    Variables: names, levels, densities, spec_gravities, pressures, flows, outlet_diameters, outlet_slopes, pipe_coeffs,
+        drain_coeffs, geometries
+
+    Methods: add_tank(), from_tanks(), set_levels(), recalculate(), volumes(), set_volumes()
+    """
+    def __init__(self, capacity=16):
+        """Allocate empty columns.
+
+        :param capacity: Number of tanks to reserve space for; columns grow automatically
+        """
+        self.names = []
+        self.geometries = []  # geometry.py shape or strapping table of each tank, or None
+        self.__size = 0
+        self.__views = []
+        self.__columns = {column: np.zeros(max(int(capacity), 1)) for column in _COLUMNS}
+
+    def __len__(self):
+        return self.__size
+
+    def __getitem__(self, index):
+        """Return the TankView for a tank index."""
+        return self.__views[index]
+
+    def __iter__(self):
+        return iter(self.__views)
+
+    def column(self, column):
+        """Get the live array for a parameter, trimmed to the number of tanks.
+
+        :param column: Parameter name, e.g. "level"
+
+        :return: View into the underlying column; writes are reflected in the farm
+        :rtype: numpy.ndarray
+        """
+        return self.__columns[column][:self.__size]
+
+    @property
+    def levels(self):
+        """Fluid level of every tank, in feet."""
+        return self.column("level")
+
+    @property
+    def densities(self):
+        """Fluid density of every tank, in slugs/ft3."""
+        return self.column("fluid_density")
+
+    @property
+    def spec_gravities(self):
+        """Fluid specific gravity of every tank."""
+        return self.column("spec_grav")
+
+    @property
+    def pressures(self):
+        """Static outlet pressure of every tank, in psi."""
+        return self.column("tank_press")
+
+    @property
+    def flows(self):
+        """Gravity outlet flow of every tank, in gpm."""
+        return self.column("flow_out")
+
+    @property
+    def outlet_diameters(self):
+        """Outlet pipe diameter of every tank, in inches."""
+        return self.column("pipe_diam")
+
+    @property
+    def outlet_slopes(self):
+        """Outlet pipe slope of every tank."""
+        return self.column("pipe_slope")
+
+    @property
+    def pipe_coeffs(self):
+        """Outlet pipe roughness coefficient of every tank."""
+        return self.column("pipe_coeff")
+
+    @property
+    def drain_coeffs(self):
+        """Drain coefficient of every tank, in gpm/sqrt(ft); NaN for tanks with level-independent gravity flow."""
+        return self.column("drain_coeff")
+
+    def add_tank(self, name="", level=0.0, fluid_density=1.94, spec_gravity=1.0, outlet_diam=0.0, outlet_slope=0.0,
+                 pipe_coeff=140, drain_coeff=None, geometry=None):
+        """Append a tank to the farm.
+
+        Parameters match Tank(); the tank's pressure and flow are calculated immediately.
+
+        :return: View of the new tank
+        :rtype: TankView
+        """
+        if self.__size == self.__columns["level"].size:
+            self.__grow()
+        index = self.__size
+        self.__size += 1
+        self.names.append(name)
+        self.geometries.append(geometry)
+        row = {"fluid_density": fluid_density, "spec_grav": spec_gravity, "pipe_diam": outlet_diam,
+               "pipe_slope": outlet_slope, "pipe_coeff": pipe_coeff,
+               "drain_coeff": np.nan if drain_coeff is None else drain_coeff}
+        for column, value in row.items():
+            self.__columns[column][index] = value
+        view = TankView(self, index)
+        self.__views.append(view)
+        view.level = float(level)
+        return view
+
+    @classmethod
+    def from_tanks(cls, tanks):
+        """Build a farm from existing Tank objects, copying their current parameters.
+
+        :param tanks: Iterable of Tank instances
+
+        :return: New tank farm
+        :rtype: TankFarm
+        """
+        tanks = list(tanks)
+        farm = cls(capacity=len(tanks))
+        for tank in tanks:
+            farm.add_tank(tank.name, tank.level, tank.fluid_density, tank.spec_grav, tank.pipe_diam, tank.pipe_slope,
+                          tank.pipe_coeff, tank.drain_coeff, tank.geometry)
+        return farm
+
+    def set_levels(self, levels):
+        """Set the level of every tank and recalculate the farm.
+
+        Non-positive levels are stored as 0, matching Tank.level.
+
+        :param levels: Sequence or array with one level per tank, in feet
+        """
+        self.levels[:] = np.maximum(np.asarray(levels, dtype=np.float64), 0.0)
+        self.recalculate()
+
+    def volumes(self):
+        """Get the volume of every tank; tanks sharing a geometry object are converted together.
+
+        :return: Volume of each tank, in gallons; NaN for tanks without a geometry
+        :rtype: numpy.ndarray
+        """
+        return geometry.to_volumes(self.geometries, self.levels)
+
+    def set_volumes(self, volumes):
+        """Set the level of every tank from its volume and recalculate the farm.
+
+        :param volumes: Sequence or array with one volume per tank, in gallons
+
+        :except ValueError: A tank has no geometry
+        """
+        levels = geometry.to_levels(self.geometries, volumes)
+        if np.any(np.isnan(levels)):
+            raise ValueError("Every tank needs a geometry.")
+        self.set_levels(levels)
+
+    def recalculate(self):
+        """Recalculate static pressure and gravity flow for every tank in one pass.
+
+        Results are identical to setting Tank.level on each tank individually.
+        """
+        levels = self.levels
+        filled = levels > 0
+        self.pressures[:] = np.where(filled, utility_formulas.static_press_array(levels, self.densities), 0.0)
+        flows = utility_formulas.gravity_flow_rate_array(self.outlet_diameters, self.outlet_slopes, self.pipe_coeffs)
+        drain_coeffs = self.drain_coeffs
+        if not np.all(np.isnan(drain_coeffs)):
+            flows = np.where(np.isnan(drain_coeffs), flows, drain_coeffs * np.sqrt(levels))
+        self.flows[:] = np.where(filled, flows, 0.0)
+
+    def _get(self, column, index):
+        return float(self.__columns[column][index])
+
+    def _set(self, column, index, value):
+        self.__columns[column][index] = value
+
+    def __grow(self):
+        """Double the capacity of every column."""
+        for column, values in self.__columns.items():
+            grown = np.zeros(values.size * 2)
+            grown[:values.size] = values
+            self.__columns[column] = grown
+
+
+class TankView:
+    """Tank-compatible accessor for one row of a TankFarm.
+
+    Supports the same attributes, properties, and validation as Tank, so code written for Tank objects (such as
+    Models.FuelFarm.functionality.change_tank_level) works unchanged.
+    """
+    def __init__(self, farm, index):
+        self.farm = farm
+        self.index = index
+
+    def __repr__(self):
+        return "TankView({name!r}, index={index})".format(name=self.name, index=self.index)
+
+    @property
+    def name(self):
+        """Tank name."""
+        return self.farm.names[self.index]
+
+    @name.setter
+    def name(self, name):
+        self.farm.names[self.index] = name
+
+    @property
+    def static_tank_press(self):
+        """Return hydrostatic tank pressure."""
+        return self.farm._get("tank_press", self.index)
+
+    @static_tank_press.setter
+    def static_tank_press(self, level):
+        """Calculate the static fluid pressure based on tank level."""
+        if not isinstance(level, numbers.Number):
+            raise TypeError("Numeric values only.")
+        elif level <= 0:
+            self.farm._set("tank_press", self.index, 0.0)
+        else:
+            self.farm._set("tank_press", self.index, utility_formulas.static_press(self.level, self.fluid_density))
+
+    @property
+    def level(self):
+        """Return fluid level in tank."""
+        return self.farm._get("level", self.index)
+
+    @level.setter
+    def level(self, level):
+        """Set the level in the tank."""
+        try:
+            if not isinstance(level, numbers.Number):
+                raise TypeError("Numeric values only.")
+            elif level <= 0:
+                self.farm._set("level", self.index, 0.0)
+            else:
+                self.farm._set("level", self.index, level)
+        finally:
+            self.static_tank_press = self.level
+            self.gravity_flow(self.pipe_diam, self.pipe_slope, self.pipe_coeff)
+
+    @property
+    def geometry(self):
+        """Tank shape or strapping table, or None."""
+        return self.farm.geometries[self.index]
+
+    @geometry.setter
+    def geometry(self, shape):
+        self.farm.geometries[self.index] = shape
+
+    @property
+    def volume(self):
+        """Return the volume of fluid in the tank, in gallons."""
+        if self.geometry is None:
+            raise ValueError("Tank has no geometry.")
+        return self.geometry.volume(self.level)
+
+    @volume.setter
+    def volume(self, volume):
+        """Set the level that holds a volume, in gallons."""
+        if self.geometry is None:
+            raise ValueError("Tank has no geometry.")
+        self.level = self.geometry.level(volume)
+
+    @property
+    def drain_coeff(self):
+        """Drain coefficient, in gpm/sqrt(ft), or None for level-independent gravity flow."""
+        coeff = self.farm._get("drain_coeff", self.index)
+        return None if coeff != coeff else coeff
+
+    @drain_coeff.setter
+    def drain_coeff(self, coeff):
+        self.farm._set("drain_coeff", self.index, np.nan if coeff is None else coeff)
+
+    def gravity_flow(self, diameter, slope, pipe_coeff):
+        if self.level > 0:
+            if self.drain_coeff is None:
+                self.flow_out = utility_formulas.cached_gravity_flow_rate(diameter, slope, pipe_coeff)
+            else:
+                self.flow_out = self.drain_coeff * math.sqrt(self.level)
+        else:
+            self.flow_out = 0.0
+
+
+def _column_property(column, doc):
+    """Create a property that reads and writes one cell of a TankFarm column."""
+    def getter(self):
+        return self.farm._get(column, self.index)
+
+    def setter(self, value):
+        self.farm._set(column, self.index, value)
+
+    return property(getter, setter, doc=doc)
+
+
+TankView.fluid_density = _column_property("fluid_density", "Fluid density, in slugs/ft3.")
+TankView.spec_grav = _column_property("spec_grav", "Fluid specific gravity.")
+TankView.flow_out = _column_property("flow_out", "Gravity outlet flow, in gpm.")
+TankView.pipe_diam = _column_property("pipe_diam", "Outlet pipe diameter, in inches.")
+TankView.pipe_slope = _column_property("pipe_slope", "Outlet pipe slope.")
+TankView.pipe_coeff = _column_property("pipe_coeff", "Outlet pipe roughness coefficient.")
+
+
+if __name__ == "__main__":
+    farm = TankFarm()
+    farm.add_tank("Tank 1", 36.0, 1.629869, 0.840, 16, 0.25)
+    farm.add_tank("Tank 2", 18.0, 1.629869, 0.840, 16, 0.25)
+    print(farm.pressures, farm.flows)
+    farm.set_levels([10.0, 0.0])
+    print(farm.pressures, farm.flows)
+    print(farm[0].level, farm[0].static_tank_press, farm[0].flow_out)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC system_curve.py
+
+Purpose: Find where a pump settles against the valves downstream of it.
+
+The valves form a lineup of Series and Parallel groups. Each valve passes Cv * position / 100 (a linear trim), so a
+closed valve blocks its branch. Groups combine as:
+    series: 1 / Cv ** 2 = sum(1 / Cv_i ** 2)
+    parallel: Cv = sum(Cv_i)
+The system curve is then the static pressure of the discharge elevation (utility_formulas.static_press) plus the
+lineup's pressure drop, spec. gravity * (flow / Cv) ** 2, both converted to feet of head. Its crossing with the pump's
+performance curve (pump_curve.PumpCurve) is the operating point.
+
+Solved points are cached by lineup (every valve's Cv and position, the pump speed and curve, the elevation, and the
+fluid's density and specific gravity), so returning to a lineup seen before costs a dictionary lookup.
+
+Classes:
+    CacheInfo: Solver cache statistics, as functools.lru_cache reports them
+    Series: Valves or groups in series
+    Parallel: Valves or groups in parallel
+    SystemCurve: Resistance of a lineup plus static head
+    OperatingPointSolver: Cached operating points of a pump on a system curve
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.2
+    Fluid density and specific gravity are part of the solver cache key
+Version 0.1
+    Initial build
+"""
+import collections
+import math
+
+import numpy as np
+
+import utility_formulas
+
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class Series:
+    """Valves, or Series/Parallel groups, one after another.
+
+    Variables: elements
+    """
+    def __init__(self, *elements):
+        self.elements = elements
+
+    @staticmethod
+    def combine(coefficients):
+        """Combine flow coefficients (numbers, or arrays of lineups) in series; any closed element closes the group."""
+        if not isinstance(coefficients[0], np.ndarray):
+            if 0 in coefficients:
+                return 0.0
+            return 1 / math.sqrt(sum(1 / (cv * cv) for cv in coefficients))
+        closed = np.logical_or.reduce([cv == 0 for cv in coefficients])
+        with np.errstate(divide="ignore"):
+            total = sum(1 / np.square(cv) for cv in coefficients)
+        return np.where(closed, 0.0, 1 / np.sqrt(np.where(closed, 1.0, total)))
+
+
+class Parallel:
+    """Valves, or Series/Parallel groups, side by side.
+
+    Variables: elements
+    """
+    def __init__(self, *elements):
+        self.elements = elements
+
+    @staticmethod
+    def combine(coefficients):
+        """Combine flow coefficients (numbers, or arrays of lineups) in parallel."""
+        return sum(coefficients)
+
+
+class SystemCurve:
+    """System resistance curve of a valve lineup.
+
+    Variables: lineup, valves, elevation, density, spec_grav
+
+    Methods: flow_coeff(), static_head(), resistance(), head(), key()
+    """
+    def __init__(self, lineup, elevation=0.0, density=utility_formulas.WATER_DENSITY,
+                 spec_grav=utility_formulas.WATER_SPEC_GRAV):
+        """
+        :param lineup: Valve, Series, or Parallel
+        :param elevation: Height of the discharge point above the pump (ft)
+        :param density: Fluid density (slugs/ft^3)
+        :param spec_grav: Fluid specific gravity
+        """
+        self.lineup = lineup
+        self.valves = []
+        self._collect(lineup)
+        self.elevation = elevation
+        self.density = density
+        self.spec_grav = spec_grav
+
+    def _collect(self, element):
+        """List every valve in the lineup, in order."""
+        if isinstance(element, (Series, Parallel)):
+            for child in element.elements:
+                self._collect(child)
+        else:
+            self.valves.append(element)
+
+    def flow_coeff(self, positions=None):
+        """Get the lineup's equivalent flow coefficient.
+
+        :param positions: Optional (lineups, valves) array of positions to evaluate instead of the valves' current
+            positions; columns follow the order of self.valves
+
+        :return: Equivalent Cv; an array with one value per row of positions, if given
+        """
+        if positions is None:
+            coefficients = iter([valve.Cv * valve.position / 100 for valve in self.valves])
+        else:
+            positions = np.asarray(positions, dtype=float)
+            cv = np.array([valve.Cv for valve in self.valves])
+            coefficients = iter((positions * cv / 100).T)
+        return self._combine(self.lineup, coefficients)
+
+    def _combine(self, element, coefficients):
+        if isinstance(element, (Series, Parallel)):
+            return element.combine([self._combine(child, coefficients) for child in element.elements])
+        return next(coefficients)
+
+    def static_head(self):
+        """Get the static head of the discharge elevation (ft)."""
+        return utility_formulas.press_to_head(utility_formulas.static_press(self.elevation, self.density),
+                                              self.spec_grav)
+
+    def resistance(self, flow_coeff):
+        """Convert an equivalent Cv to a resistance coefficient (ft/gpm^2); infinite for a closed lineup."""
+        if not isinstance(flow_coeff, np.ndarray):
+            return math.inf if flow_coeff == 0 else utility_formulas.press_to_head(self.spec_grav / flow_coeff ** 2,
+                                                                                   self.spec_grav)
+        with np.errstate(divide="ignore"):
+            return utility_formulas.press_to_head(self.spec_grav / np.square(flow_coeff), self.spec_grav)
+
+    def head(self, flow, positions=None):
+        """Get the system head (ft) at a flow, for the current or given positions."""
+        return self.static_head() + self.resistance(self.flow_coeff(positions)) * np.square(flow)
+
+    def key(self):
+        """Identify the current lineup: elevation, fluid, and every valve's Cv and position."""
+        valves = tuple((valve.Cv, valve.position) for valve in self.valves)
+        return (self.elevation, self.density, self.spec_grav) + valves
+
+
+class OperatingPointSolver:
+    """Operating points of one pump on one system curve.
+
+    Variables: pump, system, cache_size, hits, misses
+
+    Methods: solve(), settle(), solve_many(), cache_info(), clear_cache()
+    """
+    def __init__(self, pump, system, cache_size=4096):
+        """
+        :param pump: Pump with a performance curve
+        :param system: SystemCurve of the valves downstream of the pump
+        :param cache_size: Lineups remembered; the least recently used is dropped beyond this
+
+        :except ValueError: Pump has no performance curve
+        """
+        if pump.curve is None:
+            raise ValueError("Pump has no performance curve.")
+        self.pump = pump
+        self.system = system
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.__cache = collections.OrderedDict()
+
+    def solve(self):
+        """Find the operating point for the current valve positions and pump speed.
+
+        :rtype: pump_curve.OperatingPoint
+        """
+        curve = self.pump.curve
+        key = (self.pump.speed, curve, curve.version) + self.system.key()
+        try:
+            point = self.__cache[key]
+        except KeyError:
+            pass
+        else:
+            self.__cache.move_to_end(key)
+            self.hits += 1
+            return point
+        self.misses += 1
+        flow_coeff = self.system.flow_coeff()
+        if flow_coeff > 0:
+            point = curve.operating_point(self.pump.speed, self.system.static_head(),
+                                          self.system.resistance(flow_coeff))
+        else:  # Closed lineup: the pump runs dead-headed at shutoff
+            point = curve.operating_point(self.pump.speed, np.inf, 0.0)
+        self.__cache[key] = point
+        if len(self.__cache) > self.cache_size:
+            self.__cache.popitem(last=False)
+        return point
+
+    def settle(self):
+        """Solve and set the pump's flow, outlet pressure, and power from the operating point."""
+        point = self.solve()
+        self.pump.set_operating_point(point)
+        return point
+
+    def solve_many(self, positions, speeds=None):
+        """Solve many lineups at once, e.g. for a study of every valve combination. Results are not cached.
+
+        :param positions: (lineups, valves) array of valve positions, columns in the order of system.valves
+        :param speeds: Pump speed for each lineup, or one for all; defaults to the pump's current speed
+
+        :return: Arrays of flow, head, efficiency, and NPSHr, one value per lineup
+        :rtype: pump_curve.OperatingPoint
+        """
+        positions = np.atleast_2d(np.asarray(positions, dtype=float))
+        count = len(positions)
+        speeds = np.broadcast_to(np.asarray(self.pump.speed if speeds is None else speeds, dtype=float), (count,))
+        flow_coeff = self.system.flow_coeff(positions)
+        closed = flow_coeff == 0
+        static_head = np.where(closed, np.inf, self.system.static_head())
+        resistance = np.where(closed, 0.0, self.system.resistance(np.where(closed, 1.0, flow_coeff)))
+        return self.pump.curve.operating_points(speeds, static_head, resistance)
+
+    def cache_info(self):
+        """Get cache statistics.
+
+        :rtype: CacheInfo
+        """
+        return CacheInfo(self.hits, self.misses, self.cache_size, len(self.__cache))
+
+    def clear_cache(self):
+        """Forget every solved lineup."""
+        self.__cache.clear()
+        self.hits = self.misses = 0
@@ -5,62 +5,134 @@ VirtualPLC user_creation_script.py
 Purpose: Allow for automated creation of a piping model from user input. Assumes a drawing of the model has already
 been made to allow correct mapping of inputs and outputs.
 
-Classes:
+Answers are turned into plant file entries (see PipingSystems.plant_loader) and saved as JSON, so the model can be
+reloaded later with load_plant() instead of answering the prompts again.
 
 Author: Cody Jackson
 
 Date: 5/15/18
 ###############################
+Version 0.2
+    Prompts build declarative plant file entries; added globe and relief valves, saving
 Version 0.1
     Initial build
 """
+import json
+
+from PipingSystems.plant_loader import compile_plant
+
+
+def _inlets():
+    """Ask which components feed the new one."""
+    answer = input("What is feeding into this component? Enter component ids separated by commas, or leave blank. ")
+    return [inlet.strip() for inlet in answer.split(",") if inlet.strip()]
+
+
+def _valve_entry(valve_type):
+    """Ask for the values common to every valve."""
+    entry = {"id": input("Please provide the id for this valve: "), "type": valve_type}
+    entry["name"] = input("Please provide the name for this valve: ") or entry["id"]
+    gate_cv = float(input("What is the flow coefficient of the valve? If unknown, enter '-1' to calculate an "
+                          "estimate. "))
+    if gate_cv == -1:
+        entry["diameter"] = float(input("What is the valve diameter? "))
+    else:
+        entry["flow_coeff"] = gate_cv
+    entry["inlets"] = _inlets()
+    return entry
 
 
 def request_component():
-    """Ask user to provide new piping component."""
-    new_item = int(input("Enter the number of the component that should be added: Valve = 1, Pump = 2"))
+    """Ask user to provide new piping component.
+
+    :return: Plant file entry, or None for an invalid selection
+    :rtype: dict
+    """
+    new_item = int(input("Enter the number of the component that should be added: Valve = 1, Pump = 2, Tank = 3"))
     if new_item == 1:
-        valve()
+        return valve()
     elif new_item == 2:
-        pump()
+        return pump()
+    elif new_item == 3:
+        return tank()
     else:
-        print("Invalid selection. Please enter '1' or '2'.")
+        print("Invalid selection. Please enter '1', '2', or '3'.")
 
 
 def valve():
     """Determine the type of valve to create."""
     valve_type = int(input("What type of valve should be created? Gate = 1, Globe = 2, Relief = 3"))
     if valve_type == 1:
-        gate_valve()
+        return gate_valve()
     elif valve_type == 2:
-        globe_valve()
+        return globe_valve()
     elif valve_type == 3:
-        relief_valve()
+        return relief_valve()
     else:
         print("Invalid selection. Please enter '1', '2', or '3'.")
 
 
 def gate_valve():
     """Create a gate valve."""
-    gate_name = input("Please provide the name for this valve: ")
-    gate_position = input("Is the valve open or closed? ")
-    gate_cv = float(input("What is the flow coefficient of the valve? If unknown, enter '-1' to calculate an "
-                          "estimate. "))
-    if gate_cv == -1:
-        gate_diam = float(input("What is the valve diameter? "))
-        # gate_cv = Valve.calc_coeff(gate_diam)
-    gate_precede_component = int(input("What is feeding into this valve? Tank = 1, Valve = 2, Pump = 3"))
-    if gate_precede_component == 1:
-        gate_tank_diam = float(input("What is the diameter of the pipe from the tank, in inches? "))
-        gate_tank_static = float(input("What is the fluid height above the valve? "))
-        gate_tank_slope = float(input("What is the slope of the pipe from the tank to the valve?"))
-    gate_flow_in = input("What is the flow rate into the valve, in gallons per minute? ")
-    gate_press_in = input("What is the inlet pressure of the valve? ")
+    entry = _valve_entry("gate")
+    entry["position"] = 100 if input("Is the valve open or closed? ").strip().lower() == "open" else 0
+    return entry
 
 
 def globe_valve():
-    pass
+    """Create a globe (throttling) valve."""
+    entry = _valve_entry("globe")
+    entry["position"] = int(input("What percentage open is the valve? "))
+    return entry
 
 
 def relief_valve():
-    pass
\ No newline at end of file
+    """Create a pressure relief valve."""
+    entry = _valve_entry("relief")
+    entry["open_press"] = float(input("At what pressure does the valve open? "))
+    entry["close_press"] = float(input("At what pressure does the valve close? "))
+    return entry
+
+
+def pump():
+    """Create a pump."""
+    pump_type = int(input("What type of pump should be created? Centrifugal = 1, Positive displacement = 2"))
+    entry = {"id": input("Please provide the id for this pump: "),
+             "type": "centrifugal" if pump_type == 1 else "positive_displacement"}
+    entry["name"] = input("Please provide the name for this pump: ") or entry["id"]
+    if pump_type != 1:
+        entry["displacement"] = float(input("What is the pump displacement per revolution? "))
+    entry["inlets"] = _inlets()
+    return entry
+
+
+def tank():
+    """Create a storage tank."""
+    entry = {"id": input("Please provide the id for this tank: "), "type": "tank"}
+    entry["name"] = input("Please provide the name for this tank: ") or entry["id"]
+    entry["level"] = float(input("What is the fluid level in the tank, in feet? "))
+    entry["outlet_diam"] = float(input("What is the diameter of the pipe from the tank, in inches? "))
+    entry["outlet_slope"] = float(input("What is the slope of the pipe from the tank? "))
+    return entry
+
+
+def save_plant(path, name, entries):
+    """Check the entries form a valid plant and write them as a plant file.
+
+    :except ValueError: Invalid plant
+    """
+    definition = {"name": name, "components": entries}
+    compile_plant(definition)
+    with open(path, "w") as file:
+        json.dump(definition, file, indent=2)
+
+
+if __name__ == "__main__":
+    components = []
+    while True:
+        component = request_component()
+        if component is not None:
+            components.append(component)
+        if input("Add another component? (y/n) ").strip().lower() != "y":
+            break
+    save_plant(input("Save plant as: "), input("Plant name: "), components)
@@ -32,6 +32,7 @@ class Valve:
     Methods: calc_coeff(), press_drop(), valve_flow_out(), get_press_out(), get_position(), change_position(), open(),
     close()
     """
+    __slots__ = ("name", "__position", "Cv", "flow_in", "deltaP", "flow_out", "press_out", "press_in")
 
     def __init__(self, name="", sys_flow_in=0.0, sys_flow_out=0.0, drop=0.0, position=0, flow_coeff=0.0, press_in=0.0):
         """Initialize valve.
@@ -171,6 +172,8 @@ class Gate(Valve):
         read_position()
         turn_handle()
     """
+    __slots__ = ()
+
     def read_position(self):
         """Identify the position of the valve.
 
@@ -208,6 +211,7 @@ class Globe(Valve):
         read_position()
         turn_handle()
     """
+    __slots__ = ()
 
     def read_position(self):
         """Identify the position of the valve."""
@@ -247,6 +251,7 @@ class Relief(Valve):
         read_close_pressure()
         valve_operation()
     """
+    __slots__ = ("setpoint_open", "setpoint_close")
 
     def __init__(self, name="", sys_flow_in=0.0, sys_flow_out=0.0, drop=0.0, position=0, flow_coeff=0.0,
                  press_in=0.0, open_press=0, close_press=0):
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC valve_bank.py
+
+Purpose: Column-oriented storage and vectorized calculations for large numbers of valves.
+
+Classes:
+    ValveBank: Holds Cv, position, flows, and pressures for many valves in NumPy arrays
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import numbers
+
+import numpy as np
+
+from PipingSystems.valve.valve import Globe
+
+_FLOAT_COLUMNS = ("Cv", "flow_in", "flow_out", "press_in", "press_out", "deltaP")
+
+
+class ValveBank:
+    """Many valves stored column-wise.
+
+    Each method operates on the whole bank, or on the rows selected by an optional index array or boolean mask, in one
+    vectorized call. Results match the Valve, Gate, and Globe methods of the same name. Where a single valve would
+    return an error message or raise (Cv of 0, pressure drop <= 0), the affected rows are left unchanged and reported in
+    the returned mask instead.
+
+    Variables: names, Cv, position, flow_in, flow_out, press_in, press_out, deltaP, throttling
+
+    Methods: add_valve(), from_valves(), update_valves(), press_drop(), valve_flow_out(), get_press_out(), open(),
+    close(), turn_handle()
+    """
+    def __init__(self, capacity=16):
+        """Allocate empty columns.
+
+        :param capacity: Number of valves to reserve space for; columns grow automatically
+        """
+        capacity = max(int(capacity), 1)
+        self.names = []
+        self.__size = 0
+        self.__columns = {column: np.zeros(capacity) for column in _FLOAT_COLUMNS}
+        self.__columns["position"] = np.zeros(capacity, dtype=np.int64)
+        self.__columns["throttling"] = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return self.__size
+
+    def __getattr__(self, column):
+        """Expose each column, trimmed to the number of valves, as an attribute."""
+        columns = self.__dict__.get("_ValveBank__columns", {})
+        if column in columns:
+            return columns[column][:self.__size]
+        raise AttributeError(column)
+
+    def add_valve(self, name="", sys_flow_in=0.0, sys_flow_out=0.0, drop=0.0, position=0, flow_coeff=0.0, press_in=0.0,
+                  throttling=False):
+        """Append a valve. Parameters match Valve(); throttling selects Globe behavior for turn_handle().
+
+        :return: Index of the new valve
+        :rtype: int
+        """
+        if self.__size == self.__columns["Cv"].size:
+            for column, values in self.__columns.items():
+                grown = np.zeros(values.size * 2, dtype=values.dtype)
+                grown[:values.size] = values
+                self.__columns[column] = grown
+        index = self.__size
+        self.__size += 1
+        self.names.append(name)
+        row = {"Cv": flow_coeff, "flow_in": sys_flow_in, "flow_out": sys_flow_out, "press_in": press_in,
+               "press_out": 0.0, "deltaP": drop, "position": int(position), "throttling": throttling}
+        for column, value in row.items():
+            self.__columns[column][index] = value
+        return index
+
+    @classmethod
+    def from_valves(cls, valves):
+        """Build a bank from existing valve objects, copying their current state.
+
+        Globe valves are marked as throttling.
+
+        :param valves: Iterable of Valve instances
+
+        :return: New valve bank
+        :rtype: ValveBank
+        """
+        valves = list(valves)
+        bank = cls(capacity=len(valves))
+        for valve in valves:
+            index = bank.add_valve(valve.name, valve.flow_in, valve.flow_out, valve.deltaP, valve.position, valve.Cv,
+                                   valve.press_in, isinstance(valve, Globe))
+            bank.press_out[index] = valve.press_out
+        return bank
+
+    def update_valves(self, valves):
+        """Copy the bank's state back onto valve objects, in the same order used by from_valves().
+
+        :param valves: Sequence of Valve instances, one per row
+        """
+        columns = {column: getattr(self, column).tolist() for column in _FLOAT_COLUMNS + ("position",)}
+        for index, valve in enumerate(valves):
+            for column, values in columns.items():
+                setattr(valve, column, values[index])
+
+    def _rows(self, which):
+        """Convert an index array, boolean mask, or None (all rows) to a boolean mask."""
+        mask = np.zeros(self.__size, dtype=bool)
+        if which is None:
+            mask[:] = True
+        else:
+            mask[which] = True
+        return mask
+
+    def press_drop(self, spec_grav=1.0, which=None):
+        """Calculate the pressure drop across each valve from its outlet flow.
+
+        Pressure drop = ((flow out / Cv) ** 2) * spec. gravity of fluid
+
+        :param spec_grav: Fluid specific gravity (scalar or one per valve)
+        :param which: Rows to update; defaults to all
+
+        :return: Rows skipped because Cv == 0
+        :rtype: numpy.ndarray
+        """
+        rows = self._rows(which)
+        invalid = rows & (self.Cv == 0)
+        valid = rows & ~invalid
+        cv = np.where(valid, self.Cv, 1.0)
+        x = self.flow_out / cv
+        self.deltaP[:] = np.where(valid, np.square(x) * spec_grav, self.deltaP)
+        return invalid
+
+    def valve_flow_out(self, spec_grav=1.0, which=None):
+        """Calculate the flow through each valve from its pressure drop.
+
+        Flow rate = valve coefficient / sqrt(spec. grav. / press. drop)
+
+        :param spec_grav: Fluid specific gravity (scalar or one per valve)
+        :param which: Rows to update; defaults to all
+
+        :return: Rows skipped because Cv <= 0 or deltaP <= 0
+        :rtype: numpy.ndarray
+        """
+        rows = self._rows(which)
+        invalid = rows & ((self.Cv <= 0) | (self.deltaP <= 0))
+        valid = rows & ~invalid
+        x = spec_grav / np.where(valid, self.deltaP, 1.0)
+        self.flow_out[:] = np.where(valid, self.Cv / np.sqrt(x), self.flow_out)
+        return invalid
+
+    def get_press_out(self, press_in=None, which=None):
+        """Calculate each valve's outlet pressure from its inlet pressure.
+
+        :param press_in: New inlet pressures (scalar or one per valve); zero or None keeps the stored value
+        :param which: Rows to update; defaults to all
+        """
+        rows = self._rows(which)
+        if press_in is not None:
+            press_in = np.broadcast_to(np.asarray(press_in, dtype=np.float64), rows.shape)
+            self.press_in[:] = np.where(rows & (press_in != 0), press_in, self.press_in)
+        self.press_drop(which=rows)
+        self.press_out[:] = np.where(rows, self.press_in - self.deltaP, self.press_out)
+
+    def open(self, which=None):
+        """Fully open valves: outlet flow and pressure equal inlet values."""
+        rows = self._rows(which)
+        self.position[rows] = 100
+        self.flow_out[rows] = self.flow_in[rows]
+        self.press_out[rows] = self.press_in[rows]
+
+    def close(self, which=None):
+        """Fully close valves: no flow, pressure, or pressure drop downstream."""
+        rows = self._rows(which)
+        self.position[rows] = 0
+        self.flow_out[rows] = 0.0
+        self.press_out[rows] = 0.0
+        self.deltaP[rows] = 0.0
+
+    def turn_handle(self, new_position, which=None):
+        """Move valve handles.
+
+        Positions of 0 and 100 close or open any valve. Other positions throttle Globe-type rows, scaling outlet flow by
+        percent open and recalculating pressure drop and outlet pressure; gate-type rows reject them, as Gate does.
+
+        :param new_position: Integer position, or array of positions (one per valve)
+        :param which: Rows to move; defaults to all
+
+        :except TypeError: Non-integer position provided
+
+        :return: Gate rows that rejected a partial position
+        :rtype: numpy.ndarray
+        """
+        if isinstance(new_position, numbers.Number):
+            if type(new_position) != int:
+                raise TypeError("Integer values only.")
+        else:
+            new_position = np.asarray(new_position)
+            if new_position.dtype.kind not in "iu":
+                raise TypeError("Integer values only.")
+        new_position = np.broadcast_to(new_position, (self.__size,))
+        rows = self._rows(which)
+        opening = rows & (new_position == 100)
+        closing = rows & (new_position == 0)
+        partial = rows & ~opening & ~closing
+        throttled = partial & self.throttling
+        self.open(opening)
+        self.close(closing)
+
+        self.position[throttled] = new_position[throttled]
+        self.flow_out[throttled] = self.flow_in[throttled] * self.position[throttled] / 100
+        self.press_drop(which=throttled)
+        self.get_press_out(which=throttled)
+        return partial & ~self.throttling
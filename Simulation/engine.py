@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC engine.py
+
+Purpose: Advance a plant model through time with a fixed scan cycle.
+
+Classes:
+    ScanEngine: Integrates tank levels from connected flows and re-evaluates the model once per scan
+    ScanStats: Timing results of a ScanEngine run
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import collections
+import time
+
+ScanStats = collections.namedtuple("ScanStats", ["scans", "sim_time", "wall_time", "scan_rate", "speed", "overruns",
+                                                 "max_scan_time"])
+ScanStats.__doc__ = """Results of ScanEngine.run().
+
+scans: Number of scans executed
+sim_time: Simulated seconds covered by the run
+wall_time: Real seconds the run took
+scan_rate: Achieved scans per wall-clock second
+speed: Achieved simulated seconds per wall-clock second
+overruns: Scans whose execution took longer than their wall-clock budget
+max_scan_time: Longest single scan, in seconds
+"""
+
+
+def component_flow(component):
+    """Get the outlet flow of a component, in gpm.
+
+    Tanks and valves report flow_out; pumps report flow. Plain callables are called and their result used, which allows
+    flows that depend on the current lineup.
+    """
+    if callable(component):
+        return component()
+    try:
+        return component.flow_out
+    except AttributeError:
+        return component.flow
+
+
+class ScanEngine:
+    """Fixed-step simulation loop.
+
+    Every scan advances simulated time by dt seconds: tank levels are integrated from their connected inflows and
+    outflows, then every registered task is run so pumps and valves can be re-evaluated from the new state.
+
+    Variables: dt, sim_time, scans, overruns
+
+    Methods: add_tank(), add_task(), step(), run()
+    """
+    def __init__(self, dt=1.0):
+        """Set up the engine.
+
+        :param dt: Simulated seconds per scan
+        """
+        if dt <= 0:
+            raise ValueError("Scan period must be > 0.")
+        self.dt = float(dt)
+        self.sim_time = 0.0
+        self.scans = 0
+        self.overruns = 0
+        self.__tanks = []
+        self.__tasks = []
+
+    def add_tank(self, tank, gal_per_ft, inflows=(), outflows=()):
+        """Integrate a tank's level every scan.
+
+        :param tank: Tank (or Tank-compatible object) to update
+        :param gal_per_ft: Tank capacity per foot of level, in gallons
+        :param inflows: Components or callables supplying flow into the tank, in gpm
+        :param outflows: Components or callables drawing flow out of the tank, in gpm
+        """
+        if gal_per_ft <= 0:
+            raise ValueError("Tank capacity must be > 0.")
+        self.__tanks.append((tank, float(gal_per_ft), tuple(inflows), tuple(outflows)))
+
+    def add_task(self, task):
+        """Run a callable once per scan, after tank levels are integrated.
+
+        :param task: Callable taking no arguments
+        """
+        self.__tasks.append(task)
+
+    def step(self):
+        """Advance the model by one scan."""
+        minutes = self.dt / 60  # Flows are in gpm
+        new_levels = []
+        for tank, gal_per_ft, inflows, outflows in self.__tanks:  # Evaluate all flows before changing any level
+            net_flow = sum(component_flow(c) for c in inflows) - sum(component_flow(c) for c in outflows)
+            new_levels.append(tank.level + net_flow * minutes / gal_per_ft)
+        for (tank, _, _, _), level in zip(self.__tanks, new_levels):
+            tank.level = level
+        for task in self.__tasks:
+            task()
+        self.sim_time += self.dt
+        self.scans += 1
+
+    def run(self, duration, speed=None):
+        """Run scans until the given amount of simulated time has passed.
+
+        When speed is given, scans are paced so simulated time advances at that multiple of real time; a scan that takes
+        longer than its wall-clock budget (dt / speed) is counted as an overrun. Without a speed the engine runs as fast
+        as possible and overruns are measured against real time (dt).
+
+        :param duration: Simulated seconds to run
+        :param speed: Simulated seconds per wall-clock second, or None for unpaced
+
+        :return: Timing results for this run
+        :rtype: ScanStats
+        """
+        budget = self.dt / (speed if speed else 1.0)
+        scans = int(round(duration / self.dt))
+        overruns = 0
+        max_scan = 0.0
+        start = deadline = time.perf_counter()
+        for _ in range(scans):
+            scan_start = time.perf_counter()
+            self.step()
+            scan_end = time.perf_counter()
+            scan_time = scan_end - scan_start
+            max_scan = max(max_scan, scan_time)
+            if scan_time > budget:
+                overruns += 1
+            if speed:
+                deadline += budget
+                if deadline > scan_end:
+                    time.sleep(deadline - scan_end)
+                else:
+                    deadline = scan_end  # Fell behind; don't try to catch up with a burst of scans
+        wall_time = time.perf_counter() - start
+        self.overruns += overruns
+        sim_time = scans * self.dt
+        return ScanStats(scans, sim_time, wall_time, scans / wall_time if wall_time else float("inf"),
+                         sim_time / wall_time if wall_time else float("inf"), overruns, max_scan)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC historian.py
+
+Purpose: Record component values over time in SQLite and query them back as trends.
+
+Recording only appends to an in-memory batch; a writer thread inserts full batches in single transactions, with the
+database in WAL mode so trend queries can run while history is being written. Rows may be recorded from several
+threads at once.
+
+Classes:
+    Historian: Batched SQLite history of component fields
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.2
+    record() and record_many() are safe to call from several threads
+Version 0.1
+    Initial build
+"""
+import math
+import queue
+import sqlite3
+import threading
+
+import numpy as np
+
+from PipingSystems.component_state import get_state
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    timestamp REAL NOT NULL,
+    component TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value REAL
+);
+-- value is part of the index so trend queries never have to read the table itself
+CREATE INDEX IF NOT EXISTS history_component ON history (component, field, timestamp, value);
+CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp);
+"""
+
+_INSERT = "INSERT INTO history (timestamp, component, field, value) VALUES (?, ?, ?, ?)"
+
+
+def _field_name(attribute):
+    """Remove the private-name prefix get_state() reports, e.g. _Tank__level -> level."""
+    if attribute.startswith("_") and "__" in attribute:
+        return attribute.split("__", 1)[1]
+    return attribute
+
+
+class Historian:
+    """SQLite-backed history of component values.
+
+    Variables: path, batch_size, rows_written
+
+    Methods: record(), record_many(), record_snapshots(), record_changes(), flush(), close(), trend(), query(),
+    latest()
+    """
+    def __init__(self, path, batch_size=5000):
+        """Open (or create) a history database and start the writer thread.
+
+        :param path: Database file
+        :param batch_size: Rows collected before a batch is handed to the writer
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self.__batch = []
+        self.__previous = {}  # Component name: last recorded state, for record_changes()
+        self.__queue = queue.Queue()
+        self.__lock = threading.Lock()
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+        self.__reader = self._connect()
+        self.__writer = threading.Thread(target=self._write_batches, name="historian", daemon=True)
+        self.__writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _write_batches(self):
+        """Writer thread: insert each queued batch in one transaction."""
+        connection = self._connect()
+        while True:
+            batch = self.__queue.get()
+            if batch is None:
+                self.__queue.task_done()
+                break
+            with connection:
+                connection.executemany(_INSERT, batch)
+            self.rows_written += len(batch)
+            self.__queue.task_done()
+        connection.close()
+
+    def _hand_off(self):
+        """Send the current batch to the writer thread."""
+        with self.__lock:
+            batch, self.__batch = self.__batch, []
+            if batch:
+                self.__queue.put(batch)
+
+    def _add(self, rows):
+        """Append rows to the batch, handing it off once full.
+
+        The batch is only touched under the lock: a row added after the batch was swapped out would be lost.
+        """
+        with self.__lock:
+            self.__batch.extend(rows)
+            if len(self.__batch) < self.batch_size:
+                return
+            batch, self.__batch = self.__batch, []
+            self.__queue.put(batch)  # Under the lock, so batches are queued in the order they were filled
+
+    def record(self, timestamp, component, field, value):
+        """Record one value.
+
+        :param timestamp: Time of the value, in seconds (e.g. time.time() or simulated time)
+        :param component: Component name
+        :param field: Attribute name
+        :param value: Numeric value
+        """
+        self._add(((timestamp, component, field, value),))
+
+    def record_many(self, rows):
+        """Record an iterable of (timestamp, component, field, value) rows."""
+        self._add(list(rows))  # Consume generators before taking the lock
+
+    def record_snapshots(self, records):
+        """Record scan snapshots, e.g. as the PLCRuntime history writer.
+
+        Snapshot keys are "<component>_<field>", such as "tank1_level" or "gate3_press_out"; component names must not
+        contain underscores.
+
+        :param records: List of (timestamp, {key: value}) pairs
+        """
+        self.record_many((timestamp, key.split("_", 1)[0], key.split("_", 1)[1], value)
+                         for timestamp, snapshot in records for key, value in snapshot.items())
+
+    def record_changes(self, timestamp, components):
+        """Record the numeric fields of each component that changed since the previous call.
+
+        The first call records every numeric field.
+
+        :param timestamp: Time of the check
+        :param components: Component name: component
+
+        :return: Number of values recorded
+        :rtype: int
+        """
+        rows = []
+        for name, component in components.items():
+            state = get_state(component)
+            previous = self.__previous.get(name, {})
+            for attribute, value in state.items():
+                if isinstance(value, (int, float)) and previous.get(attribute) != value:
+                    rows.append((timestamp, name, _field_name(attribute), value))
+            self.__previous[name] = state
+        self.record_many(rows)
+        return len(rows)
+
+    def flush(self):
+        """Write everything recorded so far and wait for it to be committed."""
+        self._hand_off()
+        self.__queue.join()
+
+    def close(self):
+        """Flush, stop the writer thread, and close the database."""
+        self.flush()
+        self.__queue.put(None)
+        self.__writer.join()
+        self.__reader.close()
+
+    def trend(self, component, field, start=None, end=None):
+        """Get a field's recorded values over a time range, oldest first.
+
+        Values still waiting in the current batch are not included; call flush() first to see them.
+
+        :param component: Component name
+        :param field: Attribute name
+        :param start: Earliest timestamp (inclusive); unbounded if not provided
+        :param end: Latest timestamp (inclusive); unbounded if not provided
+
+        :return: Timestamps and values
+        :rtype: tuple of numpy.ndarray
+        """
+        rows = self.__reader.execute(
+            "SELECT timestamp, value FROM history WHERE component = ? AND field = ? AND timestamp BETWEEN ? AND ? "
+            "ORDER BY timestamp", (component, field, -math.inf if start is None else start,
+                                   math.inf if end is None else end)).fetchall()
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), 2)
+        return table[:, 0], table[:, 1]
+
+    def query(self, start=None, end=None, component=None):
+        """Get every recorded value in a time range.
+
+        :param start: Earliest timestamp (inclusive); unbounded if not provided
+        :param end: Latest timestamp (inclusive); unbounded if not provided
+        :param component: Only this component, if provided
+
+        :return: (timestamp, component, field, value) rows, oldest first
+        :rtype: list
+        """
+        sql = "SELECT timestamp, component, field, value FROM history WHERE timestamp BETWEEN ? AND ?"
+        parameters = [-math.inf if start is None else start, math.inf if end is None else end]
+        if component is not None:
+            sql += " AND component = ?"
+            parameters.append(component)
+        return self.__reader.execute(sql + " ORDER BY timestamp", parameters).fetchall()
+
+    def latest(self, component, field):
+        """Get the most recent recorded (timestamp, value) of a field, or None if it has no history."""
+        return self.__reader.execute(
+            "SELECT timestamp, value FROM history WHERE component = ? AND field = ? ORDER BY timestamp DESC LIMIT 1",
+            (component, field)).fetchone()
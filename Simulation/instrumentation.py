@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC instrumentation.py
+
+Purpose: Count and time calls to component methods and plant action functions, to find what dominates scan time.
+
+Instrumentation is opt-in. enable() replaces the instrumented methods, properties, and functions with timing wrappers;
+disable() puts the originals back, so nothing is measured, and nothing costs extra, while it is off. Functions that
+were bound before enable() (e.g. functools.partial objects built by hmi.dispatcher) keep calling the originals, so
+enable instrumentation before building dispatchers and runtimes that should be measured.
+
+Times are inclusive: Globe.turn_handle() time includes the press_drop() it calls, which is also counted on its own.
+
+Results are kept as histograms per (method, component) and exported in the Prometheus text format, either to a file or
+from a small HTTP endpoint.
+
+Classes:
+    Instrumentation: Call counts and timing histograms
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import bisect
+import collections
+import functools
+import http.server
+import importlib
+import inspect
+import os
+import threading
+import time
+
+from PipingSystems.pump.pump import CentrifPump, PositiveDisplacement, Pump
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Gate, Globe, Valve
+
+# (class, attribute); properties are instrumented through their setter
+METHOD_TARGETS = (
+    (Valve, "open"),
+    (Valve, "close"),
+    (Valve, "press_drop"),
+    (Gate, "turn_handle"),
+    (Globe, "turn_handle"),
+    (CentrifPump, "adjust_speed"),
+    (PositiveDisplacement, "adjust_speed"),
+    (Pump, "pump_power"),
+    (Tank, "level"),
+    (Tank, "gravity_flow"),
+)
+# Modules whose public functions are plant actions
+ACTION_MODULES = ("Models.FuelFarm.functionality",)
+
+# Histogram bucket upper bounds, in seconds: 100 ns to 10 ms
+BUCKETS = (1e-7, 2.5e-7, 5e-7, 1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2)
+
+METRIC = "vplc_call_duration_seconds"
+
+CallStats = collections.namedtuple("CallStats", ["method", "component", "count", "total_time", "mean_time"])
+
+_active = None  # The enabled Instrumentation, if any
+_lock = threading.Lock()
+
+
+class Instrumentation:
+    """Timing histograms of component method and plant action calls.
+
+    Can be used as a context manager: instrumentation is enabled inside the with block.
+
+    Variables: enabled
+
+    Methods: enable(), disable(), reset(), record(), stats(), prometheus_text(), write_prometheus(), serve()
+    """
+    def __init__(self, targets=METHOD_TARGETS, action_modules=ACTION_MODULES):
+        """
+        :param targets: (class, method or property name) pairs to instrument
+        :param action_modules: Names of modules whose public functions are instrumented
+        """
+        self.enabled = False
+        self.__targets = tuple(targets)
+        self.__action_modules = tuple(action_modules)
+        self.__histograms = {}  # (method, component): [count, total time, per-bucket counts..., overflow count]
+        self.__originals = []  # (owner, attribute, original value), to put back on disable()
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def enable(self):
+        """Start instrumenting.
+
+        :except RuntimeError: Another Instrumentation is already enabled
+        """
+        global _active
+        with _lock:
+            if _active is self:
+                return
+            if _active is not None:
+                raise RuntimeError("Instrumentation is already enabled.")
+            _active = self
+        try:
+            for cls, attribute in self.__targets:
+                original = cls.__dict__[attribute]
+                label = "{}.{}".format(cls.__name__, attribute)
+                if isinstance(original, property):
+                    probe = property(original.fget, self._method_probe(label, original.fset), original.fdel,
+                                     original.__doc__)
+                else:
+                    probe = self._method_probe(label, original)
+                self.__originals.append((cls, attribute, original))
+                setattr(cls, attribute, probe)
+            for module_name in self.__action_modules:
+                module = importlib.import_module(module_name)
+                for name, function in inspect.getmembers(module, inspect.isfunction):
+                    if name.startswith("_") or function.__module__ != module.__name__:
+                        continue
+                    self.__originals.append((module, name, function))
+                    setattr(module, name, self._function_probe(name, module.__name__.rsplit(".", 1)[-1], function))
+        except Exception:
+            self.disable()
+            raise
+        self.enabled = True
+
+    def disable(self):
+        """Stop instrumenting and restore the original methods and functions. Recorded results are kept."""
+        global _active
+        while self.__originals:
+            owner, attribute, original = self.__originals.pop()
+            setattr(owner, attribute, original)
+        self.enabled = False
+        with _lock:
+            if _active is self:
+                _active = None
+
+    def reset(self):
+        """Discard recorded results."""
+        self.__histograms.clear()
+
+    def record(self, method, component, elapsed):
+        """Add one call to the histograms.
+
+        :param method: Method label, e.g. "Valve.open"
+        :param component: Component name
+        :param elapsed: Call duration, in seconds
+        """
+        histogram = self.__histograms.get((method, component))
+        if histogram is None:
+            histogram = self.__histograms[method, component] = [0, 0.0] + [0] * (len(BUCKETS) + 1)
+        histogram[0] += 1
+        histogram[1] += elapsed
+        histogram[2 + bisect.bisect_left(BUCKETS, elapsed)] += 1
+
+    def _method_probe(self, label, function):
+        """Wrap a method so each call is recorded against the component's name.
+
+        The probes repeat record() inline; the extra call would be most of their cost.
+        """
+        histograms = self.__histograms
+        clock = time.perf_counter
+        bucket = functools.partial(bisect.bisect_left, BUCKETS)
+        empty = [0, 0.0] + [0] * (len(BUCKETS) + 1)
+
+        @functools.wraps(function)
+        def probe(component, *args, **kwargs):
+            start = clock()
+            try:
+                return function(component, *args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                histogram = histograms.get((label, component.name))
+                if histogram is None:
+                    histogram = histograms[label, component.name] = empty.copy()
+                histogram[0] += 1
+                histogram[1] += elapsed
+                histogram[2 + bucket(elapsed)] += 1
+        return probe
+
+    def _function_probe(self, label, component, function):
+        """Wrap a plant action function; calls are recorded against the module name."""
+        histograms = self.__histograms
+        clock = time.perf_counter
+        bucket = functools.partial(bisect.bisect_left, BUCKETS)
+        key = (label, component)
+        empty = [0, 0.0] + [0] * (len(BUCKETS) + 1)
+
+        @functools.wraps(function)
+        def probe(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                histogram = histograms.get(key)
+                if histogram is None:
+                    histogram = histograms[key] = empty.copy()
+                histogram[0] += 1
+                histogram[1] += elapsed
+                histogram[2 + bucket(elapsed)] += 1
+        return probe
+
+    def stats(self):
+        """Get call counts and times, the largest total time first.
+
+        :rtype: list of CallStats
+        """
+        rows = [CallStats(method, component, histogram[0], histogram[1], histogram[1] / histogram[0])
+                for (method, component), histogram in self.__histograms.items()]
+        return sorted(rows, key=lambda row: row.total_time, reverse=True)
+
+    def prometheus_text(self):
+        """Export the histograms in the Prometheus text exposition format.
+
+        :rtype: str
+        """
+        lines = ["# HELP {} Time spent in instrumented component methods and plant actions.".format(METRIC),
+                 "# TYPE {} histogram".format(METRIC)]
+        for (method, component), histogram in sorted(self.__histograms.items()):
+            labels = 'method="{}",component="{}"'.format(_escape(method), _escape(component))
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram[2:]):
+                cumulative += count
+                lines.append('{}_bucket{{{},le="{!r}"}} {}'.format(METRIC, labels, bound, cumulative))
+            lines.append('{}_bucket{{{},le="+Inf"}} {}'.format(METRIC, labels, histogram[0]))
+            lines.append("{}_sum{{{}}} {!r}".format(METRIC, labels, histogram[1]))
+            lines.append("{}_count{{{}}} {}".format(METRIC, labels, histogram[0]))
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write the Prometheus export to a file, e.g. for the node_exporter textfile collector.
+
+        The file is replaced atomically so a collector never reads a partial export.
+        """
+        temporary = "{}.{}".format(path, os.getpid())
+        with open(temporary, "w") as file:
+            file.write(self.prometheus_text())
+        os.replace(temporary, path)
+
+    def serve(self, host="127.0.0.1", port=9108):
+        """Serve the Prometheus export over HTTP from a background thread.
+
+        :param host: Interface to listen on
+        :param port: TCP port; 0 picks a free one (see server.server_address)
+
+        :return: Running server; call shutdown() and server_close() to stop it
+        :rtype: http.server.ThreadingHTTPServer
+        """
+        instrumentation = self
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = instrumentation.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes are not worth a log line each
+
+        server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="instrumentation", daemon=True).start()
+        return server
+
+
+def _escape(value):
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
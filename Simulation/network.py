@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC network.py
+
+Purpose: Solve pressures and flows for a whole piping network in one call.
+
+Classes:
+    HydraulicNetwork: Graph of tanks, valves, and pumps solved with a sparse Newton method
+    NetworkSolution: Node pressures and branch flows produced by HydraulicNetwork.solve()
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import math
+import numbers
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import spsolve
+
+import utility_formulas
+
+from PipingSystems.pump.pump import PositiveDisplacement
+
+VALVE_EPSILON = 1e-6  # psi; valves behave linearly below this drop so the Jacobian stays finite
+PUMP_EPSILON = 1e-4  # Fraction of shutoff pressure where the pump curve is linearized
+PUMP_LEAK = 1e-6  # Backflow conductance of a dead-headed centrifugal pump, as a fraction of max flow
+
+
+class NetworkSolution:
+    """Result of HydraulicNetwork.solve().
+
+    Variables: pressures, valve_flows, pump_flows, displacement_flows, iterations, converged, residual
+    """
+    def __init__(self, network, pressures, valve_flows, pump_flows, displacement_flows, iterations, converged,
+                 residual):
+        self.network = network
+        self.pressures = pressures
+        self.valve_flows = valve_flows
+        self.pump_flows = pump_flows
+        self.displacement_flows = displacement_flows
+        self.iterations = iterations
+        self.converged = converged
+        self.residual = residual
+
+    def pressure(self, name):
+        """Get the solved pressure at a named node, in psi."""
+        return float(self.pressures[self.network.node(name, create=False)])
+
+
+class HydraulicNetwork:
+    """Piping network made of nodes joined by valves and pumps.
+
+    Nodes either have a fixed pressure (tanks, supply or delivery points) or are solved so flow into the node equals
+    flow out. Branches are valves (flow = Cv * sqrt(dP / SG), scaled by percent open), centrifugal pumps (quadratic
+    curve, scaled with the affinity laws), or positive-displacement pumps (fixed flow = speed * displacement).
+
+    Component parameters are read when solve() is called, so valve positions and pump speeds may be changed between
+    solves without rebuilding the network.
+
+    Variables: spec_grav, node_names
+
+    Methods: node(), add_node(), add_tank(), add_valve(), add_pump(), solve(), apply()
+    """
+    def __init__(self, spec_grav=1.0):
+        """Create an empty network.
+
+        :param spec_grav: Specific gravity of the fluid in the network
+        """
+        self.spec_grav = spec_grav
+        self.node_names = []
+        self.__node_index = {}
+        self.__fixed = {}  # Node index: fixed pressure or Tank
+        self.__demand = []
+        self.valves = []  # (valve, upstream index, downstream index)
+        self.pumps = []  # (pump, upstream index, downstream index, shutoff psi, max gpm, rated rpm)
+        self.displacement_pumps = []  # (pump, upstream index, downstream index)
+
+    def node(self, name, create=True):
+        """Get the index of a node, optionally creating it.
+
+        :param name: Node name
+        :param create: Add the node if it doesn't exist
+
+        :except KeyError: Node does not exist and create is False
+
+        :return: Node index
+        :rtype: int
+        """
+        try:
+            return self.__node_index[name]
+        except KeyError:
+            if not create:
+                raise
+            index = self.__node_index[name] = len(self.node_names)
+            self.node_names.append(name)
+            self.__demand.append(0.0)
+            return index
+
+    def add_node(self, name, pressure=None, demand=0.0):
+        """Add or update a node.
+
+        :param name: Node name
+        :param pressure: Fixed pressure in psi, or None to solve for it
+        :param demand: Flow withdrawn from the node, in gpm
+
+        :return: Node index
+        :rtype: int
+        """
+        index = self.node(name)
+        if pressure is not None:
+            self.__fixed[index] = float(pressure)
+        self.__demand[index] = float(demand)
+        return index
+
+    def add_tank(self, tank, name=None):
+        """Add a tank outlet as a fixed-pressure node.
+
+        The node pressure is the tank's static_tank_press at the time solve() is called.
+
+        :param tank: Tank (or Tank-compatible object)
+        :param name: Node name; defaults to the tank name
+
+        :return: Node index
+        :rtype: int
+        """
+        index = self.node(name if name is not None else tank.name)
+        self.__fixed[index] = tank
+        return index
+
+    def add_valve(self, valve, upstream, downstream):
+        """Connect two nodes with a valve.
+
+        :param valve: Valve instance
+        :param upstream: Upstream node name
+        :param downstream: Downstream node name
+        """
+        self.valves.append((valve, self.node(upstream), self.node(downstream)))
+
+    def add_pump(self, pump, upstream, downstream, shutoff_press=None, max_flow=None):
+        """Connect two nodes with a pump.
+
+        Positive-displacement pumps deliver speed * displacement regardless of pressure. Other pumps follow
+        pressure rise = shutoff_press * (1 - (flow / max_flow) ** 2), given at the pump's current speed and scaled by
+        the affinity laws when the speed changes.
+
+        :param pump: Pump instance
+        :param upstream: Suction node name
+        :param downstream: Discharge node name
+        :param shutoff_press: Pressure rise at zero flow, in psi (centrifugal pumps only)
+        :param max_flow: Flow at zero pressure rise, in gpm (centrifugal pumps only)
+
+        :except ValueError: Centrifugal pump curve missing or not positive
+        """
+        if isinstance(pump, PositiveDisplacement):
+            self.displacement_pumps.append((pump, self.node(upstream), self.node(downstream)))
+            return
+        if not shutoff_press or not max_flow or shutoff_press <= 0 or max_flow <= 0:
+            raise ValueError("Pump curve values must be > 0.")
+        self.pumps.append((pump, self.node(upstream), self.node(downstream), float(shutoff_press), float(max_flow),
+                           pump.speed or 1))
+
+    def _fixed_pressures(self):
+        """Current pressure of every fixed node."""
+        pressures = {}
+        for index, source in self.__fixed.items():
+            pressures[index] = source if isinstance(source, numbers.Number) else source.static_tank_press
+        return pressures
+
+    def solve(self, tol=1e-6, max_iter=50):
+        """Solve every node pressure and branch flow.
+
+        Nodes that can't reach a fixed-pressure node through open valves or running centrifugal pumps are given zero
+        pressure and no flow; positive-displacement pumps touching such nodes deliver nothing.
+
+        :param tol: Largest acceptable flow imbalance at any node, in gpm
+        :param max_iter: Newton iteration limit
+
+        :return: Solved state
+        :rtype: NetworkSolution
+        """
+        n_nodes = len(self.node_names)
+        root_sg = math.sqrt(self.spec_grav)
+        fixed = self._fixed_pressures()
+        fixed_index = np.fromiter(fixed.keys(), dtype=np.intp, count=len(fixed))
+
+        vu = np.fromiter((u for _, u, _ in self.valves), dtype=np.intp, count=len(self.valves))
+        vd = np.fromiter((d for _, _, d in self.valves), dtype=np.intp, count=len(self.valves))
+        vc = np.fromiter((v.Cv * v.position / 100 / root_sg for v, _, _ in self.valves), dtype=np.float64,
+                         count=len(self.valves))
+
+        pu = np.fromiter((p[1] for p in self.pumps), dtype=np.intp, count=len(self.pumps))
+        pd = np.fromiter((p[2] for p in self.pumps), dtype=np.intp, count=len(self.pumps))
+        ratio = np.fromiter((p[0].speed / p[5] for p in self.pumps), dtype=np.float64, count=len(self.pumps))
+        shutoff = np.fromiter((p[3] for p in self.pumps), dtype=np.float64, count=len(self.pumps)) * ratio ** 2
+        max_flow = np.fromiter((p[4] for p in self.pumps), dtype=np.float64, count=len(self.pumps)) * ratio
+
+        du = np.fromiter((u for _, u, _ in self.displacement_pumps), dtype=np.intp, count=len(self.displacement_pumps))
+        dd = np.fromiter((d for _, _, d in self.displacement_pumps), dtype=np.intp, count=len(self.displacement_pumps))
+        dq = np.fromiter((p.speed * p.displacement for p, _, _ in self.displacement_pumps), dtype=np.float64,
+                         count=len(self.displacement_pumps))
+
+        # Find nodes connected to a fixed pressure
+        open_valves = vc > 0
+        running = shutoff > 0
+        rows = np.concatenate((vu[open_valves], pu[running]))
+        cols = np.concatenate((vd[open_valves], pd[running]))
+        adjacency = sparse.coo_matrix((np.ones(rows.size), (rows, cols)), shape=(n_nodes, n_nodes))
+        _, labels = csgraph.connected_components(adjacency, directed=False)
+        live = np.isin(labels, labels[fixed_index]) if fixed_index.size else np.zeros(n_nodes, dtype=bool)
+        dq = np.where(live[du] & live[dd], dq, 0.0)
+
+        pressures = np.zeros(n_nodes)
+        pressures[fixed_index] = np.fromiter(fixed.values(), dtype=np.float64, count=len(fixed))
+        free = live.copy()
+        free[fixed_index] = False
+        free_index = np.flatnonzero(free)
+        position = np.full(n_nodes, -1, dtype=np.intp)
+        position[free_index] = np.arange(free_index.size)
+        if fixed_index.size:
+            pressures[free_index] = pressures[fixed_index].mean()
+
+        demand = np.asarray(self.__demand, dtype=np.float64)
+        injection = -demand
+        np.add.at(injection, dd, dq)
+        np.subtract.at(injection, du, dq)
+
+        def branch_flows(p):
+            delta = p[vu] - p[vd]
+            small = np.abs(delta) < VALVE_EPSILON
+            root = np.sqrt(np.where(small, VALVE_EPSILON, np.abs(delta)))
+            q_valve = np.where(small, vc * delta / math.sqrt(VALVE_EPSILON), vc * np.sign(delta) * root)
+            g_valve = np.where(small, vc / math.sqrt(VALVE_EPSILON), vc / (2 * root))
+
+            safe_shutoff = np.where(running, shutoff, 1.0)
+            s = 1 - (p[pd] - p[pu]) / safe_shutoff
+            on_curve = s >= PUMP_EPSILON
+            linear = (s >= 0) & ~on_curve
+            q_pump = np.where(on_curve, max_flow * np.sqrt(np.where(on_curve, s, 1.0)),
+                              np.where(linear, max_flow * s / math.sqrt(PUMP_EPSILON), max_flow * PUMP_LEAK * s))
+            dq_ds = np.where(on_curve, max_flow / (2 * np.sqrt(np.where(on_curve, s, 1.0))),
+                             np.where(linear, max_flow / math.sqrt(PUMP_EPSILON), max_flow * PUMP_LEAK))
+            g_pump = np.where(running, dq_ds / safe_shutoff, 0.0)  # dQ/d(p_up - p_down)
+            q_pump = np.where(running, q_pump, 0.0)
+            return q_valve, g_valve, q_pump, g_pump
+
+        def imbalance(q_valve, q_pump):
+            net = injection.copy()
+            np.add.at(net, vd, q_valve)
+            np.subtract.at(net, vu, q_valve)
+            np.add.at(net, pd, q_pump)
+            np.subtract.at(net, pu, q_pump)
+            return net[free_index]
+
+        q_valve, g_valve, q_pump, g_pump = branch_flows(pressures)
+        residual = imbalance(q_valve, q_pump)
+        iterations = 0
+        while free_index.size and np.abs(residual).max() > tol and iterations < max_iter:
+            iterations += 1
+            # Both branch types are written as flow from u to d with conductance g = dQ/d(p_u - p_d)
+            up = np.concatenate((vu, pu))
+            down = np.concatenate((vd, pd))
+            g = np.concatenate((g_valve, g_pump))
+            entries = ((up, up, -g), (up, down, g), (down, up, g), (down, down, -g))
+            rows = np.concatenate([position[r] for r, _, _ in entries])
+            cols = np.concatenate([position[c] for _, c, _ in entries])
+            vals = np.concatenate([v for _, _, v in entries])
+            keep = (rows >= 0) & (cols >= 0)
+            jacobian = sparse.csr_matrix((vals[keep], (rows[keep], cols[keep])), shape=(free_index.size,) * 2)
+            step = np.atleast_1d(spsolve(jacobian, -residual))
+
+            # Damped update: halve the step until the imbalance improves
+            norm = np.abs(residual).max()
+            scale = 1.0
+            for _ in range(20):
+                trial = pressures.copy()
+                trial[free_index] += scale * step
+                trial_flows = branch_flows(trial)
+                trial_residual = imbalance(trial_flows[0], trial_flows[2])
+                if np.abs(trial_residual).max() < norm:
+                    break
+                scale /= 2
+            pressures = trial
+            q_valve, g_valve, q_pump, g_pump = trial_flows
+            residual = trial_residual
+
+        worst = float(np.abs(residual).max()) if residual.size else 0.0
+        return NetworkSolution(self, pressures, q_valve, q_pump, dq, iterations, worst <= tol, worst)
+
+    def apply(self, solution):
+        """Write a solution back onto the valve and pump objects.
+
+        Valves receive press_in, press_out, deltaP, flow_in, and flow_out. Pumps receive flow, outlet_pressure,
+        head_in (feet), and power.
+
+        :param solution: Result of solve()
+        """
+        p = solution.pressures
+        for (valve, u, d), flow in zip(self.valves, solution.valve_flows.tolist()):
+            valve.press_in = float(p[u])
+            valve.press_out = float(p[d])
+            valve.deltaP = float(p[u] - p[d])
+            valve.flow_in = valve.flow_out = flow
+        for (pump, u, d, _, _, _), flow in zip(self.pumps, solution.pump_flows.tolist()):
+            self._apply_pump(pump, float(p[u]), float(p[d]), flow)
+        for (pump, u, d), flow in zip(self.displacement_pumps, solution.displacement_flows.tolist()):
+            self._apply_pump(pump, float(p[u]), float(p[d]), flow)
+
+    def _apply_pump(self, pump, press_in, press_out, flow):
+        pump.flow = flow
+        pump.outlet_pressure = press_out
+        pump.head_in = utility_formulas.press_to_head(press_in)
+        pump.pump_power(flow, utility_formulas.press_to_head(press_out - press_in, self.spec_grav))
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC propagation.py
+
+Purpose: Re-evaluate only the components affected by a change, instead of the whole plant.
+
+Classes:
+    DependencyGraph: Tracks which components feed which, and propagates changes downstream in topological order
+
+Functions:
+    outlet_pressure(), outlet_flow(), gather_inputs(), evaluate_valve()
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.3
+    snapshot() reads __slots__ components with one attrgetter per class
+Version 0.2
+    evaluate_valve() handles valves without turn_handle() at partial positions
+Version 0.1
+    Initial build
+"""
+import heapq
+import operator
+
+import utility_formulas
+
+from PipingSystems.valve.valve import Relief, Valve
+
+# Attributes compared before and after an evaluation to decide whether a change has to travel further downstream
+TRACKED_ATTRIBUTES = ("position", "speed", "level", "flow_in", "press_in", "flow_out", "press_out", "head_in", "flow",
+                      "outlet_pressure", "static_tank_press")
+
+_getters = {}  # Component class: attrgetter of the tracked attributes it defines, or None to look each one up
+
+
+def outlet_pressure(component):
+    """Pressure a component delivers downstream, in psi."""
+    for attribute in ("press_out", "outlet_pressure", "static_tank_press"):
+        try:
+            return getattr(component, attribute)
+        except AttributeError:
+            pass
+    return 0.0
+
+
+def outlet_flow(component):
+    """Flow a component delivers downstream, in gpm."""
+    try:
+        return component.flow_out
+    except AttributeError:
+        return getattr(component, "flow", 0.0)
+
+
+def gather_inputs(component, upstream):
+    """Default input calculation: combined upstream flow, highest upstream pressure.
+
+    Valves receive flow_in and press_in. Pumps receive head_in, converted from the suction pressure.
+
+    :param component: Component being re-evaluated
+    :param upstream: Components feeding it
+    """
+    press = max((outlet_pressure(u) for u in upstream), default=0.0)
+    if isinstance(component, Valve):
+        component.flow_in = sum(outlet_flow(u) for u in upstream)
+        component.press_in = press
+    elif hasattr(component, "head_in"):
+        component.head_in = utility_formulas.press_to_head(press)
+
+
+def evaluate_valve(valve):
+    """Recalculate a valve's outlet from its inlet and current position.
+
+    Valves that cannot throttle (Valve, Relief) pass their inlet flow at any partial position, less the pressure drop
+    across the valve.
+    """
+    if isinstance(valve, Relief):
+        valve.valve_operation(valve.press_in)
+    if valve.position == 100:
+        valve.open()
+    elif valve.position == 0:
+        valve.close()
+    elif hasattr(valve, "turn_handle"):
+        valve.turn_handle(valve.position)
+    else:
+        valve.flow_out = valve.flow_in
+        valve.press_drop(valve.flow_out)
+        valve.get_press_out(valve.press_in)
+
+
+class DependencyGraph:
+    """Directed graph of components with incremental re-evaluation.
+
+    When a component changes, its downstream neighbours are marked dirty and re-evaluated in topological order. A
+    component whose tracked attributes come out unchanged stops the propagation, so the cost of an event is proportional
+    to the part of the plant it actually affects.
+
+    Variables: recomputed, total_recomputed, events
+
+    Methods: add_component(), connect(), snapshot(), changed(), run()
+    """
+    def __init__(self):
+        self.recomputed = 0  # Components re-evaluated by the last event
+        self.total_recomputed = 0
+        self.events = 0
+        self.__components = {}  # id: (component, gather, evaluate)
+        self.__upstream = {}
+        self.__downstream = {}
+        self.__rank = None
+
+    def add_component(self, component, gather=gather_inputs, evaluate=None):
+        """Register a component and how it is re-evaluated.
+
+        :param component: Valve, pump, tank, or other component
+        :param gather: Callable(component, upstream components) that updates the component's inputs
+        :param evaluate: Callable(component) that recalculates its outputs; valves default to evaluate_valve()
+        """
+        if evaluate is None and isinstance(component, Valve):
+            evaluate = evaluate_valve
+        key = id(component)
+        self.__components[key] = (component, gather, evaluate)
+        self.__upstream.setdefault(key, [])
+        self.__downstream.setdefault(key, [])
+        self.__rank = None
+
+    def connect(self, upstream, downstream):
+        """Record that downstream takes its inputs from upstream.
+
+        Components not yet registered are added with the default gather and evaluate functions.
+        """
+        for component in (upstream, downstream):
+            if id(component) not in self.__components:
+                self.add_component(component)
+        self.__upstream[id(downstream)].append(upstream)
+        self.__downstream[id(upstream)].append(downstream)
+        self.__rank = None
+
+    @staticmethod
+    def snapshot(component):
+        """Get the tracked attribute values of a component.
+
+        Components using __slots__ cannot gain attributes, so the tracked attributes their class defines are found
+        once and read with a single attrgetter(); other objects have each attribute looked up.
+        """
+        try:
+            getter = _getters[component.__class__]
+        except KeyError:
+            names = tuple(attribute for attribute in TRACKED_ATTRIBUTES if hasattr(component.__class__, attribute))
+            getter = None if hasattr(component, "__dict__") or len(names) < 2 else operator.attrgetter(*names)
+            _getters[component.__class__] = getter
+        if getter is not None:
+            try:
+                return getter(component)
+            except AttributeError:  # Slot not set yet
+                pass
+        return tuple(getattr(component, attribute, None) for attribute in TRACKED_ATTRIBUTES)
+
+    def _ranks(self):
+        """Topologically number the components (Kahn's algorithm)."""
+        if self.__rank is None:
+            waiting = {key: len(upstream) for key, upstream in self.__upstream.items()}
+            ready = [key for key, count in waiting.items() if count == 0]
+            rank = {}
+            while ready:
+                key = ready.pop()
+                rank[key] = len(rank)
+                for component in self.__downstream[key]:
+                    waiting[id(component)] -= 1
+                    if waiting[id(component)] == 0:
+                        ready.append(id(component))
+            if len(rank) != len(waiting):
+                raise ValueError("Dependency graph contains a cycle.")
+            self.__rank = rank
+        return self.__rank
+
+    def changed(self, *components):
+        """Propagate changes made to the given components.
+
+        :param components: Components whose outputs have changed
+
+        :return: Number of components re-evaluated
+        :rtype: int
+        """
+        rank = self._ranks()
+        dirty = []
+        queued = set()
+        for component in components:
+            for child in self.__downstream[id(component)]:
+                if id(child) not in queued:
+                    queued.add(id(child))
+                    heapq.heappush(dirty, (rank[id(child)], id(child)))
+        count = 0
+        while dirty:
+            _, key = heapq.heappop(dirty)
+            component, gather, evaluate = self.__components[key]
+            before = self.snapshot(component)
+            if gather is not None:
+                gather(component, self.__upstream[key])
+            if evaluate is not None:
+                evaluate(component)
+            count += 1
+            if self.snapshot(component) != before:
+                for child in self.__downstream[key]:
+                    if id(child) not in queued:
+                        queued.add(id(child))
+                        heapq.heappush(dirty, (rank[id(child)], id(child)))
+        self.recomputed = count
+        self.total_recomputed += count
+        self.events += 1
+        return count
+
+    def run(self, action, *components):
+        """Perform an action and propagate whatever it changed.
+
+        :param action: Callable taking no arguments, e.g. valve.open or functionality.pump1_on
+        :param components: Components the action may modify
+
+        :return: Number of components re-evaluated
+        :rtype: int
+        """
+        before = [self.snapshot(component) for component in components]
+        action()
+        modified = [c for c, state in zip(components, before) if self.snapshot(c) != state]
+        return self.changed(*modified)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC recorder.py
+
+Purpose: Capture selected component fields every scan into a fixed-size, memory-mapped ring buffer file.
+
+File layout (little-endian):
+    0   8s  magic, b"VPLCREC1"
+    8   I   format version
+    12  I   field count (n)
+    16  Q   capacity, in records
+    24  Q   records written so far (total, not modulo capacity)
+    32  I   length of the JSON field name list that follows
+    36      field names, JSON
+    ... padding to a 64-byte boundary
+    data: capacity records of (n + 1) float64: timestamp, then one value per field
+
+The writer updates the record count after each record is complete, so a reader in another process can follow along.
+Records older than count - capacity have been overwritten. On little-endian hosts records are written through native
+memoryviews; big-endian hosts write through little-endian NumPy views instead, so recordings are portable.
+
+Classes:
+    TelemetryRecorder: Writes records
+    TelemetryReader: Maps a recording as NumPy arrays without copying
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.2
+    Records are written little-endian on big-endian hosts too, as the file layout states
+Version 0.1
+    Initial build
+"""
+import json
+import mmap
+import struct
+import sys
+import time
+
+import numpy as np
+
+MAGIC = b"VPLCREC1"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQQI")
+_COUNT_OFFSET = 24
+_ALIGNMENT = 64
+
+
+def _data_offset(names_length):
+    return -(-(_HEADER.size + names_length) // _ALIGNMENT) * _ALIGNMENT
+
+
+class TelemetryRecorder:
+    """Ring buffer writer.
+
+    The file is created at full size up front and every record is written in place, so recording allocates no buffers
+    and the file never grows.
+
+    Variables: path, names, capacity, count
+
+    Methods: record(), close()
+    """
+    def __init__(self, path, fields, capacity=360000, clock=time.time):
+        """Create the recording file.
+
+        :param path: File to create (overwritten if it exists)
+        :param fields: Sequence of (name, component, attribute) to capture, e.g. ("tank1_level", tank1, "level")
+        :param capacity: Records kept before the oldest are overwritten; the default is one hour at 100 Hz
+        :param clock: Callable giving each record's timestamp
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be > 0.")
+        fields = list(fields)
+        self.path = path
+        self.names = [name for name, _, _ in fields]
+        self.capacity = int(capacity)
+        self.count = 0
+        self.__readers = tuple((component, attribute) for _, component, attribute in fields)
+        self.__clock = clock
+        self.__width = len(fields) + 1
+
+        names = json.dumps(self.names).encode()
+        offset = _data_offset(len(names))
+        size = offset + self.capacity * self.__width * 8
+        with open(path, "wb") as file:
+            file.truncate(size)
+        self.__file = open(path, "r+b")
+        self.__map = mmap.mmap(self.__file.fileno(), size)
+        self.__map[:_HEADER.size] = _HEADER.pack(MAGIC, VERSION, len(fields), self.capacity, 0, len(names))
+        self.__map[_HEADER.size:_HEADER.size + len(names)] = names
+        if sys.byteorder == "little":  # Native memoryviews: the fastest item assignment
+            self.__counter = memoryview(self.__map)[_COUNT_OFFSET:_COUNT_OFFSET + 8].cast("Q")
+            self.__data = memoryview(self.__map)[offset:].cast("d")
+        else:  # NumPy swaps the bytes of every value written
+            self.__counter = np.frombuffer(self.__map, dtype="<u8", count=1, offset=_COUNT_OFFSET)
+            self.__data = np.frombuffer(self.__map, dtype="<f8", offset=offset)
+
+    def record(self, timestamp=None):
+        """Capture every field's current value. Suitable as a PLCRuntime scan hook.
+
+        :param timestamp: Record time; taken from the clock if not provided
+        """
+        data = self.__data
+        position = (self.count % self.capacity) * self.__width
+        data[position] = self.__clock() if timestamp is None else timestamp
+        for component, attribute in self.__readers:
+            position += 1
+            data[position] = getattr(component, attribute)
+        self.count += 1
+        self.__counter[0] = self.count
+
+    def close(self):
+        """Flush the file and release it."""
+        if isinstance(self.__data, memoryview):
+            self.__counter.release()
+            self.__data.release()
+        self.__counter = self.__data = None  # Drops the NumPy views, so the map can close
+        self.__map.flush()
+        self.__map.close()
+        self.__file.close()
+
+
+class TelemetryReader:
+    """Read-only view of a recording, safe to open while it is being written.
+
+    records is the whole ring as a (capacity, fields + 1) float64 array that shares memory with the file; column 0 is
+    the timestamp. Nothing is copied until ordered() is called.
+
+    Variables: path, names, capacity, records
+
+    Methods: count(), segments(), column(), ordered(), close()
+    """
+    def __init__(self, path):
+        """Map a recording.
+
+        :except ValueError: File is not a recording
+        """
+        self.path = path
+        self.__file = open(path, "rb")
+        self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, field_count, capacity, _, names_length = _HEADER.unpack_from(self.__map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("Not a telemetry recording: {}".format(path))
+        self.names = json.loads(self.__map[_HEADER.size:_HEADER.size + names_length])
+        self.capacity = capacity
+        self.__columns = {name: index + 1 for index, name in enumerate(self.names)}
+        self.records = np.frombuffer(self.__map, dtype="<f8", count=capacity * (field_count + 1),
+                                     offset=_data_offset(names_length)).reshape(capacity, field_count + 1)
+
+    def count(self):
+        """Get the number of records written so far, including any since overwritten."""
+        return struct.unpack_from("<Q", self.__map, _COUNT_OFFSET)[0]
+
+    def segments(self):
+        """Get the stored records in time order, as one or two views of the ring (no copy).
+
+        :return: Arrays of rows; concatenated they run from the oldest stored record to the newest
+        :rtype: list
+        """
+        count = self.count()
+        if count <= self.capacity:
+            return [self.records[:count]]
+        split = count % self.capacity
+        return [self.records[split:], self.records[:split]] if split else [self.records]
+
+    def column(self, name):
+        """Get one field across the whole ring (no copy); "timestamp" gives the record times."""
+        return self.records[:, 0 if name == "timestamp" else self.__columns[name]]
+
+    def ordered(self):
+        """Get a copy of the stored records, oldest first."""
+        return np.concatenate(self.segments())
+
+    def close(self):
+        """Release the file. Arrays still held by the caller keep the mapping alive until they are discarded."""
+        self.records = None
+        try:
+            self.__map.close()
+        except BufferError:
+            pass  # Views are still in use; the mapping is released when they are garbage collected
+        self.__file.close()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC runtime.py
+
+Purpose: Run a plant model in real time with asyncio, alongside telemetry clients, operator commands, and history.
+
+The scan coroutine never awaits I/O. Operator commands are queued and applied at the start of the next scan, telemetry
+is handed to each client through its own bounded queue (a client that falls behind loses its oldest updates instead of
+holding up the scan), and history records are passed to a writer that runs in a worker thread. History writes run one
+at a time, in order, and run() returns only after the last one has finished.
+
+Classes:
+    RuntimeStats: Timing results of a PLCRuntime
+    PLCRuntime: Fixed-period asyncio scan loop
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.3
+    Stopping run() no longer cancels a history write that is queued but not yet started
+Version 0.2
+    History writes on a dedicated single-thread executor, never concurrently
+Version 0.1
+    Initial build
+"""
+import asyncio
+import collections
+import concurrent.futures
+import json
+import time
+
+RuntimeStats = collections.namedtuple("RuntimeStats", ["scans", "overruns", "mean_jitter", "max_jitter",
+                                                       "mean_scan_time", "max_scan_time", "commands",
+                                                       "dropped_telemetry", "history_records"])
+RuntimeStats.__doc__ = """Results of a PLCRuntime, all times in seconds.
+
+scans: Number of scans executed
+overruns: Scans that started a full period or more late; the missed periods are skipped, not made up
+mean_jitter, max_jitter: Difference between when scans were scheduled to start and when they did
+mean_scan_time, max_scan_time: Time spent executing a scan
+commands: Operator commands applied
+dropped_telemetry: Telemetry updates discarded because a client's queue was full
+history_records: Records passed to the history writer
+"""
+
+
+class PLCRuntime:
+    """Fixed-period scan loop with concurrent I/O.
+
+    Each scan: apply queued operator commands, step the engine, run the scan hooks, then publish a telemetry snapshot
+    and queue it for history.
+
+    Variables: period, engine, scans
+
+    Methods: add_scan_hook(), subscribe(), unsubscribe(), command(), submit(), stats(), run(), stop(), serve_telemetry()
+    """
+    def __init__(self, engine, period=0.01, snapshot=None, dispatcher=None, history=None, history_interval=1.0,
+                 queue_size=16):
+        """Set up the runtime.
+
+        :param engine: Object with a step() method, e.g. Simulation.engine.ScanEngine
+        :param period: Real seconds between scan starts
+        :param snapshot: Callable returning the telemetry published after each scan; defaults to scan count and time
+        :param dispatcher: Optional hmi.dispatcher.ActionDispatcher; enables (group, state) commands
+        :param history: Optional callable taking a list of (timestamp, snapshot) records; called from a worker thread,
+            one call at a time
+        :param history_interval: Seconds between history writes
+        :param queue_size: Telemetry updates buffered per client
+        """
+        if period <= 0:
+            raise ValueError("Scan period must be > 0.")
+        self.period = float(period)
+        self.engine = engine
+        self.scans = 0
+        self.__snapshot = snapshot or (lambda: {"scan": self.scans})
+        self.__dispatcher = dispatcher
+        self.__history = history
+        self.__history_interval = history_interval
+        self.__queue_size = queue_size
+        self.__hooks = []
+        self.__clients = []
+        self.__commands = collections.deque()
+        self.__records = []
+        self.__executor = None  # History writer thread, while run() is running
+        self.__running = False
+        self.__overruns = 0
+        self.__jitter_total = 0.0
+        self.__jitter_max = 0.0
+        self.__scan_total = 0.0
+        self.__scan_max = 0.0
+        self.__applied = 0
+        self.__dropped = 0
+        self.__recorded = 0
+
+    def add_scan_hook(self, hook):
+        """Run a callable at the end of every scan, e.g. to refresh a register image. Hooks must not block."""
+        self.__hooks.append(hook)
+
+    def subscribe(self):
+        """Register a telemetry client.
+
+        :return: Queue receiving one snapshot per scan
+        :rtype: asyncio.Queue
+        """
+        queue = asyncio.Queue(maxsize=self.__queue_size)
+        self.__clients.append(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        """Remove a telemetry client."""
+        self.__clients.remove(queue)
+
+    def submit(self, command):
+        """Queue an operator command for the next scan.
+
+        :param command: Callable taking no arguments, or a (group, state) pair for the dispatcher
+
+        :return: Future set to the command's result once it has run
+        :rtype: asyncio.Future
+        """
+        if not callable(command):
+            if self.__dispatcher is None:
+                raise ValueError("Device commands need a dispatcher.")
+            group, state = command
+            self.__dispatcher.action_name(group, state)  # Reject unknown groups now, not during the scan
+            command = (lambda g, s: lambda: self.__dispatcher.dispatch(g, s))(group, state)
+        future = asyncio.get_running_loop().create_future()
+        self.__commands.append((command, future))
+        return future
+
+    async def command(self, command):
+        """Queue an operator command and wait for it to run.
+
+        :return: The command's result
+        """
+        return await self.submit(command)
+
+    def _apply_commands(self):
+        """Run every queued command."""
+        while self.__commands:
+            command, future = self.__commands.popleft()
+            try:
+                result = command()
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            self.__applied += 1
+
+    def _publish(self, snapshot):
+        """Give a snapshot to every client, discarding a client's oldest update if it is full."""
+        for queue in self.__clients:
+            if queue.full():
+                queue.get_nowait()
+                self.__dropped += 1
+            queue.put_nowait(snapshot)
+
+    def scan(self):
+        """Execute one scan."""
+        self._apply_commands()
+        self.engine.step()
+        for hook in self.__hooks:
+            hook()
+        self.scans += 1
+        if self.__clients or self.__history is not None:
+            snapshot = self.__snapshot()
+            self._publish(snapshot)
+            if self.__history is not None:
+                self.__records.append((time.time(), snapshot))
+
+    def stats(self):
+        """Get timing results so far.
+
+        :rtype: RuntimeStats
+        """
+        scans = self.scans or 1
+        return RuntimeStats(self.scans, self.__overruns, self.__jitter_total / scans, self.__jitter_max,
+                            self.__scan_total / scans, self.__scan_max, self.__applied, self.__dropped,
+                            self.__recorded)
+
+    def stop(self):
+        """End run() after the current scan."""
+        self.__running = False
+
+    async def _write_history(self):
+        """Hand batches of history records to the writer thread until stopped."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.__history_interval)
+            await self._flush_history(loop)
+
+    async def _flush_history(self, loop):
+        """Send the records collected so far to the history writer."""
+        if self.__records:
+            records, self.__records = self.__records, []
+            self.__recorded += len(records)
+            # Shielded: cancelling the writer task must not cancel a queued write; shutdown() waits for it instead
+            await asyncio.shield(loop.run_in_executor(self.__executor, self.__history, records))
+
+    async def run(self, duration=None):
+        """Scan at a fixed period.
+
+        :param duration: Real seconds to run; runs until stop() if not provided
+
+        :return: Timing results
+        :rtype: RuntimeStats
+        """
+        loop = asyncio.get_running_loop()
+        writer = None
+        if self.__history is not None:
+            # One worker: a write still running when the writer task is cancelled cannot overlap the final flush
+            self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+            writer = loop.create_task(self._write_history())
+        self.__running = True
+        start = scheduled = loop.time()
+        try:
+            while self.__running and (duration is None or scheduled - start < duration):
+                scan_start = loop.time()
+                jitter = scan_start - scheduled
+                self.__jitter_total += jitter
+                self.__jitter_max = max(self.__jitter_max, jitter)
+                self.scan()
+                scan_time = loop.time() - scan_start
+                self.__scan_total += scan_time
+                self.__scan_max = max(self.__scan_max, scan_time)
+
+                scheduled += self.period
+                now = loop.time()
+                if now - scheduled >= self.period:  # Missed at least one whole period; skip ahead
+                    self.__overruns += 1
+                    scheduled = now
+                await asyncio.sleep(max(0.0, scheduled - now))
+        finally:
+            self.__running = False
+            if writer is not None:
+                writer.cancel()
+                await asyncio.gather(writer, return_exceptions=True)
+                try:
+                    await self._flush_history(loop)
+                finally:
+                    # Wait for every queued write without blocking the event loop
+                    await asyncio.to_thread(self.__executor.shutdown, wait=True)
+                    self.__executor = None
+        return self.stats()
+
+    async def serve_telemetry(self, host="127.0.0.1", port=0):
+        """Serve telemetry and accept commands over TCP.
+
+        Each client receives one JSON line per scan. Clients send commands as JSON lines: {"group": "gate1",
+        "state": true}. Each client is served by its own coroutines, so a slow reader only affects itself.
+
+        :param host: Interface to listen on
+        :param port: TCP port; 0 picks a free port
+
+        :return: Running server; its sockets give the bound address
+        :rtype: asyncio.Server
+        """
+        async def handle(reader, writer):
+            queue = self.subscribe()
+
+            async def send():
+                while True:
+                    snapshot = await queue.get()
+                    writer.write(json.dumps(snapshot).encode() + b"\n")
+                    await writer.drain()
+
+            sender = asyncio.get_running_loop().create_task(send())
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    try:
+                        message = json.loads(line)
+                        await self.command((message["group"], message["state"]))
+                    except (ValueError, KeyError, TypeError) as error:
+                        writer.write(json.dumps({"error": str(error)}).encode() + b"\n")
+            finally:
+                sender.cancel()
+                self.unsubscribe(queue)
+                writer.close()
+
+        return await asyncio.start_server(handle, host, port)
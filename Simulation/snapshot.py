@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC snapshot.py
+
+Purpose: Save a whole plant's state to a compact binary snapshot and restore it without rebuilding the plant.
+
+Snapshot layout (little-endian):
+    header: magic b"VPLCSNAP", format version (H), reserved (H), CRC-32 of the payload (I), payload length (Q),
+            metadata length (I)
+    payload: metadata (JSON: plant name and connections, then per component class the component names and one entry
+             per attribute column)
+             column data, in metadata order
+
+State is stored by column (one attribute of every component of a class) so restoring is a handful of C-level map()
+calls per class instead of a Python loop per value. Float columns are stored as float64, integer columns as int64,
+bool columns as one byte per value; anything else (names, None, mixed types) is kept in the metadata JSON, which
+round-trips floats exactly.
+
+Objects held by components (pump performance curves, tank geometries; see OBJECT_CLASSES) are stored once each in the
+metadata as their constructor arguments, and referenced from columns as {"$object": index}, so components sharing one
+curve or geometry share it again after restoring.
+
+Only the component classes listed in SNAPSHOT_CLASSES can be restored.
+
+Functions:
+    snapshot_bytes(), save_snapshot(), read_snapshot(), load_snapshot(), restore_snapshot()
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.3
+    Malformed metadata and short columns raise ValueError instead of other errors or a partial restore
+Version 0.2
+    Pump curves are stored (format version 2; version 1 snapshots still load)
+    Tank geometries are stored
+Version 0.1
+    Initial build
+"""
+import array
+import gc
+import json
+import struct
+import sys
+import zlib
+
+from PipingSystems.component_state import attribute_names
+from PipingSystems.plant_loader import Plant
+from PipingSystems.pump.pump import CentrifPump, PositiveDisplacement, Pump
+from PipingSystems.pump.pump_curve import PumpCurve
+from PipingSystems.storage_tank.geometry import HorizontalCylinder, Sphere, StrappingTable, VerticalCylinder
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Gate, Globe, Relief, Valve
+
+MAGIC = b"VPLCSNAP"
+VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+_HEADER = struct.Struct("<8sHHIQI")
+
+SNAPSHOT_CLASSES = {cls.__name__: cls for cls in (Tank, Valve, Gate, Globe, Relief, Pump, CentrifPump,
+                                                  PositiveDisplacement)}
+
+# Classes of objects that components may hold, stored by constructor arguments
+OBJECT_CLASSES = {cls.__name__: cls for cls in (PumpCurve, StrappingTable, VerticalCylinder, HorizontalCylinder,
+                                                Sphere)}
+_REFERENCE = "$object"
+
+# Column kind: array typecode of binary columns
+_FLOAT, _INT, _BOOL, _JSON = "f", "i", "b", "j"
+_TYPECODES = {_FLOAT: "d", _INT: "q", _BOOL: "B"}
+
+
+def plant_components(plant):
+    """Get the components of a plant as a name: component dictionary.
+
+    :param plant: Dictionary of components, plant_loader.Plant, or an object holding components as attributes (FuelFarm)
+    """
+    if isinstance(plant, dict):
+        return plant
+    if isinstance(plant, Plant):
+        return plant.components
+    return vars(plant)
+
+
+def _optional_list(values):
+    return None if values is None else values.tolist()
+
+
+def _object_arguments(value):
+    """Get the constructor arguments that recreate an object of one of OBJECT_CLASSES."""
+    if isinstance(value, PumpCurve):
+        return {"flow": value.flow.tolist(), "head": value.head.tolist(),
+                "efficiency": _optional_list(value.efficiency), "npshr": _optional_list(value.npshr),
+                "rated_speed": value.rated_speed, "resolution": value.resolution, "max_tables": value.max_tables}
+    resolution = len(value.levels) - 1
+    if isinstance(value, VerticalCylinder):
+        return {"diameter": value.diameter, "height": value.height, "resolution": resolution}
+    if isinstance(value, HorizontalCylinder):
+        return {"diameter": value.diameter, "length": value.length, "resolution": resolution}
+    if isinstance(value, Sphere):
+        return {"diameter": value.diameter, "resolution": resolution}
+    return {"levels": value.levels.tolist(), "volumes": value.volumes.tolist()}
+
+
+def _encode_column(values, objects):
+    """Choose how to store one attribute column.
+
+    :param values: Attribute value of each component
+    :param objects: Id of each object stored so far: (index, metadata entry); objects in the column are added
+
+    :return: (kind, JSON values or None, binary data)
+    :rtype: tuple
+    """
+    types = set(map(type, values))
+    if any(OBJECT_CLASSES.get(cls.__name__) is cls for cls in types):
+        column = []
+        for value in values:
+            if OBJECT_CLASSES.get(type(value).__name__) is type(value):
+                if id(value) not in objects:
+                    objects[id(value)] = (len(objects), {"class": type(value).__name__,
+                                                         "arguments": _object_arguments(value)})
+                value = {_REFERENCE: objects[id(value)][0]}
+            column.append(value)
+        return _JSON, column, b""
+    if len(types) == 1:
+        kind = {float: _FLOAT, int: _INT, bool: _BOOL}.get(types.pop(), _JSON)
+        if kind != _JSON:
+            try:
+                column = array.array(_TYPECODES[kind], values)
+            except OverflowError:  # Integers beyond int64
+                return _JSON, values, b""
+            if sys.byteorder != "little":
+                column.byteswap()
+            return kind, None, column.tobytes()
+    return _JSON, values, b""
+
+
+def snapshot_bytes(plant):
+    """Encode the state of every component in a plant.
+
+    :param plant: See plant_components()
+
+    :except ValueError: Component class or attribute value cannot be stored
+
+    :return: Snapshot
+    :rtype: bytes
+    """
+    groups = {}  # Class: (names, components)
+    for name, component in plant_components(plant).items():
+        cls = type(component)
+        if SNAPSHOT_CLASSES.get(cls.__name__) is not cls:
+            raise ValueError("Cannot snapshot component {} of type {}".format(name, cls.__name__))
+        names, components = groups.setdefault(cls, ([], []))
+        names.append(name)
+        components.append(component)
+    classes = []
+    data = []
+    objects = {}
+    for cls, (names, components) in groups.items():
+        columns = []
+        for attribute in attribute_names(cls):
+            kind, values, column = _encode_column(list(map(getattr(cls, attribute).__get__, components)), objects)
+            columns.append([attribute, kind, values])
+            data.append(column)
+        classes.append({"class": cls.__name__, "components": names, "columns": columns})
+    try:
+        metadata = json.dumps({"name": getattr(plant, "name", ""), "inlets": getattr(plant, "inlets", {}),
+                               "objects": [entry for _, entry in objects.values()], "classes": classes},
+                              separators=(",", ":")).encode()
+    except TypeError as error:
+        raise ValueError("Cannot snapshot plant: {}".format(error))
+    payload = metadata + b"".join(data)
+    return _HEADER.pack(MAGIC, VERSION, 0, zlib.crc32(payload), len(payload), len(metadata)) + payload
+
+
+def save_snapshot(plant, path):
+    """Write a plant snapshot to a file."""
+    with open(path, "wb") as file:
+        file.write(snapshot_bytes(plant))
+
+
+def _object(objects, value):
+    """Resolve a {"$object": index} column value to its object; other values are returned unchanged."""
+    if not (isinstance(value, dict) and _REFERENCE in value):
+        return value
+    index = value[_REFERENCE]
+    if not isinstance(index, int) or not 0 <= index < len(objects):
+        raise ValueError("Snapshot object reference out of range: {!r}".format(index))
+    return objects[index]
+
+
+def _decode(data):
+    """Check a snapshot and read its metadata, with every column's values filled in.
+
+    The checksum only guards against corruption, so the metadata is still checked: every column must name a stored
+    attribute of its class and hold one value per component.
+
+    :except ValueError: Invalid snapshot, including metadata of the wrong shape
+
+    :return: Metadata; each class entry gains "type", the component class
+    :rtype: dict
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a plant snapshot.")
+    magic, version, _, checksum, length, metadata_length = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a plant snapshot.")
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError("Unsupported snapshot version: {}".format(version))
+    payload = memoryview(data)[_HEADER.size:_HEADER.size + length]
+    if len(payload) != length or zlib.crc32(payload) != checksum:
+        raise ValueError("Snapshot checksum mismatch.")
+    try:
+        metadata = json.loads(bytes(payload[:metadata_length]))
+        return _decode_columns(metadata, payload, metadata_length)
+    except (KeyError, IndexError, TypeError, AttributeError) as error:
+        raise ValueError("Malformed snapshot metadata: {!r}".format(error))
+
+
+def _decode_columns(metadata, payload, offset):
+    """Build the stored objects and fill in every column of parsed metadata; see _decode()."""
+    if not isinstance(metadata, dict) or not {"name", "inlets", "classes"} <= metadata.keys():
+        raise ValueError("Malformed snapshot metadata.")
+    objects = []
+    for entry in metadata.get("objects", ()):
+        try:
+            cls = OBJECT_CLASSES[entry["class"]]
+        except KeyError:
+            raise ValueError("Unknown object class in snapshot: {}".format(entry.get("class")))
+        objects.append(cls(**entry["arguments"]))
+    for group in metadata["classes"]:
+        try:
+            group["type"] = SNAPSHOT_CLASSES[group["class"]]
+        except KeyError:
+            raise ValueError("Unknown component class in snapshot: {}".format(group.get("class")))
+        attributes = attribute_names(group["type"])
+        count = len(group["components"])
+        for column in group["columns"]:
+            attribute, kind = column[0], column[1]
+            if attribute not in attributes:
+                raise ValueError("Unknown {} attribute in snapshot: {}".format(group["class"], attribute))
+            if kind == _JSON:
+                if len(column[2]) != count:
+                    raise ValueError("Snapshot column {}.{} has the wrong length".format(group["class"], attribute))
+                if objects:
+                    column[2] = [_object(objects, value) for value in column[2]]
+                continue
+            values = array.array(_TYPECODES[kind])
+            size = count * values.itemsize
+            if offset + size > len(payload):
+                raise ValueError("Snapshot column {}.{} is truncated".format(group["class"], attribute))
+            values.frombytes(payload[offset:offset + size])
+            offset += size
+            if sys.byteorder != "little":
+                values.byteswap()
+            column[2] = list(map(bool, values)) if kind == _BOOL else values.tolist()
+    if offset != len(payload):
+        raise ValueError("Snapshot payload does not match its metadata.")
+    return metadata
+
+
+def _write_columns(cls, components, columns):
+    """Store decoded columns on components of one class through the slot descriptors."""
+    for attribute, _, values in columns:
+        for _ in map(getattr(cls, attribute).__set__, components, values):
+            pass
+
+
+def read_snapshot(data):
+    """Create a plant from a snapshot, without running any component constructors.
+
+    :param data: Snapshot bytes
+
+    :except ValueError: Not a snapshot, unsupported version, checksum mismatch, or unknown component or object class
+
+    :return: Plant holding new components with the saved state
+    :rtype: Plant
+    """
+    collecting = gc.isenabled()
+    gc.disable()  # As in plant_loader.load_plant(): many new objects, no cycles
+    try:
+        metadata = _decode(data)
+        created = {}
+        for group in metadata["classes"]:
+            cls = group["type"]
+            components = [cls.__new__(cls) for _ in group["components"]]
+            _write_columns(cls, components, group["columns"])
+            created.update(zip(group["components"], components))
+        return Plant(metadata["name"], created, metadata["inlets"])
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def load_snapshot(path):
+    """Create a plant from a snapshot file. See read_snapshot()."""
+    with open(path, "rb") as file:
+        return read_snapshot(file.read())
+
+
+def restore_snapshot(data, plant):
+    """Return an existing plant's components to a snapshot's state, e.g. to roll back to a checkpoint.
+
+    :param data: Snapshot bytes
+    :param plant: Plant with the same component names as the snapshot
+
+    :except ValueError: Invalid snapshot, or a component is missing from the plant or of a different class
+    """
+    metadata = _decode(data)
+    existing = plant_components(plant)
+    for group in metadata["classes"]:
+        cls = group["type"]
+        components = []
+        for name in group["components"]:
+            try:
+                component = existing[name]
+            except KeyError:
+                raise ValueError("Component {} not found in plant".format(name))
+            if type(component) is not cls:
+                raise ValueError("Component {} is a {}, not a {}".format(name, type(component).__name__,
+                                                                         cls.__name__))
+            components.append(component)
+        _write_columns(cls, components, group["columns"])
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_batch.py
+
+Purpose: Measure batch scenario throughput as worker processes are added.
+
+Run from the repository root: python -m benchmarks.bench_batch
+"""
+import os
+import time
+
+import Models.FuelFarm.batch as ffb
+
+SCENARIOS = 20000
+
+
+def run(workers, count=SCENARIOS, duration=60.0):
+    """Run a random study and return scenarios per second."""
+    scenarios = ffb.random_scenarios(count, seed=0, duration=duration)
+    start = time.perf_counter()
+    ffb.run_batch(scenarios, workers=workers)
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1)))
+    baseline = None
+    for workers in counts:
+        rate = run(workers)
+        baseline = baseline or rate
+        print("{:>3} workers: {:>9.0f} scenarios/s ({:.2f}x)".format(workers, rate, rate / baseline))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_drain.py
+
+Purpose: Time draining many tanks at once against stepping each Tank through its level setter.
+
+Run from the repository root: python -m benchmarks.bench_drain
+"""
+import timeit
+
+import numpy as np
+
+from PipingSystems.storage_tank import drain
+from PipingSystems.storage_tank.tank import Tank
+
+
+def run(count=10000, points=100, stepped=100):
+    """Drain count tanks with random levels, outlets, and areas.
+
+    :return: (seconds for time to empty, constant area; seconds for time to empty, level-dependent area; seconds for
+        points-long trajectories, constant area; the same, level-dependent area; seconds per tank to step one Tank
+        to empty in points steps)
+    :rtype: tuple
+    """
+    random = np.random.default_rng(24)
+    levels = random.uniform(1, 40, count)
+    coeffs = random.uniform(500, 5000, count)
+    areas = random.uniform(200, 2000, count)
+    radii = levels / 2 + random.uniform(0, 5, count)
+
+    def sphere(h):
+        return np.pi * (2 * radii * h - h * h)
+
+    times = np.linspace(0, drain.time_to_empty(levels, coeffs, areas).max(), points)
+    analytic = min(timeit.repeat(lambda: drain.time_to_empty(levels, coeffs, areas), number=10, repeat=5)) / 10
+    shaped = min(timeit.repeat(lambda: drain.time_to_empty(levels, coeffs, sphere), number=1, repeat=5))
+    trajectory = min(timeit.repeat(lambda: drain.drain_levels(levels, coeffs, areas, times), number=1, repeat=5))
+    shaped_trajectory = min(timeit.repeat(lambda: drain.drain_levels(levels, coeffs, sphere, times), number=1,
+                                          repeat=3))
+    tanks = [Tank("t{}".format(i), levels[i], drain_coeff=coeffs[i]) for i in range(stepped)]
+    step = times[1]
+
+    def step_tanks():
+        for tank, area in zip(tanks, areas):
+            for _ in range(points):
+                tank.level = tank.level - tank.flow_out / drain.GPM_PER_CFS / area * step
+
+    loop = timeit.timeit(step_tanks, number=1) / stepped
+    return analytic, shaped, trajectory, shaped_trajectory, loop
+
+
+if __name__ == "__main__":
+    count, points = 10000, 100
+    analytic, shaped, trajectory, shaped_trajectory, loop = run(count, points)
+    print("{} tanks, time to empty, constant area: {:10.3f} ms".format(count, analytic * 1e3))
+    print("{} tanks, time to empty, sphere: {:17.3f} ms".format(count, shaped * 1e3))
+    print("{} tanks x {} times, constant area: {:8.3f} ms".format(count, points, trajectory * 1e3))
+    print("{} tanks x {} times, sphere: {:15.3f} ms".format(count, points, shaped_trajectory * 1e3))
+    print("stepping Tank.level, {} steps: {:16.1f} us per tank ({:.0f} ms for {})".format(
+        points, loop * 1e6, loop * count * 1e3, count))
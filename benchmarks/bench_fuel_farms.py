@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_fuel_farms.py
+
+Purpose: Time building and stepping many independent fuel farms in one process.
+
+Run from the repository root: python -m benchmarks.bench_fuel_farms
+"""
+import time
+
+import Models.FuelFarm.functionality as fff
+import Models.FuelFarm.simulation as ffs
+
+from Models.FuelFarm.components import FuelFarm
+
+LINEUP = (fff.gate1_open, fff.gate5_open, fff.gate9_open, fff.pump1_on)
+
+
+def run(count, scans=1000, dt=1.0):
+    """Build count farms, line up pump 1 on each, and step them all.
+
+    :return: Seconds to build, seconds to step
+    :rtype: tuple
+    """
+    start = time.perf_counter()
+    farms = [FuelFarm() for _ in range(count)]
+    built = time.perf_counter()
+    engines = []
+    for farm in farms:
+        for action in LINEUP:
+            action(farm)
+        engines.append(ffs.build_engine(dt, farm))
+    step_start = time.perf_counter()
+    for _ in range(scans):
+        for engine in engines:
+            engine.step()
+    return built - start, time.perf_counter() - step_start
+
+
+if __name__ == "__main__":
+    scans = 1000
+    for count in (1, 10, 100, 500):
+        build_time, step_time = run(count, scans)
+        print("{:>4} farms: built in {:>8.2f} ms ({:>6.1f} us/farm), {} scans in {:>8.2f} ms "
+              "({:>5.2f} us/farm-scan)".format(count, build_time * 1e3, build_time / count * 1e6, scans,
+                                               step_time * 1e3, step_time / (count * scans) * 1e6))
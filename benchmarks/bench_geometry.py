@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_geometry.py
+
+Purpose: Time level/volume conversion with tank shapes and large strapping tables, one tank and whole farms.
+
+Run from the repository root: python -m benchmarks.bench_geometry
+"""
+import timeit
+
+import numpy as np
+
+from PipingSystems.storage_tank import geometry
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.storage_tank.tank_farm import TankFarm
+
+
+def run(rows=10000, count=10000):
+    """Convert count levels and volumes per call.
+
+    :return: Dictionary of seconds per call: "<shape> volume" and "<shape> level" for count values at once,
+        "farm volumes" and "farm set_volumes" for a farm of count tanks over four geometries, and "Tank.volume" for
+        one tank with a rows-row strapping table
+    :rtype: dict
+    """
+    random = np.random.default_rng(25)
+    volumes = np.cumsum(random.uniform(100, 200, rows))
+    shapes = {
+        "strapping table": geometry.StrappingTable(np.linspace(0, 50, rows), volumes - volumes[0]),
+        "vertical cylinder": geometry.VerticalCylinder(60, 36),
+        "horizontal cylinder": geometry.HorizontalCylinder(10, 40),
+        "sphere": geometry.Sphere(40),
+    }
+    results = {}
+    for name, shape in shapes.items():
+        levels = random.uniform(0, shape.height, count)
+        amounts = shape.volume(levels)
+        results[name + " volume"] = min(timeit.repeat(lambda: shape.volume(levels), number=20, repeat=5)) / 20
+        results[name + " level"] = min(timeit.repeat(lambda: shape.level(amounts), number=20, repeat=5)) / 20
+    farm = TankFarm(capacity=count)
+    geometries = list(shapes.values())
+    for i in range(count):
+        farm.add_tank("t{}".format(i), random.uniform(0, 36), outlet_diam=16, outlet_slope=0.25,
+                      geometry=geometries[i % len(geometries)])
+    amounts = farm.volumes()
+    results["farm volumes"] = min(timeit.repeat(farm.volumes, number=10, repeat=5)) / 10
+    results["farm set_volumes"] = min(timeit.repeat(lambda: farm.set_volumes(amounts), number=10, repeat=5)) / 10
+    tank = Tank("t", 20.0, geometry=shapes["strapping table"])
+    results["Tank.volume"] = min(timeit.repeat(lambda: tank.volume, number=10000, repeat=5)) / 10000
+    return results
+
+
+if __name__ == "__main__":
+    rows, count = 10000, 10000
+    print("{}-row strapping table, {} values per call".format(rows, count))
+    for name, seconds in run(rows, count).items():
+        print("{:30} {:10.3f} ms".format(name, seconds * 1e3) if name != "Tank.volume" else
+              "{:30} {:10.2f} us".format(name, seconds * 1e6))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_historian.py
+
+Purpose: Measure historian write throughput, the cost of recording on the scan path, and trend query time.
+
+Run from the repository root: python -m benchmarks.bench_historian
+"""
+import os
+import tempfile
+import time
+
+from Simulation.historian import Historian
+
+ROWS = 500000
+COMPONENTS = [("tank{}".format(n), "level") for n in range(1, 3)] + \
+             [("gate{}".format(n), "position") for n in range(1, 11)] + \
+             [("pump{}".format(n), "flow") for n in range(1, 4)]
+
+
+def run(rows=ROWS):
+    """Record rows as a scan loop would, then query one component's trend.
+
+    :return: (rows per second committed, mean microseconds per record() call, trend query seconds, trend points)
+    :rtype: tuple
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        historian = Historian(os.path.join(directory, "history.db"))
+        scans = rows // len(COMPONENTS)
+        start = time.perf_counter()
+        for scan in range(scans):
+            timestamp = scan * 0.01
+            for component, field in COMPONENTS:
+                historian.record(timestamp, component, field, float(scan))
+        recorded = time.perf_counter() - start
+        historian.flush()
+        written = time.perf_counter() - start
+
+        start = time.perf_counter()
+        times, _ = historian.trend("tank1", "level", start=scans * 0.0025, end=scans * 0.0075)
+        query = time.perf_counter() - start
+        historian.close()
+    count = scans * len(COMPONENTS)
+    return count / written, recorded / count * 1e6, query, times.size
+
+
+if __name__ == "__main__":
+    rate, record_us, query, points = run()
+    print("Committed {:.0f} rows/s; record() {:.2f} us per row on the scan path".format(rate, record_us))
+    print("Trend query: {} points in {:.2f} ms".format(points, query * 1000))
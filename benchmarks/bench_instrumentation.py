@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_instrumentation.py
+
+Purpose: Measure what instrumentation costs per instrumented call when enabled, and that it costs nothing once disabled.
+
+Run from the repository root: python -m benchmarks.bench_instrumentation
+"""
+import timeit
+
+import Models.FuelFarm.functionality as fff
+from Models.FuelFarm.components import FuelFarm
+from Simulation.instrumentation import Instrumentation
+
+
+def lineup(farm):
+    """Open and close the pump 1 flow path."""
+    fff.gate1_open(farm)
+    fff.gate5_open(farm)
+    fff.gate9_open(farm)
+    fff.pump1_on(farm)
+    fff.pump1_off(farm)
+    fff.gate9_close(farm)
+    fff.gate5_close(farm)
+    fff.gate1_close(farm)
+
+
+def _best(farm, number, repeat=5):
+    return min(timeit.repeat(lambda: lineup(farm), number=number, repeat=repeat)) / number
+
+
+def run(number=2000):
+    """Time the lineup before instrumenting, while instrumented, and after disabling.
+
+    :return: (seconds per lineup never instrumented, enabled, disabled again, instrumented calls per lineup)
+    :rtype: tuple
+    """
+    farm = FuelFarm()
+    before = _best(farm, number)
+    probe = Instrumentation()
+    with probe:
+        enabled = _best(farm, number)
+    after = _best(farm, number)
+    calls = sum(row.count for row in probe.stats()) / (number * 5)
+    return before, enabled, after, calls
+
+
+if __name__ == "__main__":
+    before, enabled, after, calls = run()
+    print("lineup, never instrumented: {:8.2f} us".format(before * 1e6))
+    print("lineup, instrumented:       {:8.2f} us ({:.0f} calls, {:.0f} ns per call overhead)".format(
+        enabled * 1e6, calls, (enabled - before) / calls * 1e9))
+    print("lineup, disabled again:     {:8.2f} us".format(after * 1e6))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_memory.py
+
+Purpose: Measure bytes per instance of the slotted component classes against equivalent __dict__-based classes.
+
+Run from the repository root: python -m benchmarks.bench_memory
+"""
+import ast
+import gc
+import inspect
+import tracemalloc
+
+from PipingSystems.pump import pump
+from PipingSystems.storage_tank import tank
+from PipingSystems.valve import valve
+
+INSTANCES = 100000
+
+
+class _StripSlots(ast.NodeTransformer):
+    """Remove __slots__ declarations from class bodies."""
+    def visit_ClassDef(self, node):
+        node.body = [statement for statement in node.body
+                     if not (isinstance(statement, ast.Assign) and
+                             any(getattr(target, "id", None) == "__slots__" for target in statement.targets))]
+        return node
+
+
+def unslotted(module):
+    """Load a copy of a component module without __slots__, i.e. storing attributes the way the classes used to.
+
+    :return: Namespace of the rebuilt module
+    :rtype: dict
+    """
+    tree = _StripSlots().visit(ast.parse(inspect.getsource(module)))
+    namespace = {"__name__": module.__name__ + "_unslotted"}
+    exec(compile(tree, module.__file__, "exec"), namespace)
+    return namespace
+
+
+def bytes_per_instance(factory, count=INSTANCES):
+    """Allocate many instances and return the average traced memory per instance."""
+    gc.collect()
+    tracemalloc.start()
+    instances = [factory(i) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (size - count * 8) / count  # Don't count the list holding them
+
+
+CASES = (
+    (valve.Valve, lambda cls, i: cls("V", position=100, flow_coeff=240.0, sys_flow_in=355.2, press_in=13.1)),
+    (valve.Gate, lambda cls, i: cls("G", position=100, flow_coeff=240.0, sys_flow_in=355.2, press_in=13.1)),
+    (valve.Globe, lambda cls, i: cls("T", position=50, flow_coeff=165.0, sys_flow_in=355.2, press_in=50.0)),
+    (valve.Relief, lambda cls, i: cls("R", flow_coeff=0.81, open_press=60, close_press=55)),
+    (pump.Pump, lambda cls, i: cls("P", flow_rate_out=100.0, pump_head_in=12.0, press_out=45.0, pump_speed=300)),
+    (pump.CentrifPump, lambda cls, i: cls("C", flow_rate_out=75.0, pump_head_in=12.0, press_out=25.0, pump_speed=125)),
+    (pump.PositiveDisplacement, lambda cls, i: cls("D", pump_head_in=12.0, press_out=200.0, displacement=0.24)),
+    (tank.Tank, lambda cls, i: cls("Tank", level=36.0, fluid_density=1.63, spec_gravity=0.84, outlet_diam=16.0,
+                                   outlet_slope=0.25)),
+)
+
+
+if __name__ == "__main__":
+    print("{:<22}{:>14}{:>14}{:>10}".format("class", "dict (bytes)", "slots (bytes)", "saved"))
+    dict_based = {module.__name__: unslotted(module) for module in (pump, tank, valve)}
+    for cls, make in CASES:
+        before = bytes_per_instance(lambda i: make(dict_based[cls.__module__][cls.__name__], i))
+        after = bytes_per_instance(lambda i: make(cls, i))
+        print("{:<22}{:>14.0f}{:>14.0f}{:>9.0f}%".format(cls.__name__, before, after, 100 * (1 - after / before)))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_modbus.py
+
+Purpose: Load test the Modbus/TCP server with many concurrent polling clients while the fuel farm scans.
+
+Run from the repository root: python -m benchmarks.bench_modbus
+"""
+import asyncio
+import struct
+import time
+
+from Models.FuelFarm.components import FuelFarm
+from Models.FuelFarm.runtime import build_runtime
+from hmi.modbus_server import ModbusServer, fuel_farm_map, modbus_request
+
+CLIENTS = (1, 10, 100, 300)
+DURATION = 2.0
+REQUESTS = (struct.pack(">BHH", 3, 0, 13), struct.pack(">BHH", 4, 0, 64), struct.pack(">BHH", 1, 0, 13))
+
+
+async def _poll(host, port, stop_at, counts):
+    """Poll the server back to back until the stop time, counting answered requests."""
+    reader, writer = await asyncio.open_connection(host, port)
+    transaction = 0
+    while time.perf_counter() < stop_at:
+        transaction = (transaction + 1) & 0xFFFF
+        await modbus_request(reader, writer, REQUESTS[transaction % len(REQUESTS)], transaction)
+        counts[0] += 1
+    writer.close()
+
+
+async def _load(clients, duration):
+    farm = FuelFarm()
+    runtime = build_runtime(0.01, farm)
+    server = ModbusServer(fuel_farm_map(farm), command=runtime.submit)
+    runtime.add_scan_hook(server.refresh)
+    listener = await server.start(port=0)
+    host, port = listener.sockets[0].getsockname()[:2]
+    scan = asyncio.get_running_loop().create_task(runtime.run())
+    counts = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*[_poll(host, port, start + duration, counts) for _ in range(clients)])
+    elapsed = time.perf_counter() - start
+    runtime.stop()
+    stats = await scan
+    listener.close()
+    await listener.wait_closed()
+    return counts[0] / elapsed, stats
+
+
+def run(clients=CLIENTS, duration=DURATION):
+    """Measure request throughput for several numbers of concurrent clients.
+
+    Clients and server share one event loop (and this process), so the figures are a lower bound for a server
+    polled from other machines.
+
+    :return: Rows of (clients, requests per second, scan overruns, max scan jitter in seconds)
+    :rtype: list
+    """
+    rows = []
+    for count in clients:
+        rate, stats = asyncio.run(_load(count, duration))
+        rows.append((count, rate, stats.overruns, stats.max_jitter))
+    return rows
+
+
+if __name__ == "__main__":
+    print("{:>8}{:>14}{:>11}{:>18}".format("clients", "requests/s", "overruns", "max jitter (ms)"))
+    for count, rate, overruns, jitter in run():
+        print("{:>8}{:>14.0f}{:>11}{:>18.2f}".format(count, rate, overruns, jitter * 1000))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_network.py
+
+Purpose: Compare the hand-coded fuel farm propagation with the network solver, and time the solver on large meshes.
+
+Run from the repository root: python -m benchmarks.bench_network
+"""
+import time
+
+import numpy as np
+
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+import Models.FuelFarm.network as ffn
+
+from PipingSystems.valve.valve import Gate
+from Simulation.network import HydraulicNetwork
+
+LINEUP = (fff.gate1_open, fff.gate2_open, fff.gate3_open, fff.gate4_open, fff.gate5_open, fff.gate6_open,
+          fff.gate7_open, fff.gate8_open, fff.gate9_open, fff.gate10_open, fff.pump1_on, fff.pump2_on, fff.pump3_on)
+
+
+def grid_network(side, seed=0):
+    """Build a square mesh of gate valves fed by tanks at two corners, with demand spread over the mesh.
+
+    :param side: Nodes per side; the mesh has about 2 * side ** 2 valves
+
+    :return: Network and number of valves
+    :rtype: tuple
+    """
+    rng = np.random.default_rng(seed)
+    network = HydraulicNetwork()
+    network.add_node((0, 0), pressure=60.0)
+    network.add_node((side - 1, side - 1), pressure=55.0)
+    count = 0
+    for row in range(side):
+        for col in range(side):
+            if (row, col) not in ((0, 0), (side - 1, side - 1)):
+                network.add_node((row, col), demand=rng.uniform(0.0, 0.05))
+            for neighbour in ((row + 1, col), (row, col + 1)):
+                if neighbour[0] < side and neighbour[1] < side:
+                    valve = Gate("V{}".format(count), position=100, flow_coeff=rng.uniform(50, 400))
+                    network.add_valve(valve, (row, col), neighbour)
+                    count += 1
+    return network, count
+
+
+def time_fuel_farm(repeat=1000):
+    """Time one full lineup with the hand-coded functions against one network solve.
+
+    :return: Seconds per hand-coded lineup, seconds per network solve
+    :rtype: tuple
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for action in LINEUP:
+            action()
+    hand_coded = (time.perf_counter() - start) / repeat
+
+    network = ffn.build_network()
+    start = time.perf_counter()
+    for _ in range(repeat // 10):
+        ffn.solve(network)
+    solver = (time.perf_counter() - start) / (repeat // 10)
+    return hand_coded, solver
+
+
+if __name__ == "__main__":
+    hand_coded, solver = time_fuel_farm()
+    print("Fuel farm: hand-coded lineup {:.1f} us, network solve {:.1f} us".format(hand_coded * 1e6, solver * 1e6))
+    print("  Pump 1 suction {:.2f} psi, discharge {:.2f} psi".format(
+        ffc.gate5.press_out, ffc.pump1.outlet_pressure))
+    for side in (25, 71, 160):
+        network, valves = grid_network(side)
+        start = time.perf_counter()
+        result = network.solve()
+        elapsed = time.perf_counter() - start
+        print("Mesh: {:>6} valves, {:>6} nodes, {:>3} iterations, converged={}, {:.3f} s".format(
+            valves, len(network.node_names), result.iterations, result.converged, elapsed))
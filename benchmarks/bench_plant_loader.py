@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_plant_loader.py
+
+Purpose: Time loading large synthetic plant files, with and without the compiled cache.
+
+Run from the repository root: python -m benchmarks.bench_plant_loader
+"""
+import json
+import os
+import tempfile
+import time
+
+from PipingSystems.plant_loader import load_plant
+
+SIZES = (5000, 50000)
+
+
+def synthetic_plant(count):
+    """Describe a plant of repeated tank -> gate -> pump -> globe -> gate trains.
+
+    :param count: Number of components (rounded down to a multiple of 5)
+
+    :rtype: dict
+    """
+    components = []
+    for train in range(count // 5):
+        tank, inlet, pump, throttle, outlet = ("{}{}".format(kind, train) for kind in ("tank", "inlet", "pump",
+                                                                                       "throttle", "outlet"))
+        components += [
+            {"id": tank, "type": "tank", "level": 10.0 + train % 20, "outlet_diam": 8, "outlet_slope": 0.25},
+            {"id": inlet, "type": "gate", "diameter": 8, "position": 100, "inlets": [tank]},
+            {"id": pump, "type": "centrifugal", "press_out": 50.0, "pump_speed": 1480, "flow_rate_out": 500.0,
+             "inlets": [inlet]},
+            {"id": throttle, "type": "globe", "flow_coeff": 165, "position": 50, "inlets": [pump]},
+            {"id": outlet, "type": "gate", "diameter": 4, "inlets": [throttle]},
+        ]
+    return {"name": "Synthetic {}".format(count), "components": components}
+
+
+def run(sizes=SIZES):
+    """Load each plant cold (parse + validate + build) and warm (cached compiled form + build).
+
+    :return: Rows of (components, cold seconds, warm seconds)
+    :rtype: list
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, "plant{}.json".format(size))
+            with open(path, "w") as file:
+                json.dump(synthetic_plant(size), file)
+            start = time.perf_counter()
+            plant = load_plant(path)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            load_plant(path)
+            warm = time.perf_counter() - start
+            rows.append((len(plant), cold, warm))
+    return rows
+
+
+if __name__ == "__main__":
+    print("{:>12}{:>12}{:>12}".format("components", "cold (s)", "cached (s)"))
+    for size, cold, warm in run():
+        print("{:>12}{:>12.3f}{:>12.3f}".format(size, cold, warm))
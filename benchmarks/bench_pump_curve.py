@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_pump_curve.py
+
+Purpose: Time solving pump/system curve operating points for many pumps per scan.
+
+Run from the repository root: python -m benchmarks.bench_pump_curve
+"""
+import timeit
+
+import numpy as np
+
+from PipingSystems.pump.pump import CentrifPump
+from PipingSystems.pump.pump_curve import PumpCurve
+
+CURVE = ([0, 200, 400, 600, 800, 1000, 1200], [120, 118, 112, 102, 88, 70, 48],
+         [0.0, 0.45, 0.68, 0.8, 0.82, 0.75, 0.6], [5, 6, 8, 10, 13, 17, 22])
+
+
+def run(count=1000, speed_steps=8, scans=200):
+    """Solve count pumps sharing a curve, at speed_steps distinct speeds, with a different system curve each.
+
+    :return: (seconds per batch scan with warm tables, seconds for the first scan (tables built), seconds per pump
+        with the scalar Pump.operate() loop)
+    :rtype: tuple
+    """
+    random = np.random.default_rng(18)
+    speeds = np.linspace(900, 1480, speed_steps)[random.integers(0, speed_steps, count)]
+    static = random.uniform(10, 60, count)
+    resistance = random.uniform(1e-5, 1e-4, count)
+    curve = PumpCurve(*CURVE)
+    cold = timeit.timeit(lambda: curve.operating_points(speeds, static, resistance), number=1)
+    warm = min(timeit.repeat(lambda: curve.operating_points(speeds, static, resistance), number=scans,
+                             repeat=5)) / scans
+    pumps = [CentrifPump("pump{}".format(i), pump_speed=speeds[i], curve=curve) for i in range(count)]
+
+    def scalar():
+        for pump, head, coeff in zip(pumps, static, resistance):
+            pump.operate(head, coeff)
+
+    loop = timeit.timeit(scalar, number=1) / count
+    return warm, cold, loop
+
+
+if __name__ == "__main__":
+    count = 1000
+    warm, cold, loop = run(count)
+    print("{} pumps, batch, cached tables: {:8.3f} ms per scan".format(count, warm * 1e3))
+    print("{} pumps, batch, building tables: {:6.3f} ms".format(count, cold * 1e3))
+    print("scalar Pump.operate(): {:22.1f} us per pump".format(loop * 1e6))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_pump_fleet.py
+
+Purpose: Compare a per-object VFD speed sweep with the vectorized PumpFleet.
+
+Run from the repository root: python -m benchmarks.bench_pump_fleet
+"""
+import math
+import time
+
+import numpy as np
+
+from PipingSystems.pump.pump import CentrifPump, PositiveDisplacement
+from PipingSystems.pump.pump_fleet import PumpFleet
+
+SIZES = (100, 1000, 10000)
+STEPS = 20
+
+
+def _best_of(func, repeat=3):
+    """Return the fastest wall time of several runs, in seconds."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=SIZES, steps=STEPS):
+    """Sweep every pump through a series of speeds.
+
+    :param sizes: Pump counts to benchmark
+    :param steps: Speed changes per sweep
+
+    :return: Rows of (pump count, object seconds per step, fleet seconds per step)
+    :rtype: list
+    """
+    rng = np.random.default_rng(0)
+    rows = []
+    for size in sizes:
+        pumps = [CentrifPump(flow_rate_out=75, pump_head_in=12, press_out=25, pump_speed=1000) if i % 2 else
+                 PositiveDisplacement(flow_rate_out=100, press_out=200, pump_speed=300, displacement=0.15)
+                 for i in range(size)]
+        fleet = PumpFleet.from_pumps(pumps)
+        sweep = rng.uniform(500, 1800, (steps, size))
+        sweep_lists = sweep.tolist()
+
+        def objects():
+            for speeds in sweep_lists:
+                for pump, speed in zip(pumps, speeds):
+                    pump.adjust_speed(speed)
+
+        def vectorized():
+            for speeds in sweep:
+                fleet.adjust_speed(speeds)
+
+        rows.append((size, _best_of(objects) / steps, _best_of(vectorized) / steps))
+    return rows
+
+
+if __name__ == "__main__":
+    print("{:>10}{:>16}{:>16}{:>10}".format("pumps", "objects (us)", "fleet (us)", "speedup"))
+    for size, object_time, fleet_time in run():
+        print("{:>10}{:>16.1f}{:>16.1f}{:>9.1f}x".format(size, object_time * 1e6, fleet_time * 1e6,
+                                                         object_time / fleet_time))
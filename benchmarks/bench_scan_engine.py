@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_scan_engine.py
+
+Purpose: Measure how far faster than real time the fuel farm can be simulated.
+
+Run from the repository root: python -m benchmarks.bench_scan_engine
+"""
+import Models.FuelFarm.functionality as fff
+import Models.FuelFarm.simulation as ffs
+
+SIM_SECONDS = 36000
+
+
+def run(dt=1.0, sim_seconds=SIM_SECONDS):
+    """Simulate the fuel farm with all three pumps running.
+
+    :param dt: Simulated seconds per scan
+    :param sim_seconds: Simulated seconds to run
+
+    :return: Timing results
+    :rtype: Simulation.engine.ScanStats
+    """
+    for action in (fff.gate1_open, fff.gate2_open, fff.gate3_open, fff.gate4_open, fff.gate5_open, fff.gate6_open,
+                   fff.gate7_open, fff.pump1_on, fff.pump2_on, fff.pump3_on):
+        action()
+    return ffs.build_engine(dt).run(sim_seconds)
+
+
+if __name__ == "__main__":
+    for dt in (0.1, 1.0):
+        stats = run(dt)
+        print("dt={:<5} {:>8} scans in {:.3f} s: {:>9.0f} scans/s, {:>9.0f}x real time, max scan {:.1f} us".format(
+            dt, stats.scans, stats.wall_time, stats.scan_rate, stats.speed, stats.max_scan_time * 1e6))
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_snapshot.py
+
+Purpose: Compare building a plant from scratch with restoring it from a snapshot.
+
+Run from the repository root: python -m benchmarks.bench_snapshot
+"""
+import time
+
+from benchmarks.bench_plant_loader import synthetic_plant
+from Models.FuelFarm.components import FuelFarm
+from PipingSystems.plant_loader import build_plant, compile_plant
+from Simulation.snapshot import plant_components, read_snapshot, restore_snapshot, snapshot_bytes
+
+SIZES = (10000, 50000)
+
+
+def _time(function, *arguments):
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+def run(sizes=SIZES):
+    """Time building each plant (the fuel farm, then synthetic plants) against read_snapshot() and in-place
+    restore_snapshot().
+
+    :return: Rows of (components, snapshot bytes, build seconds, save seconds, read seconds, restore seconds)
+    :rtype: list
+    """
+    rows = []
+    builds = [(FuelFarm, ())] + [(build_plant, (compile_plant(synthetic_plant(size)),)) for size in sizes]
+    for builder, arguments in builds:
+        plant, build = _time(builder, *arguments)
+        data, save = _time(snapshot_bytes, plant)
+        _, read = _time(read_snapshot, data)
+        _, restore = _time(restore_snapshot, data, plant)
+        rows.append((len(plant_components(plant)), len(data), build, save, read, restore))
+    return rows
+
+
+if __name__ == "__main__":
+    print("{:>12}{:>12}{:>12}{:>12}{:>12}{:>12}".format("components", "bytes", "build (s)", "save (s)", "read (s)",
+                                                        "restore (s)"))
+    for row in run():
+        print("{:>12}{:>12}{:>12.6f}{:>12.6f}{:>12.6f}{:>12.6f}".format(*row))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_system_curve.py
+
+Purpose: Time pump operating point solutions: a new lineup, a cached lineup, and a batch study of many lineups.
+
+Run from the repository root: python -m benchmarks.bench_system_curve
+"""
+import itertools
+import timeit
+
+import numpy as np
+
+from benchmarks.bench_pump_curve import CURVE
+from PipingSystems.pump.pump import CentrifPump
+from PipingSystems.pump.pump_curve import PumpCurve
+from PipingSystems.system_curve import OperatingPointSolver, Parallel, Series, SystemCurve
+from PipingSystems.valve.valve import Gate, Globe
+
+
+def build_solver():
+    """Pump -> throttle -> three parallel branches of two gates each."""
+    def gate(cv):
+        return Gate("gate", flow_coeff=cv, position=100)
+
+    throttle = Globe("throttle", flow_coeff=400, position=100)
+    branches = [Series(gate(cv), gate(cv)) for cv in (150, 240, 375)]
+    pump = CentrifPump("pump", pump_speed=1480, curve=PumpCurve(*CURVE))
+    return OperatingPointSolver(pump, SystemCurve(Series(throttle, Parallel(*branches)), elevation=25.0))
+
+
+def run(lineups=10000):
+    """
+    :return: (seconds per uncached solve, seconds per cached solve, seconds per lineup in a batch of lineups)
+    :rtype: tuple
+    """
+    solver = build_solver()
+    throttle = solver.system.valves[0]
+    positions = itertools.cycle(range(1, 100))
+
+    def uncached():
+        solver.clear_cache()
+        throttle.position = next(positions)
+        solver.solve()
+
+    cold = min(timeit.repeat(uncached, number=500, repeat=5)) / 500
+    solver.solve()
+    warm = min(timeit.repeat(solver.solve, number=10000, repeat=5)) / 10000
+
+    random = np.random.default_rng(22)
+    study = np.column_stack([random.integers(0, 101, lineups)] +
+                            [random.choice([0, 100], lineups) for _ in solver.system.valves[1:]])
+    speeds = random.choice([900, 1200, 1480], lineups)
+    batch = min(timeit.repeat(lambda: solver.solve_many(study, speeds), number=5, repeat=3)) / 5
+    return cold, warm, batch / lineups
+
+
+if __name__ == "__main__":
+    lineups = 10000
+    cold, warm, batch = run(lineups)
+    print("new lineup:    {:8.2f} us".format(cold * 1e6))
+    print("cached lineup: {:8.2f} us".format(warm * 1e6))
+    print("batch of {}: {:8.2f} us per lineup ({:.1f} ms total)".format(lineups, batch * 1e6, batch * lineups * 1e3))
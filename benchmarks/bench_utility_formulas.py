@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_utility_formulas.py
+
+Purpose: Compare scalar-loop and vectorized throughput of the utility formulas.
+
+Run from the repository root: python -m benchmarks.bench_utility_formulas
+"""
+import math
+import time
+
+import numpy as np
+
+import utility_formulas
+
+SIZES = (1000, 100000, 1000000)
+PIPE_SIZES = np.array([2.0, 4.0, 6.0, 8.0, 12.0, 16.0])
+
+
+def _best_of(func, repeat=3):
+    """Return the fastest wall time of several runs, in seconds."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=SIZES):
+    """Time every formula as a scalar loop and as a single array call.
+
+    :param sizes: Element counts to benchmark
+
+    :return: Rows of (function name, element count, scalar seconds, vectorized seconds)
+    :rtype: list
+    """
+    rng = np.random.default_rng(0)
+    rows = []
+    for size in sizes:
+        diameters = rng.choice(PIPE_SIZES, size)
+        slopes = rng.uniform(0.01, 2.0, size)
+        heights = rng.uniform(0.0, 50.0, size)
+        d_list, s_list, h_list = diameters.tolist(), slopes.tolist(), heights.tolist()
+        repeat = 1 if size >= 1000000 else 3
+
+        cases = (
+            ("gravity_flow_rate",
+             lambda: [utility_formulas.gravity_flow_rate(d, s) for d, s in zip(d_list, s_list)],
+             lambda: utility_formulas.gravity_flow_rate_array(diameters, slopes)),
+            ("static_press",
+             lambda: [utility_formulas.static_press(h) for h in h_list],
+             lambda: utility_formulas.static_press_array(heights)),
+            ("press_to_head",
+             lambda: [utility_formulas.press_to_head(h) for h in h_list],
+             lambda: utility_formulas.press_to_head_array(heights)),
+            ("head_to_press",
+             lambda: [utility_formulas.head_to_press(h) for h in h_list],
+             lambda: utility_formulas.head_to_press_array(heights)),
+        )
+        for name, scalar, vector in cases:
+            rows.append((name, size, _best_of(scalar, repeat), _best_of(vector, repeat)))
+    return rows
+
+
+if __name__ == "__main__":
+    print("{:<20}{:>10}{:>14}{:>14}{:>10}".format("function", "elements", "scalar (s)", "vector (s)", "speedup"))
+    for name, size, scalar_time, vector_time in run():
+        print("{:<20}{:>10}{:>14.6f}{:>14.6f}{:>9.1f}x".format(name, size, scalar_time, vector_time,
+                                                               scalar_time / vector_time))
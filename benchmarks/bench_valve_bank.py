@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC bench_valve_bank.py
+
+Purpose: Compare per-object valve updates with the vectorized ValveBank.
+
+Run from the repository root: python -m benchmarks.bench_valve_bank
+"""
+import math
+import time
+
+import numpy as np
+
+from PipingSystems.valve.valve import Globe
+from PipingSystems.valve.valve_bank import ValveBank
+
+SIZES = (1000, 10000, 100000)
+
+
+def _best_of(func, repeat=3):
+    """Return the fastest wall time of several runs, in seconds."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=SIZES):
+    """Throttle every valve to a random position and recalculate its outlet pressure.
+
+    :param sizes: Valve counts to benchmark
+
+    :return: Rows of (valve count, object seconds, bank seconds)
+    :rtype: list
+    """
+    rng = np.random.default_rng(0)
+    rows = []
+    for size in sizes:
+        valves = [Globe(sys_flow_in=f, position=100, flow_coeff=c, press_in=p) for f, c, p in
+                  zip(rng.uniform(0, 500, size).tolist(), rng.uniform(0, 60, size).tolist(),
+                      rng.uniform(0, 100, size).tolist())]
+        bank = ValveBank.from_valves(valves)
+        positions = rng.integers(0, 101, size)
+        position_list = positions.tolist()
+
+        def objects():
+            for valve, position in zip(valves, position_list):
+                valve.turn_handle(position)
+                valve.get_press_out(valve.press_in)
+
+        def vectorized():
+            bank.turn_handle(positions)
+            bank.get_press_out()
+
+        rows.append((size, _best_of(objects), _best_of(vectorized)))
+    return rows
+
+
+if __name__ == "__main__":
+    print("{:>10}{:>14}{:>14}{:>10}".format("valves", "objects (s)", "bank (s)", "speedup"))
+    for size, object_time, bank_time in run():
+        print("{:>10}{:>14.6f}{:>14.6f}{:>9.1f}x".format(size, object_time, bank_time, object_time / bank_time))
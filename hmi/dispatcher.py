@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC dispatcher.py
+
+Purpose: Map HMI device groups to pre-bound fuel farm actions, and time every action.
+
+Each device group (gate1 ... gate10, pump1 ... pump3) has an "on" action (valve open, pump on) and an "off" action
+(valve close, pump off). The callables are bound once, so pressing a button is a dictionary lookup and a call, with no
+code compiled at run time. The same dispatcher can be driven from scripts or network clients.
+
+Given a historian, the dispatcher logs valve and pump changes: after every action it records the fields of its
+components that changed (Historian.record_changes()).
+
+Classes:
+    ActionStats: Latency record for one action
+    ActionDispatcher: Registry of device actions
+
+Functions:
+    fuel_farm_dispatcher()
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.3
+    Optional historian logging the component changes of every action
+Version 0.2
+    Reject device states other than True/False, "down", and "normal"
+Version 0.1
+    Initial build
+"""
+import collections
+import functools
+import time
+
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+
+VALVE_GROUPS = tuple("gate{}".format(number) for number in range(1, 11))
+PUMP_GROUPS = ("pump1", "pump2", "pump3")
+
+ActionStats = collections.namedtuple("ActionStats", "count, total_time, max_time")
+
+BUTTON_STATES = {"down": True, "normal": False}  # HMI button states, as sent by clients
+
+
+class ActionDispatcher:
+    """Registry of on/off actions per device group.
+
+    Latency is recorded per action name ("gate1_open", "pump2_off", ...), in seconds; logging changes to the historian
+    is not part of it.
+
+    Variables: latency
+
+    Methods: register(), groups(), action_name(), dispatch(), dispatch_many(), mean_latency(), reset_latency()
+    """
+    def __init__(self, historian=None, components=None):
+        """
+        :param historian: Optional Simulation.historian.Historian that logs the changes each action makes
+        :param components: Component name: component, checked for changes after each action; the starting values are
+            recorded now
+        """
+        self.latency = {}  # Action name: ActionStats
+        self.__actions = {}  # Group: ((on name, on callable), (off name, off callable))
+        self.__historian = historian
+        self.__components = dict(components or {})
+        if historian is not None:
+            historian.record_changes(time.time(), self.__components)
+
+    def register(self, group, on_action, off_action, on_name=None, off_name=None):
+        """Bind a device group to its actions.
+
+        :param group: Device group name, as used by the HMI buttons
+        :param on_action: Callable taking no arguments, run when the device is switched on or opened
+        :param off_action: Callable taking no arguments, run when the device is switched off or closed
+        :param on_name: Name the on action's latency is recorded under; defaults to "<group>_on"
+        :param off_name: Name the off action's latency is recorded under; defaults to "<group>_off"
+        """
+        self.__actions[group] = ((on_name or "{}_on".format(group), on_action),
+                                 (off_name or "{}_off".format(group), off_action))
+
+    def groups(self):
+        """Get the registered device groups."""
+        return list(self.__actions)
+
+    def action_name(self, group, state):
+        """Get the name of the action a command runs."""
+        return self._lookup(group, state)[0]
+
+    def _lookup(self, group, state):
+        """Find the (name, callable) pair for a command."""
+        try:
+            actions = self.__actions[group]
+        except KeyError:
+            raise ValueError("Unknown device group: {}".format(group))
+        if isinstance(state, str):
+            try:
+                state = BUTTON_STATES[state]
+            except KeyError:
+                raise ValueError("Unknown device state: {}".format(state))
+        return actions[0] if state else actions[1]
+
+    def dispatch(self, group, state):
+        """Run one device action.
+
+        :param group: Device group, e.g. "gate1"
+        :param state: True (or "down") for open/on; False (or "normal") for close/off
+
+        :except ValueError: Unknown device group or state
+
+        :return: The action's return value
+        """
+        name, action = self._lookup(group, state)
+        start = time.perf_counter()
+        result = action()
+        elapsed = time.perf_counter() - start
+        stats = self.latency.get(name)
+        if stats is None:
+            self.latency[name] = ActionStats(1, elapsed, elapsed)
+        else:
+            self.latency[name] = ActionStats(stats.count + 1, stats.total_time + elapsed, max(stats.max_time, elapsed))
+        if self.__historian is not None:
+            self.__historian.record_changes(time.time(), self.__components)
+        return result
+
+    def dispatch_many(self, commands):
+        """Run several device actions in order.
+
+        All commands are checked before any is run, so an unknown group leaves the plant untouched.
+
+        :param commands: Iterable of (group, state) pairs
+
+        :except ValueError: Unknown device group or state
+
+        :return: Return value of each action
+        :rtype: list
+        """
+        commands = list(commands)
+        for group, state in commands:
+            self._lookup(group, state)
+        return [self.dispatch(group, state) for group, state in commands]
+
+    def mean_latency(self, name):
+        """Get the average run time of an action, in seconds."""
+        stats = self.latency[name]
+        return stats.total_time / stats.count
+
+    def reset_latency(self):
+        """Discard recorded latencies."""
+        self.latency.clear()
+
+
+def fuel_farm_dispatcher(farm=ffc, historian=None):
+    """Build a dispatcher for the fuel farm HMI buttons.
+
+    :param farm: Fuel farm the actions operate on
+    :param historian: Optional Simulation.historian.Historian to log valve and pump changes to
+
+    :return: Dispatcher with every valve and pump group registered
+    :rtype: ActionDispatcher
+    """
+    dispatcher = ActionDispatcher(historian, {group: getattr(farm, group) for group in VALVE_GROUPS + PUMP_GROUPS})
+    for group, on_suffix, off_suffix in ([(valve, "open", "close") for valve in VALVE_GROUPS] +
+                                         [(pump, "on", "off") for pump in PUMP_GROUPS]):
+        on_name = "{}_{}".format(group, on_suffix)
+        off_name = "{}_{}".format(group, off_suffix)
+        dispatcher.register(group, functools.partial(getattr(fff, on_name), farm),
+                            functools.partial(getattr(fff, off_name), farm), on_name, off_name)
+    return dispatcher
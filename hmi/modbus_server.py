@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC modbus_server.py
+
+Purpose: Serve component state to SCADA clients over Modbus/TCP.
+
+Reads are answered from a register image that refresh() rebuilds once per scan, so any number of polling clients cost
+the model nothing. Supported functions:
+    1  Read coils: valve open (position 100), pump running (speed > 0)
+    2  Read discrete inputs: same as the coils
+    3  Read holding registers: valve position (%), pump speed (rpm), as unsigned 16-bit integers
+    4  Read input registers: tank, valve, and pump values as 32-bit big-endian floats (two registers each)
+    5  Write single coil: open/close a valve or start/stop a pump through a command callback; the response is sent
+       once the command has run, and a command that fails is answered with a device failure exception
+
+Classes:
+    RegisterMap: Assigns component fields to Modbus addresses
+    ModbusServer: Register image and asyncio Modbus/TCP server
+
+Functions:
+    fuel_farm_map(), modbus_request()
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.3
+    Coil writes wait for commands that return a future (PLCRuntime.submit()) and report their failures
+Version 0.2
+    Close connections whose MBAP length leaves no room for a PDU
+Version 0.1
+    Initial build
+"""
+import asyncio
+import inspect
+import struct
+
+import Models.FuelFarm.components as ffc
+
+READ_COILS = 1
+READ_DISCRETE_INPUTS = 2
+READ_HOLDING_REGISTERS = 3
+READ_INPUT_REGISTERS = 4
+WRITE_SINGLE_COIL = 5
+
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_ADDRESS = 2
+ILLEGAL_DATA_VALUE = 3
+DEVICE_FAILURE = 4
+
+MAX_READ_REGISTERS = 125
+MAX_READ_COILS = 2000
+
+_MBAP = struct.Struct(">HHHB")  # Transaction id, protocol id, length, unit id
+_READ_REQUEST = struct.Struct(">BHH")  # Function, start address, count/value
+
+
+class RegisterMap:
+    """Modbus addresses of component fields.
+
+    Each table is a list of (name, component, attribute or reader) entries; the position in the list is the entry's
+    address. Input register entries are floats taking two registers each, so entry n starts at register 2n.
+
+    Variables: coils, holding, inputs
+
+    Methods: add_coil(), add_holding(), add_input(), describe()
+    """
+    def __init__(self):
+        self.coils = []  # (name, reader, group); group is the device group written by function 5
+        self.holding = []  # (name, reader)
+        self.inputs = []  # (name, reader)
+
+    def add_coil(self, name, reader, group=None):
+        """Map a true/false value to the next coil. Writable if a device group is given."""
+        self.coils.append((name, reader, group))
+
+    def add_holding(self, name, reader):
+        """Map an integer value to the next holding register."""
+        self.holding.append((name, reader))
+
+    def add_input(self, name, reader):
+        """Map a float value to the next pair of input registers."""
+        self.inputs.append((name, reader))
+
+    def describe(self):
+        """List every mapped value.
+
+        :return: (table, first address, name) for each entry
+        :rtype: list
+        """
+        return ([("coil", address, name) for address, (name, _, _) in enumerate(self.coils)] +
+                [("holding", address, name) for address, (name, _) in enumerate(self.holding)] +
+                [("input", address * 2, name) for address, (name, _) in enumerate(self.inputs)])
+
+
+def _field(component, attribute):
+    return lambda: getattr(component, attribute)
+
+
+def fuel_farm_map(farm=ffc):
+    """Build the register map for the fuel farm.
+
+    Coils 0-9 are gates 1-10, coils 10-12 pumps 1-3. Holding registers follow the same order (position, then speed).
+    Input registers hold tank level, pressure, and outlet flow for both tanks, then outlet pressure and flow for each
+    gate, then flow and power for each pump.
+
+    :param farm: Fuel farm to map
+
+    :rtype: RegisterMap
+    """
+    register_map = RegisterMap()
+    valves = [("gate{}".format(number), getattr(farm, "gate{}".format(number))) for number in range(1, 11)]
+    pumps = [("pump{}".format(number), getattr(farm, "pump{}".format(number))) for number in range(1, 4)]
+    for name, valve in valves:
+        register_map.add_coil("{}_open".format(name), (lambda v: lambda: v.position == 100)(valve), name)
+    for name, pump in pumps:
+        register_map.add_coil("{}_running".format(name), (lambda p: lambda: p.speed > 0)(pump), name)
+    for name, valve in valves:
+        register_map.add_holding("{}_position".format(name), _field(valve, "position"))
+    for name, pump in pumps:
+        register_map.add_holding("{}_speed".format(name), _field(pump, "speed"))
+    for name in ("tank1", "tank2"):
+        tank = getattr(farm, name)
+        for attribute in ("level", "static_tank_press", "flow_out"):
+            register_map.add_input("{}_{}".format(name, attribute), _field(tank, attribute))
+    for name, valve in valves:
+        for attribute in ("press_out", "flow_out"):
+            register_map.add_input("{}_{}".format(name, attribute), _field(valve, attribute))
+    for name, pump in pumps:
+        for attribute in ("flow", "power"):
+            register_map.add_input("{}_{}".format(name, attribute), _field(pump, attribute))
+    return register_map
+
+
+class ModbusServer:
+    """Modbus/TCP server answering from a precomputed register image.
+
+    Variables: register_map, requests, refreshes
+
+    Methods: refresh(), handle_pdu(), start()
+    """
+    def __init__(self, register_map, command=None, unit_id=None):
+        """Set up the server.
+
+        :param register_map: RegisterMap describing the image
+        :param command: Callable(group, state) used for coil writes; coils are read-only without it. Either
+            ActionDispatcher.dispatch, which runs the action at once, or lambda group, state: runtime.submit((group,
+            state)), whose future the write waits for. A ValueError from the call, or a failed future, is answered
+            with a device failure exception
+        :param unit_id: Only answer this unit id; None answers any
+        """
+        self.register_map = register_map
+        self.requests = 0
+        self.refreshes = 0
+        self.__command = command
+        self.__unit_id = unit_id
+        self.__coil_readers = [reader for _, reader, _ in register_map.coils]
+        self.__holding_readers = [reader for _, reader in register_map.holding]
+        self.__input_readers = [reader for _, reader in register_map.inputs]
+        self.__holding_format = struct.Struct(">{}H".format(len(register_map.holding)))
+        self.__input_format = struct.Struct(">{}f".format(len(register_map.inputs)))
+        self.__coils = []
+        self.__holding = b""
+        self.__inputs = b""
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the register image from the model. Call once per scan, e.g. as a PLCRuntime scan hook."""
+        self.__coils = [bool(read()) for read in self.__coil_readers]
+        self.__holding = self.__holding_format.pack(*[min(max(int(read()), 0), 0xFFFF)
+                                                      for read in self.__holding_readers])
+        self.__inputs = self.__input_format.pack(*[read() for read in self.__input_readers])
+        self.refreshes += 1
+
+    @staticmethod
+    def _exception(function, code):
+        return bytes((function | 0x80, code))
+
+    def _read_bits(self, function, start, count):
+        if not 1 <= count <= MAX_READ_COILS:
+            return self._exception(function, ILLEGAL_DATA_VALUE)
+        if start + count > len(self.__coils):
+            return self._exception(function, ILLEGAL_DATA_ADDRESS)
+        data = bytearray((count + 7) // 8)
+        for offset, value in enumerate(self.__coils[start:start + count]):
+            if value:
+                data[offset // 8] |= 1 << (offset % 8)
+        return bytes((function, len(data))) + data
+
+    @staticmethod
+    def _read_registers(function, image, start, count):
+        if not 1 <= count <= MAX_READ_REGISTERS:
+            return ModbusServer._exception(function, ILLEGAL_DATA_VALUE)
+        if (start + count) * 2 > len(image):
+            return ModbusServer._exception(function, ILLEGAL_DATA_ADDRESS)
+        return bytes((function, count * 2)) + image[start * 2:(start + count) * 2]
+
+    def _write_coil(self, pdu, address, value):
+        if value not in (0x0000, 0xFF00):
+            return self._exception(WRITE_SINGLE_COIL, ILLEGAL_DATA_VALUE)
+        if address >= len(self.register_map.coils) or self.__command is None:
+            return self._exception(WRITE_SINGLE_COIL, ILLEGAL_DATA_ADDRESS)
+        group = self.register_map.coils[address][2]
+        if group is None:
+            return self._exception(WRITE_SINGLE_COIL, ILLEGAL_DATA_ADDRESS)
+        try:
+            result = self.__command(group, value == 0xFF00)
+        except ValueError:  # Command rejected
+            return self._exception(WRITE_SINGLE_COIL, DEVICE_FAILURE)
+        if inspect.isawaitable(result):
+            return self._finish_write(pdu, result)
+        return bytes(pdu)  # Echo the request
+
+    async def _finish_write(self, pdu, pending):
+        """Wait for a queued coil write to run, then answer it."""
+        try:
+            await pending
+        except Exception:  # The action itself failed when it ran
+            return self._exception(WRITE_SINGLE_COIL, DEVICE_FAILURE)
+        return bytes(pdu)
+
+    def handle_pdu(self, pdu):
+        """Answer one Modbus request.
+
+        :param pdu: Protocol data unit: function code and data
+
+        :return: Response PDU, or an exception response; for a coil write whose command returned a future, a
+            coroutine returning the response once the command has run
+        :rtype: bytes
+        """
+        self.requests += 1
+        function = pdu[0] if pdu else 0
+        if function not in (READ_COILS, READ_DISCRETE_INPUTS, READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS,
+                            WRITE_SINGLE_COIL):
+            return self._exception(function, ILLEGAL_FUNCTION)
+        if len(pdu) != _READ_REQUEST.size:
+            return self._exception(function, ILLEGAL_DATA_VALUE)
+        _, start, count = _READ_REQUEST.unpack(pdu)
+        if function == READ_HOLDING_REGISTERS:
+            return self._read_registers(function, self.__holding, start, count)
+        if function == READ_INPUT_REGISTERS:
+            return self._read_registers(function, self.__inputs, start, count)
+        if function == WRITE_SINGLE_COIL:
+            return self._write_coil(pdu, start, count)
+        return self._read_bits(function, start, count)
+
+    async def _serve_client(self, reader, writer):
+        """Answer requests on one connection until the client disconnects."""
+        try:
+            while True:
+                header = await reader.readexactly(_MBAP.size)
+                transaction, protocol, length, unit = _MBAP.unpack(header)
+                if length < 2:  # No room for a function code; the stream can no longer be framed
+                    break
+                pdu = await reader.readexactly(length - 1)
+                if protocol != 0 or (self.__unit_id is not None and unit != self.__unit_id):
+                    continue
+                response = self.handle_pdu(pdu)
+                if inspect.isawaitable(response):
+                    response = await response
+                writer.write(_MBAP.pack(transaction, 0, len(response) + 1, unit) + response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=502):
+        """Start listening.
+
+        :param host: Interface to listen on
+        :param port: TCP port; 0 picks a free port (502 usually needs administrator rights)
+
+        :rtype: asyncio.Server
+        """
+        return await asyncio.start_server(self._serve_client, host, port)
+
+
+async def modbus_request(reader, writer, pdu, transaction=1, unit=1):
+    """Send one request on an open connection and wait for the response.
+
+    :param reader: asyncio.StreamReader for the connection
+    :param writer: asyncio.StreamWriter for the connection
+    :param pdu: Request PDU, e.g. struct.pack(">BHH", 3, 0, 10)
+
+    :return: Response PDU
+    :rtype: bytes
+    """
+    writer.write(_MBAP.pack(transaction, 0, len(pdu) + 1, unit) + pdu)
+    await writer.drain()
+    _, _, length, _ = _MBAP.unpack(await reader.readexactly(_MBAP.size))
+    return await reader.readexactly(length - 1)
+
+
+if __name__ == "__main__":
+    from Models.FuelFarm.runtime import build_runtime
+
+    async def main():
+        runtime = build_runtime()
+        server = ModbusServer(fuel_farm_map(), command=lambda group, state: runtime.submit((group, state)))
+        runtime.add_scan_hook(server.refresh)
+        listener = await server.start(port=5020)
+        print("Modbus/TCP on port 5020; Ctrl+C to stop")
+        async with listener:
+            await runtime.run()
+
+    asyncio.run(main())
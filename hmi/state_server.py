@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC state_server.py
+
+Purpose: Publish fuel farm state to the HMI table, and any other subscriber, as incremental diffs.
+
+The table is a flat list of cell strings, six cells per row, laid out the same way HMILayout.populate() always has.
+Each publish reads the raw value behind every cell, formats only the values that changed, and sends subscribers a
+{cell index: new text} dictionary. No Kivy import is needed, so the server also runs headless.
+
+Classes:
+    StatePublisher: Tracks the last published table and pushes changes to subscribers
+    TableFeed: Keeps a table widget's data in step with a publisher, until the table is cleared
+
+Author: Cody Jackson
+
+Date: 10/18/26
+#################################
+Version 0.2
+    TableFeed: a cleared table stays empty until it is populated again
+Version 0.1
+    Initial build
+"""
+import time
+
+import Models.FuelFarm.components as ffc
+
+REFRESH_RATE = 20  # Hz
+ROW_WIDTH = 6
+
+_BLANK_ROW = ("",) * ROW_WIDTH
+
+
+def _float(value):
+    return "{:.2f}".format(value)
+
+
+def _attribute(component, attribute, fmt):
+    """Make a cell that shows one component attribute."""
+    return lambda: getattr(component, attribute), fmt
+
+
+def _pump_output(pump, attribute, suction_valve):
+    """Make a cell that shows a pump output, or 0.0 while the pump's suction valve passes no flow."""
+    def read():
+        if suction_valve is not None and suction_valve.flow_out == 0.0:
+            return 0.0
+        return getattr(pump, attribute)
+    return read, _float
+
+
+def table_layout(farm=ffc):
+    """Describe the HMI table for a fuel farm.
+
+    :param farm: Fuel farm to display
+
+    :return: Cells, in display order. A cell is either fixed text or a (reader, formatter) pair.
+    :rtype: list
+    """
+    rows = [("Tank", "Level", "Pressure Out", "Flow Out", "", "")]
+    for tank in (farm.tank1, farm.tank2):
+        rows.append((_attribute(tank, "name", str), _attribute(tank, "level", str),
+                     _attribute(tank, "static_tank_press", _float), _attribute(tank, "flow_out", _float), "", ""))
+    rows.append(_BLANK_ROW)
+
+    rows.append(("Valve", "Position", "Pressure In", "Flow In", "Pressure Out", "Flow Out"))
+    for number in range(1, 11):
+        valve = getattr(farm, "gate{}".format(number))
+        rows.append((_attribute(valve, "name", str), _attribute(valve, "position", str),
+                     _attribute(valve, "press_in", _float), _attribute(valve, "flow_in", _float),
+                     _attribute(valve, "press_out", _float), _attribute(valve, "flow_out", _float)))
+    rows.append(_BLANK_ROW)
+
+    rows.append(("Pump", "Speed", "Wattage", "Pressure Out", "Flow Out", ""))
+    # Pump 1's suction check has always been disabled on the HMI; pumps 2 and 3 read 0 with their inlet valve shut
+    for pump, suction_valve in ((farm.pump1, None), (farm.pump2, farm.gate6), (farm.pump3, farm.gate7)):
+        rows.append((_attribute(pump, "name", str), _attribute(pump, "speed", _float),
+                     _attribute(pump, "power", _float), _pump_output(pump, "outlet_pressure", suction_valve),
+                     _pump_output(pump, "flow", suction_valve), ""))
+    return [cell for row in rows for cell in row]
+
+
+class StatePublisher:
+    """Publishes changes in the fuel farm HMI table.
+
+    Subscribers are callables taking one argument, a {cell index: text} dictionary. The first publish, and any publish
+    with full=True, sends every cell.
+
+    Variables: cells, publishes, last_changed, last_publish_time
+
+    Methods: subscribe(), unsubscribe(), publish(), serve()
+    """
+    def __init__(self, farm=ffc):
+        """Build the table layout for a farm.
+
+        :param farm: Fuel farm to publish
+        """
+        layout = table_layout(farm)
+        self.cells = [cell if isinstance(cell, str) else "" for cell in layout]
+        self.publishes = 0
+        self.last_changed = 0  # Cells sent by the last publish
+        self.last_publish_time = 0.0  # Seconds spent in the last publish
+        self.__dynamic = [(index, cell[0], cell[1]) for index, cell in enumerate(layout) if not isinstance(cell, str)]
+        self.__raw = [None] * len(self.__dynamic)
+        self.__subscribers = []
+        self.__sent = False
+
+    def __len__(self):
+        return len(self.cells)
+
+    def subscribe(self, callback):
+        """Add a subscriber."""
+        self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Remove a subscriber."""
+        self.__subscribers.remove(callback)
+
+    def publish(self, full=False):
+        """Find the cells whose values changed since the last publish and send them to every subscriber.
+
+        :param full: Send every cell, e.g. after a subscriber has cleared its display
+
+        :return: Cell index: new text, for the cells sent
+        :rtype: dict
+        """
+        start = time.perf_counter()
+        changes = {}
+        raw = self.__raw
+        for position, (index, read, fmt) in enumerate(self.__dynamic):
+            value = read()
+            if value != raw[position] or raw[position] is None:
+                raw[position] = value
+                text = fmt(value)
+                if text != self.cells[index]:
+                    self.cells[index] = text
+                    changes[index] = text
+        if full or not self.__sent:
+            changes = dict(enumerate(self.cells))
+            self.__sent = True
+        if changes:
+            for callback in self.__subscribers:
+                callback(changes)
+        self.publishes += 1
+        self.last_changed = len(changes)
+        self.last_publish_time = time.perf_counter() - start
+        return changes
+
+    def serve(self, rate=REFRESH_RATE, duration=None, stop=None):
+        """Publish repeatedly at a fixed rate, without a GUI.
+
+        :param rate: Publishes per second
+        :param duration: Seconds to run; runs until stopped if not provided
+        :param stop: Optional threading.Event that ends the loop when set
+        """
+        period = 1 / rate
+        start = time.perf_counter()
+        deadline = start
+        while not (stop is not None and stop.is_set()):
+            if duration is not None and deadline - start >= duration:
+                break
+            self.publish()
+            deadline += period
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+class TableFeed:
+    """Writes published changes into a table widget's data list.
+
+    Only changed cells are rewritten; a table holding a different number of cells is rebuilt. After clear() the feed
+    ignores changes, so the next refresh cannot refill the table, until populate() is called.
+
+    Variables: cleared
+
+    Methods: update(), populate(), clear()
+    """
+    def __init__(self, publisher, table):
+        """Subscribe to a publisher.
+
+        :param publisher: StatePublisher to follow
+        :param table: Callable returning the table widget, anything with a list of {"value": text} cells as data; it
+            is called on every update, so the widget need not exist yet
+        """
+        self.cleared = False
+        self.__publisher = publisher
+        self.__table = table
+        publisher.subscribe(self.update)
+
+    def update(self, changes):
+        """Apply a publisher's {cell index: text} changes to the table."""
+        if self.cleared:
+            return
+        table = self.__table()
+        if len(table.data) != len(self.__publisher):
+            table.data = [{"value": text} for text in self.__publisher.cells]
+        else:
+            for index, text in changes.items():
+                table.data[index] = {"value": text}
+
+    def populate(self):
+        """Fill the table with every cell and resume updates."""
+        self.cleared = False
+        self.__publisher.publish(full=True)
+
+    def clear(self):
+        """Empty the table and pause updates until populate()."""
+        self.cleared = True
+        self.__table().data = []
+
+
+if __name__ == "__main__":
+    publisher = StatePublisher()
+    publisher.subscribe(lambda changes: print("{} cells changed".format(len(changes))))
+    publisher.publish()
+    ffc.gate1.open()
+    publisher.publish()
@@ -0,0 +1,15 @@
+"""Command line options shared by the test tree.
+
+Options have to be registered by a conftest.py that pytest loads before parsing the command line, which a conftest in
+a test subdirectory is not; see tests/performance/conftest.py for how they are used.
+"""
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("performance", "VirtualPLC performance baselines")
+    group.addoption("--update-baselines", action="store_true", default=False,
+                    help="Store the fastest rounds of the benchmarks that run as the new baselines in "
+                         "tests/performance/baselines.json.")
+    group.addoption("--baseline-tolerance", type=float, default=None,
+                    help="Allowed slowdown over a baseline before a benchmark fails, as a fraction "
+                         "(1.0 = twice as slow). Defaults to the tolerance stored in baselines.json.")
@@ -0,0 +1,80 @@
+import pytest
+
+from Models.FuelFarm.components import FuelFarm
+from Simulation.historian import Historian
+from hmi.dispatcher import ActionDispatcher, fuel_farm_dispatcher
+
+
+class TestActionDispatcher:
+    def test_register_dispatch(self):
+        calls = []
+        dispatcher = ActionDispatcher()
+        dispatcher.register("light", lambda: calls.append("on"), lambda: calls.append("off"))
+        dispatcher.dispatch("light", True)
+        dispatcher.dispatch("light", "normal")
+        dispatcher.dispatch("light", "down")
+        assert calls == ["on", "off", "on"]
+        assert dispatcher.latency["light_on"].count == 2
+        assert dispatcher.latency["light_off"].count == 1
+        assert dispatcher.mean_latency("light_on") <= dispatcher.latency["light_on"].max_time
+        dispatcher.reset_latency()
+        assert dispatcher.latency == {}
+
+    def test_unknown_group(self):
+        dispatcher = ActionDispatcher()
+        with pytest.raises(ValueError, match="Unknown device group: gate11"):
+            dispatcher.dispatch("gate11", True)
+
+    def test_unknown_state(self):
+        calls = []
+        dispatcher = ActionDispatcher()
+        dispatcher.register("light", lambda: calls.append("on"), lambda: calls.append("off"))
+        for state in ("open", "on", ""):
+            with pytest.raises(ValueError, match="Unknown device state"):
+                dispatcher.dispatch("light", state)
+        with pytest.raises(ValueError, match="Unknown device state: on"):
+            dispatcher.action_name("light", "on")
+        assert calls == []
+
+    def test_batch_checked_first(self):
+        calls = []
+        dispatcher = ActionDispatcher()
+        dispatcher.register("light", lambda: calls.append("on"), lambda: calls.append("off"))
+        with pytest.raises(ValueError):
+            dispatcher.dispatch_many([("light", True), ("fan", True)])
+        assert calls == []
+        dispatcher.dispatch_many([("light", True), ("light", False)])
+        assert calls == ["on", "off"]
+
+
+class TestFuelFarmDispatcher:
+    def test_groups(self):
+        dispatcher = fuel_farm_dispatcher(FuelFarm())
+        assert dispatcher.groups() == ["gate{}".format(i) for i in range(1, 11)] + ["pump1", "pump2", "pump3"]
+        assert dispatcher.action_name("gate3", True) == "gate3_open"
+        assert dispatcher.action_name("pump2", False) == "pump2_off"
+
+    def test_actions_use_farm(self):
+        farm = FuelFarm()
+        other = FuelFarm()
+        dispatcher = fuel_farm_dispatcher(farm)
+        dispatcher.dispatch_many([("gate1", "down"), ("gate5", "down"), ("pump1", "down")])
+        assert farm.gate1.position == 100
+        assert farm.pump1.speed > 0
+        assert other.gate1.position == 0
+        assert sorted(dispatcher.latency) == ["gate1_open", "gate5_open", "pump1_on"]
+        dispatcher.dispatch("gate1", "normal")
+        assert farm.gate1.position == 0
+
+    def test_changes_logged(self, tmp_path):
+        farm = FuelFarm()
+        historian = Historian(str(tmp_path / "history.db"))
+        dispatcher = fuel_farm_dispatcher(farm, historian)
+        dispatcher.dispatch("gate1", "down")
+        dispatcher.dispatch("pump1", True)
+        dispatcher.dispatch("gate1", "normal")
+        historian.flush()
+        assert historian.trend("gate1", "position")[1].tolist() == [0, 100, 0]
+        assert historian.latest("pump1", "speed")[1] == farm.pump1.speed
+        assert historian.latest("gate2", "position")[1] == 0  # Starting values, unchanged since
+        historian.close()
@@ -0,0 +1,125 @@
+import asyncio
+import struct
+
+from Models.FuelFarm.components import FuelFarm
+from Models.FuelFarm.simulation import build_engine
+from Simulation.runtime import PLCRuntime
+from hmi.dispatcher import fuel_farm_dispatcher
+from hmi.modbus_server import ModbusServer, fuel_farm_map, modbus_request
+
+
+def server_for(farm):
+    return ModbusServer(fuel_farm_map(farm), command=fuel_farm_dispatcher(farm).dispatch)
+
+
+class TestRegisterMap:
+    def test_fuel_farm_map(self):
+        register_map = fuel_farm_map(FuelFarm())
+        assert len(register_map.coils) == 13
+        assert len(register_map.holding) == 13
+        assert len(register_map.inputs) == 32
+        assert register_map.describe()[0] == ("coil", 0, "gate1_open")
+        assert ("input", 2, "tank1_static_tank_press") in register_map.describe()
+
+
+class TestModbusServer:
+    def test_read_input_registers(self):
+        farm = FuelFarm()
+        farm.tank1.level = 36.0
+        server = server_for(farm)
+        response = server.handle_pdu(struct.pack(">BHH", 4, 0, 6))
+        assert response[:2] == bytes((4, 12))
+        level, press, flow = struct.unpack(">3f", response[2:])
+        assert level == 36.0
+        assert press == struct.unpack(">f", struct.pack(">f", farm.tank1.static_tank_press))[0]
+
+    def test_image_refreshed_per_scan(self):
+        farm = FuelFarm()
+        server = server_for(farm)
+        farm.gate3.position = 100
+        request = struct.pack(">BHH", 3, 2, 1)
+        assert server.handle_pdu(request) == bytes((3, 2, 0, 0))
+        server.refresh()
+        assert server.handle_pdu(request) == bytes((3, 2, 0, 100))
+        assert server.handle_pdu(struct.pack(">BHH", 1, 0, 13)) == bytes((1, 2, 0b100, 0))
+
+    def test_write_coil(self):
+        farm = FuelFarm()
+        server = server_for(farm)
+        request = struct.pack(">BHH", 5, 0, 0xFF00)
+        assert server.handle_pdu(request) == request
+        assert farm.gate1.position == 100
+
+    def test_write_coil_through_runtime(self):
+        farm = FuelFarm()
+        dispatcher = fuel_farm_dispatcher(farm)
+
+        def jammed():
+            raise RuntimeError("Valve jammed")
+
+        dispatcher.register("gate1", jammed, jammed)  # Accepted when queued, fails when the scan runs it
+        runtime = PLCRuntime(build_engine(0.001, farm), 0.001, dispatcher=dispatcher)
+        server = ModbusServer(fuel_farm_map(farm), command=lambda group, state: runtime.submit((group, state)))
+
+        async def main():
+            scans = asyncio.get_running_loop().create_task(runtime.run(duration=0.05))
+            failed = await server.handle_pdu(struct.pack(">BHH", 5, 0, 0xFF00))
+            request = struct.pack(">BHH", 5, 4, 0xFF00)
+            written = await server.handle_pdu(request)
+            await scans
+            return failed, written, request
+
+        failed, written, request = asyncio.run(main())
+        assert failed == bytes((0x85, 4))
+        assert written == request
+        assert farm.gate5.position == 100
+
+    def test_exceptions(self):
+        server = ModbusServer(fuel_farm_map(FuelFarm()))
+        assert server.handle_pdu(struct.pack(">BHH", 16, 0, 1)) == bytes((0x90, 1))
+        assert server.handle_pdu(struct.pack(">BHH", 3, 12, 2)) == bytes((0x83, 2))
+        assert server.handle_pdu(struct.pack(">BHH", 4, 0, 0)) == bytes((0x84, 3))
+        assert server.handle_pdu(struct.pack(">BHH", 5, 0, 0xFF00)) == bytes((0x85, 2))
+        assert server.handle_pdu(struct.pack(">BHH", 5, 0, 1)) == bytes((0x85, 3))
+
+    def test_tcp(self):
+        farm = FuelFarm()
+        farm.pump2.speed = 1480
+        server = server_for(farm)
+
+        async def main():
+            listener = await server.start(port=0)
+            host, port = listener.sockets[0].getsockname()[:2]
+            clients = [await asyncio.open_connection(host, port) for _ in range(3)]
+            responses = await asyncio.gather(*[modbus_request(reader, writer, struct.pack(">BHH", 3, 11, 1), n)
+                                               for n, (reader, writer) in enumerate(clients)])
+            for _, writer in clients:
+                writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return responses
+
+        assert asyncio.run(main()) == [struct.pack(">BBH", 3, 2, 1480)] * 3
+        assert server.requests == 3
+
+    def test_bad_length_closes_connection(self):
+        server = server_for(FuelFarm())
+
+        async def main():
+            listener = await server.start(port=0)
+            host, port = listener.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(struct.pack(">HHHB", 1, 0, 0, 1))  # MBAP length 0: not even a unit id
+            await writer.drain()
+            closed = await reader.read() == b""
+            writer.close()
+            reader, writer = await asyncio.open_connection(host, port)
+            response = await modbus_request(reader, writer, struct.pack(">BHH", 3, 0, 1))
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return closed, response
+
+        closed, response = asyncio.run(main())
+        assert closed
+        assert response[0] == 3
@@ -0,0 +1,87 @@
+import threading
+import types
+
+from Models.FuelFarm.components import FuelFarm
+from hmi.state_server import ROW_WIDTH, StatePublisher, TableFeed
+
+
+def row(publisher, number):
+    return publisher.cells[number * ROW_WIDTH:(number + 1) * ROW_WIDTH]
+
+
+class TestStatePublisher:
+    def test_first_publish_sends_table(self):
+        farm = FuelFarm()
+        publisher = StatePublisher(farm)
+        received = []
+        publisher.subscribe(received.append)
+        changes = publisher.publish()
+        assert len(publisher) == 20 * ROW_WIDTH
+        assert received == [changes]
+        assert sorted(changes) == list(range(len(publisher)))
+        assert row(publisher, 0) == ["Tank", "Level", "Pressure Out", "Flow Out", "", ""]
+        assert row(publisher, 1) == [farm.tank1.name, str(farm.tank1.level),
+                                     "{:.2f}".format(farm.tank1.static_tank_press),
+                                     "{:.2f}".format(farm.tank1.flow_out), "", ""]
+
+    def test_diff_only(self):
+        farm = FuelFarm()
+        publisher = StatePublisher(farm)
+        received = []
+        publisher.publish()
+        publisher.subscribe(received.append)
+        assert publisher.publish() == {}
+        assert received == []
+        farm.gate1.position = 100
+        changes = publisher.publish()
+        assert changes == {5 * ROW_WIDTH + 1: "100"}
+        assert received == [changes]
+        assert publisher.last_changed == 1
+
+    def test_full_publish(self):
+        publisher = StatePublisher(FuelFarm())
+        publisher.publish()
+        assert len(publisher.publish(full=True)) == len(publisher)
+
+    def test_pump_suction_closed(self):
+        farm = FuelFarm()
+        farm.pump2.flow = 50.0
+        publisher = StatePublisher(farm)
+        publisher.publish()
+        assert row(publisher, 18)[4] == "0.00"
+        farm.gate6.flow_out = 1.0
+        assert publisher.publish() == {10 * ROW_WIDTH + 5: "1.00", 18 * ROW_WIDTH + 4: "50.00"}
+
+    def test_serve(self):
+        publisher = StatePublisher(FuelFarm())
+        publisher.serve(rate=100, duration=0.05)
+        publishes = publisher.publishes
+        assert 3 <= publishes <= 6  # 5 ticks; wall-clock deadlines can gain or lose one, a loaded machine more
+        stop = threading.Event()
+        stop.set()
+        publisher.serve(stop=stop)
+        assert publisher.publishes == publishes
+
+
+class TestTableFeed:
+    def test_clear_until_populate(self):
+        farm = FuelFarm()
+        publisher = StatePublisher(farm)
+        table = types.SimpleNamespace(data=[])
+        feed = TableFeed(publisher, lambda: table)
+        publisher.publish()
+        assert [cell["value"] for cell in table.data] == publisher.cells
+        farm.gate1.position = 100
+        publisher.publish()
+        assert table.data[5 * ROW_WIDTH + 1] == {"value": "100"}
+
+        feed.clear()
+        farm.gate1.position = 0
+        publisher.publish()  # The next refresh must not refill a cleared table
+        publisher.publish(full=True)
+        assert table.data == []
+
+        feed.populate()
+        assert not feed.cleared
+        assert [cell["value"] for cell in table.data] == publisher.cells
+        assert table.data[5 * ROW_WIDTH + 1] == {"value": "0"}
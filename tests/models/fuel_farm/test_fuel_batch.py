@@ -0,0 +1,69 @@
+import pytest
+
+import Models.FuelFarm.batch as ffb
+import Models.FuelFarm.functionality as fff
+from Models.FuelFarm.components import FuelFarm
+
+
+class TestRunScenario:
+    def test_levels_and_actions(self):
+        row = ffb.run_scenario({"levels": {"tank1": 18}, "actions": ["gate1_open", "pump1_on"]}, FuelFarm())
+        columns = dict(zip([name for name, _, _ in ffb.COLUMNS], row))
+        assert columns["tank1_level"] == 18.0
+        assert columns["tank1_static_tank_press"] == 6.5549256507499996
+        assert columns["gate1_position"] == 100
+        assert columns["pump1_speed"] == 1480
+        assert columns["pump1_flow"] == 355.2
+
+    def test_reused_farm_is_reset(self):
+        ffb.run_scenario({"levels": {"tank2": 5}, "actions": ["gate2_open", "pump3_on"]})
+        row = ffb.run_scenario({"actions": []})
+        columns = dict(zip([name for name, _, _ in ffb.COLUMNS], row))
+        assert columns["tank2_level"] == 36.0
+        assert columns["gate2_position"] == 0
+        assert columns["pump3_speed"] == 0
+
+    def test_duration(self):
+        farm = FuelFarm()
+        ffb.run_scenario({"actions": ["gate1_open", "gate5_open", "pump1_on"], "duration": 3600, "dt": 60}, farm)
+        assert farm.tank1.level < 36.0
+
+    def test_unknown_action(self):
+        with pytest.raises(ValueError) as excinfo:
+            ffb.run_batch([{"actions": ["gate11_open"]}], workers=1)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Unknown action: gate11_open"
+
+    def test_unknown_tank(self):
+        with pytest.raises(ValueError):
+            ffb.validate({"levels": {"tank3": 10}})
+
+
+class TestRunBatch:
+    def test_in_process(self):
+        scenarios = [{"levels": {"tank1": level}} for level in (10, 20, 30)]
+        results = ffb.run_batch(scenarios, workers=1, chunksize=2)
+        assert results["scenario"].tolist() == [0, 1, 2]
+        assert results["tank1_level"].tolist() == [10.0, 20.0, 30.0]
+        assert results["elapsed"].size == 3
+
+    def test_process_pool(self):
+        scenarios = ffb.random_scenarios(20, seed=3)
+        serial = ffb.run_batch(scenarios, workers=1)
+        parallel = ffb.run_batch(scenarios, workers=2)
+        for name, _, _ in ffb.COLUMNS:
+            assert parallel[name].tolist() == serial[name].tolist()
+
+    def test_matches_functionality(self):
+        scenario = {"levels": {"tank1": 12.5, "tank2": 30}, "actions": ["gate2_open", "gate4_open", "pump2_on"]}
+        farm = FuelFarm()
+        fff.change_tank_level(farm.tank1, 12.5, farm)
+        fff.change_tank_level(farm.tank2, 30, farm)
+        for action in (fff.gate2_open, fff.gate4_open, fff.pump2_on):
+            action(farm)
+        results = ffb.run_batch([scenario], workers=1)
+        assert results["gate4_press_out"][0] == farm.gate4.press_out
+        assert results["pump2_flow"][0] == farm.pump2.flow
+
+    def test_random_scenarios_repeatable(self):
+        assert ffb.random_scenarios(5, seed=7) == ffb.random_scenarios(5, seed=7)
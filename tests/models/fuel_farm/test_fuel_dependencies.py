@@ -0,0 +1,41 @@
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.dependencies as ffd
+import Models.FuelFarm.functionality as fff
+
+
+class TestFuelFarmDependencies:
+    def setup_method(self):
+        fff.change_tank_level(ffc.tank1, 36)
+        fff.change_tank_level(ffc.tank2, 36)
+        for valve in (ffc.gate1, ffc.gate2, ffc.gate3, ffc.gate4, ffc.gate5, ffc.gate6, ffc.gate7, ffc.gate8,
+                      ffc.gate9, ffc.gate10):
+            valve.close()
+        for pump in (ffc.pump1, ffc.pump2, ffc.pump3):
+            pump.speed = 0
+        self.graph = ffd.build_graph()
+        self.graph.changed(ffc.tank1, ffc.tank2)
+
+    teardown_method = setup_method
+
+    def test_gate1_open(self):
+        count = ffd.run_action(self.graph, "gate1", True)
+        assert count == 2  # gates 3 and 5
+        assert ffc.gate1.flow_out == ffc.tank1.flow_out
+
+    def test_suction_lineup(self):
+        ffd.run_action(self.graph, "gate1", True)
+        ffd.run_action(self.graph, "gate5", True)
+        assert ffc.gate5.press_out == ffc.tank1.static_tank_press
+        assert ffc.pump1.head_in > 0
+
+    def test_pump_reaches_discharge(self):
+        ffd.run_action(self.graph, "gate9", True)
+        count = ffd.run_action(self.graph, "pump1", True)
+        assert count == 1
+        assert ffc.gate9.flow_out == ffc.pump1.flow == 355.2
+
+    def test_unrelated_branch_untouched(self):
+        before = self.graph.snapshot(ffc.gate5)
+        ffd.run_action(self.graph, "gate2", True)
+        assert self.graph.snapshot(ffc.gate5) == before
+        assert self.graph.recomputed == 2  # gates 4 and 7
@@ -0,0 +1,56 @@
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+import Models.FuelFarm.simulation as ffs
+from Models.FuelFarm.components import FuelFarm
+
+
+class TestFuelFarm:
+    def test_default_farm(self):
+        assert ffc.tank1 is ffc.default_farm.tank1
+        assert ffc.gate10 is ffc.default_farm.gate10
+        assert ffc.pump3 is ffc.default_farm.pump3
+
+    def test_initial_conditions(self):
+        farm = FuelFarm()
+        assert farm.tank1.level == 36.0
+        assert farm.tank1.static_tank_press == 13.109851301499999
+        assert farm.tank1.flow_out == 19542.86939891452
+        assert farm.gate1.press_in == 13.109851301499999
+        assert farm.gate1.Cv == 3840
+        assert farm.gate5.Cv == 240
+        assert farm.pump1.displacement == 0.24
+
+    def test_independent(self):
+        first = FuelFarm()
+        second = FuelFarm()
+        assert first.tank1 is not second.tank1
+        fff.change_tank_level(first.tank1, 18, first)
+        fff.gate1_open(first)
+        assert first.gate1.position == 100
+        assert first.gate1.press_in == 6.5549256507499996
+        assert second.gate1.position == 0
+        assert second.tank1.level == 36.0
+        assert ffc.tank1 is not first.tank1
+
+    def test_pump_on(self):
+        farm = FuelFarm()
+        fff.pump1_on(farm)
+        assert farm.pump1.speed == 1480
+        assert farm.pump1.flow == 355.2
+        assert farm.gate9.press_in == 50
+        assert farm.gate9.flow_in == 355.2
+
+    def test_change_tank_level_other_farm(self):
+        farm = FuelFarm()
+        assert fff.change_tank_level(farm.tank1, 10) == "Invalid tank number."
+        assert fff.change_tank_level(farm.tank1, 10, farm) is None
+
+    def test_simulate_two_farms(self):
+        running = FuelFarm()
+        idle = FuelFarm()
+        for action in (fff.gate1_open, fff.gate5_open, fff.pump1_on):
+            action(running)
+        ffs.build_engine(60, running).run(3600)
+        ffs.build_engine(60, idle).run(3600)
+        assert running.tank1.level < 36.0
+        assert idle.tank1.level == 36.0
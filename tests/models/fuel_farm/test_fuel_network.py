@@ -0,0 +1,48 @@
+import pytest
+
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+import Models.FuelFarm.network as ffn
+
+
+class TestFuelFarmNetwork:
+    def setup_method(self):
+        fff.change_tank_level(ffc.tank1, 36)
+        fff.change_tank_level(ffc.tank2, 36)
+        for valve in (ffc.gate1, ffc.gate2, ffc.gate3, ffc.gate4, ffc.gate5, ffc.gate6, ffc.gate7, ffc.gate8,
+                      ffc.gate9, ffc.gate10):
+            valve.close()
+        for pump in (ffc.pump1, ffc.pump2, ffc.pump3):
+            pump.speed = 0
+
+    teardown_method = setup_method
+
+    def test_pump1_lineup(self):
+        for valve in (ffc.gate1, ffc.gate5, ffc.gate9):
+            valve.open()
+        ffc.pump1.adjust_speed(1480)
+        result = ffn.solve()
+        assert result.converged
+        assert ffc.pump1.flow == pytest.approx(355.2)
+        for valve in (ffc.gate1, ffc.gate5, ffc.gate9):
+            assert valve.flow_out == pytest.approx(355.2)
+        assert ffc.gate1.press_in == ffc.tank1.static_tank_press
+        assert ffc.gate9.press_out == ffn.HYDRANT_PRESS
+        assert ffc.pump1.outlet_pressure > ffn.HYDRANT_PRESS
+        assert ffc.gate2.flow_out == 0.0
+
+    def test_cross_connect(self):
+        fff.change_tank_level(ffc.tank2, 18)
+        for valve in (ffc.gate1, ffc.gate2, ffc.gate3, ffc.gate4, ffc.gate6, ffc.gate8):
+            valve.open()
+        ffc.pump2.adjust_speed(1480)
+        ffn.solve()
+        assert ffc.gate3.flow_out + ffc.gate4.flow_out == pytest.approx(355.2)
+        assert ffc.gate6.flow_in == pytest.approx(355.2)
+
+    def test_pump_without_suction(self):
+        ffc.gate9.open()
+        ffc.pump1.adjust_speed(1480)
+        ffn.solve()
+        assert ffc.pump1.flow == 0.0
+        assert ffc.gate9.flow_out == 0.0
@@ -0,0 +1,57 @@
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+import Models.FuelFarm.simulation as ffs
+
+
+class TestFuelFarmSimulation:
+    def setup_method(self):
+        fff.change_tank_level(ffc.tank1, 36)
+        fff.change_tank_level(ffc.tank2, 36)
+        for action in (fff.pump1_off, fff.pump2_off, fff.pump3_off, fff.gate1_close, fff.gate2_close, fff.gate3_close,
+                       fff.gate4_close, fff.gate5_close, fff.gate6_close, fff.gate7_close):
+            action()
+
+    teardown_method = setup_method
+
+    def test_no_lineup(self):
+        fff.pump1_on()
+        assert ffs.suction_tanks(ffc.pump1) == []
+        ffs.build_engine().run(600)
+        assert ffc.tank1.level == 36.0
+
+    def test_pump1_drains_tank1(self):
+        fff.gate1_open()
+        fff.gate5_open()
+        fff.pump1_on()
+        assert ffs.suction_tanks(ffc.pump1) == [ffc.tank1]
+        ffs.build_engine(dt=60).run(3600)
+        assert round(ffc.tank1.level, 4) == round(36 - 355.2 * 60 / ffs.GALLONS_PER_FOOT, 4)
+        assert ffc.tank2.level == 36.0
+        assert ffc.gate1.press_in == ffc.tank1.static_tank_press
+
+    def test_pump2_split(self):
+        for action in (fff.gate1_open, fff.gate2_open, fff.gate3_open, fff.gate4_open, fff.gate6_open, fff.pump2_on):
+            action()
+        assert len(ffs.suction_tanks(ffc.pump2)) == 2
+        assert ffs.tank_draw(ffc.tank1) == ffs.tank_draw(ffc.tank2) == 177.6
+
+    def test_suction_follows_level(self):
+        fff.gate1_open()
+        fff.gate5_open()
+        fff.pump1_on()
+        head = ffc.pump1.head_in
+        ffs.build_engine(dt=60).run(20 * 3600)
+        assert ffc.tank1.level < 36.0
+        assert ffc.gate5.press_out == ffc.tank1.static_tank_press
+        assert ffc.pump1.head_in < head
+
+    def test_empty_tank_stops_pump(self):
+        fff.change_tank_level(ffc.tank1, 1)
+        fff.gate1_open()
+        fff.gate5_open()
+        fff.pump1_on()
+        ffs.build_engine(dt=60).run(3 * 3600)
+        assert ffc.tank1.level == 0.0
+        assert ffc.pump1.flow == 0.0
+        assert ffc.pump1.head_in == 0.0
+        assert ffs.tank_draw(ffc.tank1) == 0.0
@@ -0,0 +1,95 @@
+"""Regression checks for the hot path benchmarks.
+
+By default each benchmark only runs its code once, as a smoke test, so the normal test run stays fast. Timing is done
+with pytest-benchmark's --benchmark-enable or --benchmark-only:
+
+    python -m pytest tests/performance --benchmark-only
+
+A benchmark fails when its fastest round is more than the tolerance above the baseline stored for it in
+baselines.json. The fastest round is compared rather than the median because it is the least affected by other
+load on the machine. Baselines are machine-specific; after changing hardware, or after a deliberate speed change, record
+new ones with:
+
+    python -m pytest tests/performance --benchmark-only --update-baselines
+"""
+import json
+import os
+import platform
+
+import pytest
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baselines.json")
+DEFAULT_TOLERANCE = 1.0
+
+
+def read_baselines(path=BASELINE_FILE):
+    """Read stored baselines, or an empty set if there are none yet."""
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {"tolerance": DEFAULT_TOLERANCE, "benchmarks": {}}
+
+
+def write_baseline(name, fastest, path=BASELINE_FILE):
+    """Store one benchmark's fastest round (seconds per call) as its baseline."""
+    stored = read_baselines(path)
+    benchmarks = dict(stored["benchmarks"], **{name: float("{:.4g}".format(fastest))})
+    baselines = {"machine": "{} {} {}".format(platform.machine(), platform.python_implementation(),
+                                              platform.python_version()),
+                 "tolerance": stored.get("tolerance", DEFAULT_TOLERANCE),
+                 "benchmarks": dict(sorted(benchmarks.items()))}
+    with open(path, "w") as file:
+        json.dump(baselines, file, indent=2)
+        file.write("\n")
+
+
+def check_regression(name, fastest, baselines, tolerance=None):
+    """Compare a benchmark's fastest round with its baseline.
+
+    :return: Failure message, or None if within tolerance or there is no baseline
+    :rtype: str
+    """
+    baseline = baselines["benchmarks"].get(name)
+    if baseline is None:
+        return None
+    if tolerance is None:
+        tolerance = baselines.get("tolerance", DEFAULT_TOLERANCE)
+    if fastest > baseline * (1 + tolerance):
+        return "{}: fastest {:.3f} us is {:.0%} slower than the baseline {:.3f} us (tolerance {:.0%})".format(
+            name, fastest * 1e6, fastest / baseline - 1, baseline * 1e6, tolerance)
+    return None
+
+
+@pytest.fixture(scope="session")
+def baselines():
+    return read_baselines()
+
+
+@pytest.fixture
+def hot_path(benchmark, baselines, request):
+    """Benchmark a callable and fail if it has regressed against its baseline.
+
+    Call as hot_path(function, *args, operations=1); operations is the number of calls or items one call of function
+    covers, used to report throughput.
+    """
+    config = request.config
+    if not (config.getoption("benchmark_enable") or config.getoption("benchmark_only")):
+        benchmark.disabled = True
+
+    def measure(function, *args, operations=1):
+        result = benchmark(function, *args)
+        if benchmark.disabled:
+            return result
+        fastest = benchmark.stats.stats.min
+        benchmark.extra_info["operations_per_second"] = operations / benchmark.stats.stats.median
+        name = request.node.name
+        if config.getoption("update_baselines"):
+            write_baseline(name, fastest)
+        else:
+            failure = check_regression(name, fastest, baselines, config.getoption("baseline_tolerance"))
+            if failure:
+                pytest.fail(failure)
+        return result
+
+    return measure
@@ -0,0 +1,122 @@
+import functools
+import inspect
+import itertools
+
+import numpy as np
+import pytest
+
+import Models.FuelFarm.functionality as fff
+import utility_formulas
+from hmi.state_server import StatePublisher
+from Models.FuelFarm.components import FuelFarm
+from PipingSystems.pump.pump import CentrifPump, PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Globe, Relief, Valve
+
+# Rounds of at least 100 us, so sub-microsecond calls are timed over many iterations rather than a few
+pytestmark = pytest.mark.benchmark(min_time=0.0001, max_time=0.5)
+
+ARRAY_SIZE = 10000
+
+SCALAR_FORMULAS = {
+    "gravity_flow_rate": (16, 0.25, 140),
+    "cached_gravity_flow_rate": (16, 0.25, 140),
+    "static_press": (36.0,),
+    "press_to_head": (50.0,),
+    "head_to_press": (115.3,),
+}
+ARRAY_FORMULAS = {
+    "gravity_flow_rate_array": (np.linspace(2, 24, ARRAY_SIZE), np.full(ARRAY_SIZE, 0.25), 140),
+    "static_press_array": (np.linspace(0, 40, ARRAY_SIZE),),
+    "press_to_head_array": (np.linspace(0, 150, ARRAY_SIZE),),
+    "head_to_press_array": (np.linspace(0, 350, ARRAY_SIZE),),
+}
+
+# Opens the pump 1 flow path and returns the farm to its starting state
+LINEUP = (fff.gate1_open, fff.gate5_open, fff.gate9_open, fff.pump1_on, fff.pump1_off, fff.gate9_close,
+          fff.gate5_close, fff.gate1_close)
+
+
+class TestValves:
+    def test_press_drop(self, hot_path):
+        valve = Valve("Valve", sys_flow_out=100, flow_coeff=15)
+        hot_path(valve.press_drop, 100)
+        assert valve.deltaP == 44.44444444444445
+
+    def test_globe_turn_handle(self, hot_path):
+        valve = Globe("Globe", sys_flow_in=100, flow_coeff=15, press_in=50)
+        positions = itertools.cycle((25, 50, 75))
+        hot_path(lambda: valve.turn_handle(next(positions)))
+        assert valve.position in (25, 50, 75)
+
+    @pytest.mark.parametrize("press_in", [150, 50, 100], ids=["open", "close", "hold"])
+    def test_relief_valve_operation(self, hot_path, press_in):
+        valve = Relief("Relief", sys_flow_in=100, press_in=press_in, open_press=125, close_press=75)
+        hot_path(valve.valve_operation, press_in)
+        assert valve.position == (100 if press_in == 150 else 0)
+
+
+class TestPumps:
+    def test_centrif_adjust_speed(self, hot_path):
+        pump = CentrifPump("Pump", flow_rate_out=75, pump_head_in=12, press_out=25, pump_speed=125)
+        speeds = itertools.cycle((1480, 1200))
+        hot_path(lambda: pump.adjust_speed(next(speeds)))
+        assert pump.speed in (1480, 1200)
+
+    def test_positive_displacement_adjust_speed(self, hot_path):
+        pump = PositiveDisplacement("Pump", pump_head_in=12, press_out=25, displacement=0.24)
+        hot_path(pump.adjust_speed, 1480)
+        assert pump.flow == 1480 * 0.24
+
+
+class TestTank:
+    def test_level_setter(self, hot_path):
+        tank = Tank("Tank", level=36.0, outlet_diam=16, outlet_slope=0.25)
+        levels = itertools.cycle((20.0, 30.0))
+
+        def set_level():
+            tank.level = next(levels)
+
+        hot_path(set_level)
+        assert tank.static_tank_press in (utility_formulas.static_press(20.0), utility_formulas.static_press(30.0))
+
+
+class TestUtilityFormulas:
+    def test_all_covered(self):
+        # lru_cache() wrappers are not functions to inspect, so they are matched by type
+        public = {name for name, member in inspect.getmembers(utility_formulas)
+                  if (inspect.isfunction(member) or isinstance(member, functools._lru_cache_wrapper))
+                  and not name.startswith("_") and member.__module__ == utility_formulas.__name__}
+        assert public == SCALAR_FORMULAS.keys() | ARRAY_FORMULAS.keys()
+
+    @pytest.mark.parametrize("name", sorted(SCALAR_FORMULAS))
+    def test_scalar(self, hot_path, name):
+        assert hot_path(getattr(utility_formulas, name), *SCALAR_FORMULAS[name]) > 0
+
+    @pytest.mark.parametrize("name", sorted(ARRAY_FORMULAS))
+    def test_array(self, hot_path, name):
+        result = hot_path(getattr(utility_formulas, name), *ARRAY_FORMULAS[name], operations=ARRAY_SIZE)
+        assert result.shape == (ARRAY_SIZE,)
+
+
+class TestFuelFarm:
+    def test_lineup_sequence(self, hot_path):
+        farm = FuelFarm()
+
+        def lineup():
+            for action in LINEUP:
+                action(farm)
+
+        hot_path(lineup, operations=len(LINEUP))
+        assert farm.gate1.position == 0
+        assert farm.pump1.speed == 0
+
+    def test_populate(self, hot_path):
+        publisher = StatePublisher(FuelFarm())
+        cells = hot_path(publisher.publish, True)
+        assert len(cells) == len(publisher)
+
+    def test_state_extraction(self, hot_path):
+        farm = FuelFarm()
+        cells = hot_path(lambda: StatePublisher(farm).publish())
+        assert len(cells) == len(StatePublisher(farm))
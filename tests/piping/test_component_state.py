@@ -0,0 +1,55 @@
+import pytest
+
+from PipingSystems.component_state import attribute_names, get_state, set_state
+from PipingSystems.pump.pump import CentrifPump, PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Gate, Globe, Relief
+
+
+class TestSlots:
+    @pytest.mark.parametrize("component", [Gate("G"), Globe("G"), Relief("R"), CentrifPump("C"),
+                                           PositiveDisplacement("P"), Tank("T")])
+    def test_no_instance_dict(self, component):
+        assert not hasattr(component, "__dict__")
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            Gate("G").color = "red"
+
+    def test_validation_kept(self):
+        with pytest.raises(TypeError) as excinfo:
+            Globe("G").position = 12.5
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Integer values only."
+
+
+class TestComponentState:
+    def test_attribute_names(self):
+        assert attribute_names(Relief) == ("name", "_Valve__position", "Cv", "flow_in", "deltaP", "flow_out",
+                                           "press_out", "press_in", "setpoint_open", "setpoint_close")
+        assert "_Pump__speed" in attribute_names(PositiveDisplacement)
+        assert "displacement" in attribute_names(PositiveDisplacement)
+
+    def test_get_state(self):
+        tank = Tank("Tank 1", 10)
+        state = get_state(tank)
+        assert state["name"] == "Tank 1"
+        assert state["_Tank__level"] == 10.0
+        assert state["pipe_coeff"] == 140
+
+    def test_round_trip(self):
+        pump = PositiveDisplacement("Gear", displacement=0.096, press_out=30)
+        saved = get_state(pump)
+        pump.adjust_speed(300)
+        assert pump.flow == 28.8
+        set_state(pump, saved)
+        assert pump.flow == 0.0
+        assert pump.speed == 0
+        assert get_state(pump) == saved
+
+    def test_plain_object(self):
+        class Plain:
+            def __init__(self):
+                self.value = 1
+
+        assert get_state(Plain()) == {"value": 1}
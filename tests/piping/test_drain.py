@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from PipingSystems.storage_tank import drain
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.storage_tank.tank_farm import TankFarm
+
+COEFF = 19542.86939891452 / 6  # Fuel farm tank outlet, calibrated at 36 ft
+
+
+def constant_area(h):
+    return np.full_like(h, 1000.0)
+
+
+def sphere_area(h, radius=10.0):
+    return np.pi * (2 * radius * h - h * h)
+
+
+class TestDrainCoeffs:
+    def test_calibrated_from_pipe(self):
+        tanks = [Tank("t1", 36.0, 1.629869, 0.840, 16, 0.25), Tank("t2", 0.0, 1.629869, 0.840, 16, 0.25)]
+        tanks[0].level = 36.0
+        assert drain.drain_coeffs(tanks) == pytest.approx([COEFF, 0.0])
+
+    def test_set_coeff_kept(self):
+        tanks = [Tank("t1", 36.0, outlet_diam=16, outlet_slope=0.25, drain_coeff=100.0)]
+        assert drain.drain_coeffs(tanks).tolist() == [100.0]
+
+    def test_tank_farm(self):
+        tanks = [Tank("t{}".format(i), level=4.0 + i, outlet_diam=16, outlet_slope=0.25) for i in range(4)]
+        tanks[1].drain_coeff = 50.0
+        farm = TankFarm.from_tanks(tanks)
+        assert farm[1].drain_coeff == 50.0
+        assert farm[0].drain_coeff is None
+        assert farm.flows[1] == pytest.approx(50.0 * np.sqrt(5.0))
+        assert drain.drain_coeffs(farm) == pytest.approx(drain.drain_coeffs(tanks))
+
+
+class TestTimeToEmpty:
+    def test_analytic(self):
+        # Stepping a calibrated Tank with small time steps converges on the closed form
+        tank = Tank("t1", 9.0, outlet_diam=16, outlet_slope=0.25, drain_coeff=COEFF)
+        tank.level = 9.0
+        step, elapsed = 0.01, 0.0
+        while tank.level > 0:
+            tank.level = tank.level - tank.flow_out / drain.GPM_PER_CFS / 1000.0 * step
+            elapsed += step
+        assert drain.time_to_empty([9.0], [COEFF], 1000.0)[0] == pytest.approx(elapsed, rel=1e-3)
+
+    def test_callable_area_matches_constant(self):
+        levels = np.array([36.0, 9.0, 0.0])
+        expected = drain.time_to_empty(levels, COEFF, 1000.0, to_level=1.0)
+        assert drain.time_to_empty(levels, COEFF, constant_area, to_level=1.0) == pytest.approx(expected)
+        assert expected[2] == 0.0
+
+    def test_sphere(self):
+        root = np.sqrt(20.0)
+        exact = 2 * drain.GPM_PER_CFS / COEFF * np.pi * (20 * root ** 3 / 3 - root ** 5 / 5)
+        assert drain.time_to_empty([20.0], [COEFF], sphere_area)[0] == pytest.approx(exact)
+
+    def test_no_drain(self):
+        assert drain.time_to_empty([5.0], [0.0], 1000.0).tolist() == [np.inf]
+
+
+class TestDrainLevels:
+    def test_constant_area(self):
+        times = np.linspace(0, 2000, 9)
+        levels = drain.drain_levels([36.0, 9.0], COEFF, 1000.0, times)
+        assert levels.shape == (2, 9)
+        assert levels[:, 0].tolist() == [36.0, 9.0]
+        assert levels[1, -1] == 0.0
+        assert np.all(np.diff(levels, axis=1) <= 0)
+        assert drain.drain_levels([36.0, 9.0], COEFF, constant_area, times) == pytest.approx(levels)
+
+    def test_empty_at_time_to_empty(self):
+        finish = drain.time_to_empty([20.0], [COEFF], sphere_area)[0]
+        levels = drain.drain_levels([20.0, 20.0], [COEFF, 0.0], sphere_area, [0.0, finish / 2, finish, finish * 2])
+        assert levels[0, 0] == pytest.approx(20.0)
+        assert 0 < levels[0, 1] < 20.0
+        assert levels[0, 2:] == pytest.approx([0.0, 0.0], abs=1e-9)
+        assert levels[1].tolist() == [20.0] * 4
+
+    def test_negative_time(self):
+        with pytest.raises(ValueError):
+            drain.drain_levels([1.0], COEFF, 1000.0, [-1.0])
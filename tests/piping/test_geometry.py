@@ -0,0 +1,118 @@
+import math
+
+import numpy as np
+import pytest
+
+from PipingSystems.storage_tank import drain, geometry
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.storage_tank.tank_farm import TankFarm
+
+GALLONS = geometry.GALLONS_PER_CUBIC_FOOT
+
+
+class TestShapes:
+    def test_vertical_cylinder(self):
+        shape = geometry.VerticalCylinder.from_capacity(1000000, 36)
+        assert shape.capacity == pytest.approx(1000000)
+        assert shape.volume(1.0) == pytest.approx(27777.78, abs=0.01)  # Fuel farm tanks: 27778 gallons per foot
+        assert shape.level(500000.0) == pytest.approx(18.0)
+        assert shape.volume(40.0) == pytest.approx(1000000)
+
+    def test_horizontal_cylinder(self):
+        shape = geometry.HorizontalCylinder(10, 40)
+        assert shape.capacity == pytest.approx(math.pi * 25 * 40 * GALLONS)
+        assert shape.volume(5.0) == pytest.approx(shape.capacity / 2)
+        assert shape.area(5.0) == pytest.approx(400.0)
+        assert shape.area(0.0) == 0.0
+
+    def test_sphere(self):
+        shape = geometry.Sphere(20)
+        assert shape.capacity == pytest.approx(math.pi * 20 ** 3 / 6 * GALLONS)
+        assert shape.level(shape.capacity / 2) == pytest.approx(10.0)
+        assert shape.area(10.0) == pytest.approx(math.pi * 100)
+
+    @pytest.mark.parametrize("shape", [geometry.VerticalCylinder(10, 30), geometry.HorizontalCylinder(8, 25),
+                                       geometry.Sphere(20)])
+    def test_round_trip(self, shape):
+        levels = np.linspace(0, shape.height, 5001)
+        assert shape.level(shape.volume(levels)) == pytest.approx(levels, abs=1e-9)
+        assert isinstance(shape.volume(1), float)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            geometry.Sphere(0)
+
+    def test_shape_needs_formulas(self):
+        class Cone(geometry._Shape):
+            def _volume(self, level):
+                return math.pi * level ** 3 / 3 * GALLONS
+
+        with pytest.raises(TypeError):
+            Cone(10, 16)
+
+
+class TestStrappingTable:
+    def test_interpolation(self):
+        table = geometry.StrappingTable([0, 1, 2, 4], [0, 100, 300, 500])
+        assert table.volume(1.5) == 200.0
+        assert table.level(400.0) == 3.0
+        assert table.volume(np.array([-1.0, 0.5, 9.0])).tolist() == [0.0, 50.0, 500.0]
+        assert table.area(np.array([0.5, 1.0, 3.9])) == pytest.approx(np.array([100, 200, 100]) / GALLONS)
+
+    def test_large_table(self):
+        levels = np.linspace(0, 50, 10000)
+        volumes = np.cumsum(np.random.default_rng(25).uniform(100, 200, 10000))
+        volumes -= volumes[0]
+        table = geometry.StrappingTable(levels, volumes)
+        queries = np.random.default_rng(26).uniform(0, 50, 10000)
+        assert table.level(table.volume(queries)) == pytest.approx(queries)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            geometry.StrappingTable([0, 2, 1], [0, 1, 2])
+        with pytest.raises(ValueError):
+            geometry.StrappingTable([0, 1, 2], [0, 1, 1])
+
+
+class TestTankVolume:
+    def test_volume(self):
+        tank1 = Tank("tank1", 18.0, geometry=geometry.VerticalCylinder.from_capacity(1000000, 36))
+        assert tank1.volume == pytest.approx(500000)
+        tank1.volume = 250000
+        assert tank1.level == pytest.approx(9.0)
+        assert tank1.static_tank_press > 0
+
+    def test_no_geometry(self):
+        with pytest.raises(ValueError):
+            Tank("tank1", 18.0).volume
+
+    def test_tank_farm(self):
+        sphere = geometry.Sphere(20)
+        cylinder = geometry.HorizontalCylinder(10, 40)
+        tanks = [Tank("t{}".format(i), 1.0 + i, geometry=(sphere, cylinder, None)[i % 3]) for i in range(9)]
+        farm = TankFarm.from_tanks(tanks)
+        volumes = farm.volumes()
+        for tank, volume in zip(tanks, volumes):
+            if tank.geometry is None:
+                assert np.isnan(volume)
+            else:
+                assert volume == tank.volume
+        assert farm[0].volume == volumes[0]
+        with pytest.raises(ValueError):
+            farm.set_volumes(volumes)
+
+    def test_set_volumes(self):
+        sphere = geometry.Sphere(20)
+        farm = TankFarm()
+        for i in range(4):
+            farm.add_tank("t{}".format(i), 5.0, outlet_diam=16, outlet_slope=0.25, geometry=sphere)
+        farm.set_volumes([0, sphere.capacity / 2, sphere.capacity, 2 * sphere.capacity])
+        assert farm.levels == pytest.approx([0.0, 10.0, 20.0, 20.0])
+        assert farm.flows[0] == 0.0
+
+    def test_drain_area(self):
+        shapes = [geometry.Sphere(20), geometry.VerticalCylinder(10, 30)]
+        area = geometry.area_function(shapes)
+        assert area(np.array([10.0, 10.0])) == pytest.approx([math.pi * 100, math.pi * 25])
+        times = drain.time_to_empty([20.0, 30.0], [3000.0, 3000.0], area)
+        assert times[1] == pytest.approx(drain.time_to_empty([30.0], [3000.0], math.pi * 25)[0])
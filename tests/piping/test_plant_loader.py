@@ -0,0 +1,121 @@
+import json
+import os
+
+import pytest
+
+import Models.FuelFarm.functionality as fff
+import PipingSystems.plant_loader as plant_loader
+from Models.FuelFarm.components import PLANT_FILE, FuelFarm
+from PipingSystems.component_state import get_state
+from PipingSystems.plant_loader import compile_plant, load_plant
+from PipingSystems.user_creation_script import save_plant
+
+SMALL_PLANT = {"name": "Small", "components": [
+    {"id": "t1", "type": "tank", "level": 10.0, "outlet_diam": 4, "outlet_slope": 0.5},
+    {"id": "v1", "type": "gate", "diameter": 4, "position": 100, "inlets": ["t1"]},
+    {"id": "p1", "type": "centrifugal", "press_out": 20, "inlets": ["v1"]},
+]}
+
+
+def write(path, definition):
+    path.write_text(json.dumps(definition))
+    return str(path)
+
+
+class TestLoadPlant:
+    def test_fuel_farm_matches(self):
+        plant = load_plant(PLANT_FILE, cache=False)
+        farm = FuelFarm()
+        assert sorted(plant.components) == sorted(vars(farm))
+        for name, component in plant.components.items():
+            expected = getattr(farm, name)
+            assert type(component) is type(expected)
+            assert get_state(component) == get_state(expected)
+
+    def test_functionality_on_plant(self):
+        plant = load_plant(PLANT_FILE, cache=False)
+        fff.gate1_open(plant)
+        assert plant.gate1.position == 100
+        assert plant.gate1.flow_out == plant.tank1.flow_out
+
+    def test_inlet_defaults(self, tmp_path):
+        plant = load_plant(write(tmp_path / "small.json", SMALL_PLANT), cache=False)
+        assert plant.v1.flow_in == plant.t1.flow_out
+        assert plant.v1.press_in == plant.t1.static_tank_press
+        assert plant.v1.Cv == 240.0
+        assert plant.p1.head_in > 0
+        assert plant.connections() == [("t1", "v1"), ("v1", "p1")]
+        graph = plant.graph()
+        plant.t1.level = 5.0
+        assert graph.changed(plant.t1) == 2
+        assert plant.v1.press_out == plant.t1.static_tank_press
+
+    def test_cache(self, tmp_path, monkeypatch):
+        path = write(tmp_path / "small.json", SMALL_PLANT)
+        load_plant(path)
+        assert os.path.exists(path + ".cache")
+        monkeypatch.setattr(plant_loader, "parse_plant", lambda *args: pytest.fail("cache not used"))
+        assert len(load_plant(path)) == 3
+
+    def test_stale_cache(self, tmp_path):
+        path = write(tmp_path / "small.json", SMALL_PLANT)
+        load_plant(path)
+        changed = json.loads(json.dumps(SMALL_PLANT))
+        changed["components"][0]["level"] = 5.0
+        write(tmp_path / "small.json", changed)
+        assert load_plant(path).t1.level == 5.0
+
+    def test_cache_is_data(self, tmp_path):
+        path = write(tmp_path / "small.json", SMALL_PLANT)
+        with open(path + ".cache", "wb") as file:
+            file.write(b"\x80\x04cos\nsystem\n.")  # A pickle is never loaded, only replaced
+        assert len(load_plant(path)) == 3
+        with open(path + ".cache") as file:
+            assert json.load(file)["version"] == plant_loader.COMPILED_VERSION
+        assert load_plant(path).v1.flow_in == load_plant(path, cache=False).v1.flow_in
+
+    def test_read_only_directory(self, tmp_path, monkeypatch):
+        path = write(tmp_path / "small.json", SMALL_PLANT)
+
+        def read_only(*args, **kwargs):
+            raise PermissionError("read-only file system")
+
+        monkeypatch.setattr(plant_loader.os, "replace", read_only)
+        assert len(load_plant(path)) == 3
+        assert not os.path.exists(path + ".cache")
+        assert os.listdir(str(tmp_path)) == ["small.json"]
+
+    def test_toml_yaml(self, tmp_path):
+        toml = tmp_path / "small.toml"
+        toml.write_text('name = "Small"\n[[components]]\nid = "t1"\ntype = "tank"\nlevel = 3.0\n')
+        assert load_plant(str(toml), cache=False).t1.level == 3.0
+        pytest.importorskip("yaml")
+        yaml = tmp_path / "small.yaml"
+        yaml.write_text("components:\n  - {id: g1, type: gate, flow_coeff: 15}\n")
+        assert load_plant(str(yaml), cache=False).g1.Cv == 15.0
+
+    def test_without_tomllib(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(plant_loader, "tomllib", None)
+        with pytest.raises(ValueError, match="TOML plant files need Python 3.11"):
+            plant_loader.parse_plant("small.toml", b'name = "Small"')
+        assert plant_loader.parse_plant("small.json", b'{"name": "Small"}') == {"name": "Small"}
+
+
+class TestCompilePlant:
+    @pytest.mark.parametrize("components, message", [
+        ([{"id": "a"}], "Every component needs an 'id' and a 'type'"),
+        ([{"id": "a", "type": "tank"}, {"id": "a", "type": "tank"}], "Duplicate component id: a"),
+        ([{"id": "a", "type": "boiler"}], "Unknown component type 'boiler' for a"),
+        ([{"id": "a", "type": "tank", "diameter": 4}], "Unknown parameter 'diameter' for a"),
+        ([{"id": "a", "type": "gate", "inlets": ["b"]}], "Unknown inlet 'b' for a"),
+        ([{"id": "a", "type": "gate", "inlets": ["b"]}, {"id": "b", "type": "gate", "inlets": ["a"]}],
+         "Plant connections contain a cycle."),
+    ])
+    def test_invalid(self, components, message):
+        with pytest.raises(ValueError, match=message):
+            compile_plant({"components": components})
+
+    def test_save_plant(self, tmp_path):
+        path = str(tmp_path / "saved.json")
+        save_plant(path, "Small", SMALL_PLANT["components"])
+        assert load_plant(path, cache=False).name == "Small"
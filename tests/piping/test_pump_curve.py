@@ -0,0 +1,125 @@
+import math
+
+import numpy as np
+import pytest
+
+import utility_formulas
+from PipingSystems.pump.pump import CentrifPump, PositiveDisplacement
+from PipingSystems.pump.pump_curve import PumpCurve
+
+FLOW = [0, 250, 500, 750, 1000]
+HEAD = [100, 75, 50, 25, 0]  # head = 100 - 0.1 * flow
+EFFICIENCY = [0.0, 0.5, 0.8, 0.6, 0.3]
+NPSHR = [4, 6, 8, 12, 18]
+
+
+def linear_curve(**kwargs):
+    return PumpCurve(FLOW, HEAD, EFFICIENCY, NPSHR, rated_speed=1480, **kwargs)
+
+
+class TestPumpCurve:
+    def test_table(self):
+        curve = linear_curve(resolution=5)
+        table = curve.table(1480)
+        assert table.flow.tolist() == FLOW
+        assert table.head.tolist() == HEAD
+        half = curve.table(740)
+        assert half.flow.tolist() == [flow / 2 for flow in FLOW]
+        assert half.head.tolist() == [head / 4 for head in HEAD]
+        assert half.efficiency.tolist() == EFFICIENCY
+        assert half.npshr.tolist() == [npshr / 4 for npshr in NPSHR]
+
+    def test_table_cache(self):
+        curve = linear_curve(max_tables=2)
+        table = curve.table(1480)
+        assert curve.table(1480) is table
+        curve.table(1000)
+        curve.table(500)  # Drops the 1480 rpm table
+        assert curve.table(1480) is not table
+
+    def test_set_points_invalidates(self):
+        curve = linear_curve()
+        table = curve.table(1480)
+        version = curve.version
+        curve.set_points(FLOW, [120, 90, 60, 30, 0])
+        assert curve.version == version + 1
+        assert curve.table(1480) is not table
+        assert curve.head_at(0, 1480) == 120
+
+    def test_lookups(self):
+        curve = linear_curve()
+        assert curve.head_at(400, 1480) == pytest.approx(60)
+        assert curve.head_at(200, 740) == pytest.approx(15)
+        assert curve.efficiency_at(500, 1480) == pytest.approx(0.8, abs=0.01)  # Dense table smooths the peak
+        assert curve.npshr_at(500, 1480) == pytest.approx(8, abs=0.05)
+        assert PumpCurve(FLOW, HEAD).efficiency_at(500, 1480) is None
+
+    def test_operating_point(self):
+        curve = linear_curve()
+        point = curve.operating_point(1480, 20, 0)
+        assert point.flow == pytest.approx(800)
+        assert point.head == pytest.approx(20)
+        assert point.efficiency == pytest.approx(0.54)
+        expected = (-0.1 + math.sqrt(0.01 + 4 * 1e-4 * 80)) / 2e-4  # 100 - 0.1Q = 20 + 1e-4 Q^2
+        point = curve.operating_point(1480, 20, 1e-4)
+        assert point.flow == pytest.approx(expected, rel=1e-3)
+        assert point.head == pytest.approx(20 + 1e-4 * expected ** 2, rel=1e-3)
+
+    def test_back_pressure(self):
+        curve = linear_curve()
+        flows = [curve.operating_point(1480, static, 1e-4).flow for static in (0, 20, 40, 60, 80)]
+        assert flows == sorted(flows, reverse=True)
+
+    def test_shutoff_and_runout(self):
+        curve = PumpCurve(FLOW, [100, 80, 60, 40, 20])
+        shutoff = curve.operating_point(1480, 150, 1e-4)
+        assert (shutoff.flow, shutoff.head) == (0.0, 100.0)
+        runout = curve.operating_point(1480, 0, 0)
+        assert (runout.flow, runout.head) == (1000.0, 20.0)
+        stopped = curve.operating_point(0, 10, 1e-4)
+        assert stopped.flow == 0.0
+        assert math.isnan(stopped.efficiency)
+
+    def test_operating_points_match_scalar(self):
+        curve = linear_curve()
+        speeds = np.array([1480, 1200, 740, 1480, 0, 1480])
+        static = np.array([20, 10, 40, 150, 5, -10])
+        resistance = np.array([1e-4, 2e-4, 0, 1e-4, 1e-4, 0])
+        points = curve.operating_points(speeds, static, resistance)
+        for i in range(len(speeds)):
+            scalar = curve.operating_point(speeds[i], static[i], resistance[i])
+            assert points.flow[i] == pytest.approx(scalar.flow)
+            assert points.head[i] == pytest.approx(scalar.head)
+            assert points.npshr[i] == pytest.approx(scalar.npshr)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="at least two points"):
+            PumpCurve([0], [10])
+        with pytest.raises(ValueError, match="flows must be >= 0 and increasing"):
+            PumpCurve([0, 100, 50], [10, 8, 6])
+        with pytest.raises(ValueError, match="head must not rise"):
+            PumpCurve([0, 100], [10, 12])
+        with pytest.raises(ValueError, match="one value per flow point"):
+            PumpCurve([0, 100], [10, 8], efficiency=[0.5])
+        with pytest.raises(ValueError, match="Rated speed"):
+            PumpCurve([0, 100], [10, 8], rated_speed=0)
+
+
+class TestPumpOperate:
+    def test_operate(self):
+        pump = CentrifPump("Pump", pump_head_in=10, pump_speed=1480, curve=linear_curve())
+        point = pump.operate(20, 0)
+        assert pump.flow == point.flow == pytest.approx(800)
+        assert pump.outlet_pressure == utility_formulas.head_to_press(10 + point.head)
+        assert pump.power == pytest.approx(pump.pump_power(point.flow, point.head) / point.efficiency)
+
+    def test_speed_change(self):
+        pump = PositiveDisplacement("Pump", pump_speed=1480, displacement=0.5, curve=PumpCurve(FLOW, HEAD))
+        full = pump.operate(20, 1e-4).flow
+        pump.speed = 740
+        assert pump.operate(20, 1e-4).flow < full
+        assert pump.power == pump.pump_power(pump.flow, pump.curve.operating_point(740, 20, 1e-4).head)
+
+    def test_no_curve(self):
+        with pytest.raises(ValueError, match="Pump has no performance curve."):
+            CentrifPump("Pump").operate(20, 0)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from PipingSystems.pump.pump import CentrifPump, PositiveDisplacement
+from PipingSystems.pump.pump_fleet import PumpFleet
+
+
+def mixed_pumps():
+    pumps = []
+    for i in range(24):
+        if i % 3:
+            pumps.append(CentrifPump("c{}".format(i), 75 + i, 12 + i % 4, 25 + 2 * i, 125 * (i % 4)))
+        else:
+            pumps.append(PositiveDisplacement("p{}".format(i), 100, i % 5, 200 + i, 300, 0.15 + i / 100))
+    return pumps
+
+
+class TestPumpFleet:
+    def test_add_pump(self):
+        fleet = PumpFleet(capacity=1)
+        fleet.add_pump("Pump 1", 75, 12, 25, 125)
+        fleet.add_pump("Pump 2", 100, 0, 200, 300, 0.15, positive=True)
+        assert len(fleet) == 2
+        assert fleet.names == ["Pump 1", "Pump 2"]
+        assert fleet.positive.tolist() == [False, True]
+        assert fleet.displacement.tolist() == [0.0, 0.15]
+
+    def test_pump_power(self):
+        pump = CentrifPump()
+        assert PumpFleet.pump_power(np.array([75.0]), np.array([12.0])).tolist() == [pump.pump_power(75.0, 12.0)]
+
+    def test_matches_scalar_pumps(self):
+        pumps = mixed_pumps()
+        reference = mixed_pumps()
+        fleet = PumpFleet.from_pumps(pumps)
+        speeds = [0, 50, 1480, 300, 125, 600, 10, 2000] * 3
+        fleet.adjust_speed(speeds)
+        for pump, speed in zip(reference, speeds):
+            pump.adjust_speed(speed)
+        fleet.update_pumps(pumps)
+        for pump, expected in zip(pumps, reference):
+            assert pump.speed == expected.speed
+            assert pump.flow == expected.flow
+            assert pump.outlet_pressure == expected.outlet_pressure
+            assert pump.power == expected.power
+
+    def test_sweep_selected(self):
+        reference = mixed_pumps()
+        fleet = PumpFleet.from_pumps(mixed_pumps())
+        for speed in (100, 0, 900, 450):
+            fleet.adjust_speed(speed, which=fleet.positive)
+            for pump in reference:
+                if isinstance(pump, PositiveDisplacement):
+                    pump.adjust_speed(speed)
+        assert fleet.flow.tolist() == [pump.flow for pump in reference]
+        assert fleet.power.tolist() == [pump.power for pump in reference]
+
+    def test_bad_speed(self):
+        fleet = PumpFleet.from_pumps(mixed_pumps())
+        with pytest.raises(ValueError, match="Speed must be 0 or greater."):
+            fleet.adjust_speed(-1)
+        with pytest.raises(TypeError, match="Numeric values only."):
+            fleet.adjust_speed(["fast"] * 24)
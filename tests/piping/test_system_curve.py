@@ -0,0 +1,140 @@
+import math
+
+import numpy as np
+import pytest
+
+import utility_formulas
+from PipingSystems.pump.pump import CentrifPump
+from PipingSystems.pump.pump_curve import PumpCurve
+from PipingSystems.system_curve import OperatingPointSolver, Parallel, Series, SystemCurve
+from PipingSystems.valve.valve import Gate, Globe
+
+CURVE = ([0, 200, 400, 600, 800, 1000, 1200], [120, 118, 112, 102, 88, 70, 48],
+         [0.0, 0.45, 0.68, 0.8, 0.82, 0.75, 0.6], [5, 6, 8, 10, 13, 17, 22])
+
+
+def valve(cls, cv, position):
+    component = cls("v", flow_coeff=cv)
+    component.position = position
+    return component
+
+
+def discharge(elevation=20.0):
+    """Pump -> throttle -> two parallel gates."""
+    throttle = valve(Globe, 300, 100)
+    branch1, branch2 = valve(Gate, 200, 100), valve(Gate, 100, 100)
+    return SystemCurve(Series(throttle, Parallel(branch1, branch2)), elevation=elevation)
+
+
+def solver(system=None, speed=1480):
+    pump = CentrifPump("Pump", pump_speed=speed, curve=PumpCurve(*CURVE))
+    return OperatingPointSolver(pump, system or discharge())
+
+
+class TestSystemCurve:
+    def test_flow_coeff(self):
+        system = discharge()
+        assert system.flow_coeff() == pytest.approx(1 / math.sqrt(1 / 300 ** 2 + 1 / 300 ** 2))
+        system.valves[1].position = 0
+        assert system.flow_coeff() == pytest.approx(1 / math.sqrt(1 / 300 ** 2 + 1 / 100 ** 2))
+        system.valves[0].position = 50
+        assert system.flow_coeff() == pytest.approx(1 / math.sqrt(1 / 150 ** 2 + 1 / 100 ** 2))
+        system.valves[2].position = 0
+        assert system.flow_coeff() == 0
+
+    def test_flow_coeff_batch(self):
+        system = discharge()
+        positions = [[100, 100, 100], [100, 0, 100], [50, 0, 100], [100, 0, 0]]
+        expected = []
+        for row in positions:
+            for valve_, position in zip(system.valves, row):
+                valve_.position = position
+            expected.append(float(system.flow_coeff()))
+        assert system.flow_coeff(positions).tolist() == pytest.approx(expected)
+
+    def test_head(self):
+        system = discharge(elevation=30.0)
+        static = utility_formulas.press_to_head(utility_formulas.static_press(30.0))
+        assert system.static_head() == static
+        drop = (500 / system.flow_coeff()) ** 2  # psi
+        assert system.head(500) == pytest.approx(static + utility_formulas.press_to_head(drop))
+
+
+class TestOperatingPointSolver:
+    def test_solve(self):
+        solve = solver()
+        point = solve.solve()
+        assert 0 < point.flow < 1200
+        assert point.head == pytest.approx(float(solve.system.head(point.flow)), rel=1e-3)
+        assert point.head == pytest.approx(float(solve.pump.curve.head_at(point.flow, 1480)), rel=1e-3)
+
+    def test_throttling_reduces_flow(self):
+        solve = solver()
+        full = solve.solve().flow
+        solve.system.valves[0].position = 30
+        assert solve.solve().flow < full
+
+    def test_closed_lineup(self):
+        solve = solver()
+        solve.system.valves[0].position = 0
+        point = solve.solve()
+        assert (point.flow, point.head) == (0.0, 120.0)
+
+    def test_cache(self):
+        solve = solver()
+        first = solve.solve()
+        assert solve.solve() is first
+        solve.system.valves[1].position = 0
+        second = solve.solve()
+        solve.system.valves[1].position = 100
+        assert solve.solve() is first
+        assert solve.cache_info() == (2, 2, 4096, 2)
+        solve.pump.speed = 1200
+        assert solve.solve().flow < first.flow
+        solve.pump.curve.set_points(CURVE[0], [150, 140, 130, 120, 110, 100, 90])
+        solve.pump.speed = 1480
+        assert solve.solve().flow > first.flow
+        assert second.flow < first.flow
+
+    def test_cache_fluid(self):
+        solve = solver()
+        water = solve.solve()
+        solve.system.density, solve.system.spec_grav = 1.629869, 0.840  # Jet fuel
+        fuel = solve.solve()
+        assert fuel is not water
+        assert solve.cache_info().misses == 2
+        solve.system.density, solve.system.spec_grav = utility_formulas.WATER_DENSITY, utility_formulas.WATER_SPEC_GRAV
+        assert solve.solve() is water
+
+    def test_cache_size(self):
+        solve = solver()
+        solve.cache_size = 2
+        for position in (10, 20, 30):
+            solve.system.valves[0].position = position
+            solve.solve()
+        assert solve.cache_info().currsize == 2
+        solve.clear_cache()
+        assert solve.cache_info() == (0, 0, 2, 0)
+
+    def test_settle(self):
+        solve = solver()
+        point = solve.settle()
+        assert solve.pump.flow == point.flow
+        assert solve.pump.outlet_pressure == utility_formulas.head_to_press(point.head)
+
+    def test_solve_many(self):
+        solve = solver()
+        positions = np.array([[100, 100, 100], [40, 100, 0], [0, 100, 100], [70, 0, 100]])
+        speeds = np.array([1480, 1200, 1480, 900])
+        points = solve.solve_many(positions, speeds)
+        for i, row in enumerate(positions):
+            for valve_, position in zip(solve.system.valves, row):
+                valve_.position = int(position)
+            solve.pump.speed = int(speeds[i])
+            single = solve.solve()
+            assert points.flow[i] == pytest.approx(single.flow)
+            assert points.head[i] == pytest.approx(single.head)
+
+    def test_no_curve(self):
+        with pytest.raises(ValueError, match="Pump has no performance curve."):
+            OperatingPointSolver(CentrifPump("Pump"), discharge())
@@ -1,4 +1,7 @@
+import numpy
 import pytest
+
+import utility_formulas
 from PipingSystems.storage_tank.tank import Tank
 
 
@@ -57,3 +60,52 @@ class TestTankPressure:
             tank1.static_tank_press = "a"
         exception_msg = excinfo.value.args[0]
         assert exception_msg == "Numeric values only."
+
+
+class TestTankGravityFlowCache:
+    def test_same_as_uncached(self):
+        for diameter, slope, coeff in ((16, 0.25, 140), (4, 1.67, 120), (2.5, 0.01, 100)):
+            assert utility_formulas.cached_gravity_flow_rate(diameter, slope, coeff) == \
+                utility_formulas.gravity_flow_rate(diameter, slope, coeff)
+
+    def test_level_updates_hit_cache(self):
+        tank1 = Tank("tank1", 10, outlet_diam=13, outlet_slope=0.37)
+        tank1.level = 9.0
+        before = utility_formulas.cached_gravity_flow_rate.cache_info()
+        for level in (8.0, 7, 6.5):
+            tank1.level = level
+        after = utility_formulas.cached_gravity_flow_rate.cache_info()
+        assert after.hits - before.hits == 3
+        assert after.misses == before.misses
+        assert tank1.flow_out == utility_formulas.gravity_flow_rate(13, 0.37, 140)
+
+    def test_numeric_subclasses(self):
+        tank1 = Tank()
+        tank1.level = True
+        assert tank1.level == 1
+        tank1.level = numpy.float32(2.5)
+        assert tank1.static_tank_press == utility_formulas.static_press(numpy.float32(2.5))
+
+
+class TestTankDrain:
+    def test_default_flow_unchanged(self):
+        tank1 = Tank("tank1", 36.0, 1.629869, 0.840, 16, 0.25)
+        tank1.level = 36.0
+        assert tank1.drain_coeff is None
+        assert tank1.flow_out == 19542.86939891452
+        tank1.level = 18.0
+        assert tank1.flow_out == 19542.86939891452
+
+    def test_calibrate_drain(self):
+        tank1 = Tank("tank1", 36.0, 1.629869, 0.840, 16, 0.25)
+        coeff = tank1.calibrate_drain()
+        assert coeff == pytest.approx(19542.86939891452 / 6)
+        assert tank1.flow_out == pytest.approx(19542.86939891452)
+        tank1.level = 9.0
+        assert tank1.flow_out == pytest.approx(19542.86939891452 / 2)
+        tank1.level = 0
+        assert tank1.flow_out == 0.0
+
+    def test_calibrate_empty(self):
+        with pytest.raises(ValueError):
+            Tank("tank1", 0.0, outlet_diam=16, outlet_slope=0.25).calibrate_drain()
@@ -0,0 +1,84 @@
+import pytest
+
+import utility_formulas
+import Models.FuelFarm.functionality as fff
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.storage_tank.tank_farm import TankFarm
+
+
+def fuel_farm():
+    farm = TankFarm(capacity=1)
+    farm.add_tank("Tank 1", level=36.0, fluid_density=1.629869, spec_gravity=0.840, outlet_diam=16, outlet_slope=0.25)
+    farm.add_tank("Tank 2", level=18.0, fluid_density=1.629869, spec_gravity=0.840, outlet_diam=16, outlet_slope=0.25)
+    return farm
+
+
+class TestTankFarm:
+    def test_add_tank(self):
+        farm = fuel_farm()
+        assert len(farm) == 2
+        assert farm.names == ["Tank 1", "Tank 2"]
+        assert farm.pressures.tolist() == [13.109851301499999, 6.5549256507499996]
+        assert farm.flows.tolist() == [19542.86939891452, 19542.86939891452]
+
+    def test_set_levels(self):
+        farm = fuel_farm()
+        farm.set_levels([18, -4])
+        assert farm.levels.tolist() == [18.0, 0.0]
+        assert farm.pressures.tolist() == [6.5549256507499996, 0.0]
+        assert farm.flows.tolist() == [19542.86939891452, 0.0]
+
+    def test_matches_tank(self):
+        tanks = [Tank("t{}".format(i), level=i * 1.5, outlet_diam=2 + i % 3, outlet_slope=0.1 * i) for i in range(20)]
+        for tank in tanks:
+            tank.level = tank.level
+        farm = TankFarm.from_tanks(tanks)
+        farm.recalculate()
+        for tank, view in zip(tanks, farm):
+            assert view.level == tank.level
+            assert view.static_tank_press == tank.static_tank_press
+            assert view.flow_out == tank.flow_out
+
+
+class TestTankView:
+    def test_view_identity(self):
+        farm = fuel_farm()
+        assert farm[1] is farm[1]
+        assert farm[1].name == "Tank 2"
+
+    def test_view_level(self):
+        farm = fuel_farm()
+        farm[0].level = 18
+        assert farm.levels[0] == 18.0
+        assert farm[0].static_tank_press == 6.5549256507499996
+        assert farm[0].flow_out == 19542.86939891452
+
+    def test_view_level_hits_cache(self):
+        farm = fuel_farm()
+        farm[0].level = 20
+        before = utility_formulas.cached_gravity_flow_rate.cache_info()
+        for level in (19, 18.5, 17):
+            farm[0].level = level
+        after = utility_formulas.cached_gravity_flow_rate.cache_info()
+        assert after.hits - before.hits == 3
+        assert after.misses == before.misses
+
+    def test_view_empty(self):
+        farm = fuel_farm()
+        farm[0].level = -10
+        assert farm[0].level == 0.0
+        assert farm[0].static_tank_press == 0.0
+        assert farm[0].flow_out == 0.0
+
+    def test_view_str(self):
+        farm = fuel_farm()
+        with pytest.raises(TypeError) as excinfo:
+            farm[0].level = "a"
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Numeric values only."
+
+    def test_change_tank_level(self):
+        farm = fuel_farm()
+        fff.change_tank_level(farm[1], 36)
+        assert farm[1].level == 36.0
+        assert farm.pressures[1] == 13.109851301499999
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from PipingSystems.valve.valve import Gate, Globe
+from PipingSystems.valve.valve_bank import ValveBank
+
+
+def mixed_valves():
+    valves = []
+    for i in range(30):
+        kind = Globe if i % 2 else Gate
+        valves.append(kind("v{}".format(i), sys_flow_in=10.0 * i + 1.5, position=100, flow_coeff=(i % 5) * 7.5,
+                           press_in=20.0 + i))
+    return valves
+
+
+class TestValveBank:
+    def test_add_valve(self):
+        bank = ValveBank(capacity=1)
+        bank.add_valve("Valve 1", flow_coeff=15)
+        bank.add_valve("Valve 2", sys_flow_out=100, flow_coeff=15, throttling=True)
+        assert len(bank) == 2
+        assert bank.names == ["Valve 1", "Valve 2"]
+        assert bank.Cv.tolist() == [15.0, 15.0]
+        assert bank.throttling.tolist() == [False, True]
+
+    def test_press_drop(self):
+        bank = ValveBank()
+        bank.add_valve(sys_flow_out=100, flow_coeff=15)
+        bank.add_valve(sys_flow_out=100, drop=3.0)
+        invalid = bank.press_drop()
+        assert bank.deltaP.tolist() == [44.44444444444445, 3.0]
+        assert invalid.tolist() == [False, True]
+
+    def test_valve_flow_out(self):
+        bank = ValveBank()
+        bank.add_valve(drop=7.5, flow_coeff=15)
+        bank.add_valve(sys_flow_out=5.0, drop=0.0, flow_coeff=15)
+        bank.add_valve(sys_flow_out=6.0, drop=-1.0, flow_coeff=15)
+        invalid = bank.valve_flow_out()
+        assert bank.flow_out.tolist() == [41.07919181288746, 5.0, 6.0]
+        assert invalid.tolist() == [False, True, True]
+
+    def test_open_close_selected(self):
+        bank = ValveBank.from_valves(mixed_valves())
+        bank.close([0, 2])
+        assert bank.position[:4].tolist() == [0, 100, 0, 100]
+        assert bank.flow_out[0] == 0.0
+        bank.open(bank.position == 0)
+        assert (bank.position == 100).all()
+        assert bank.flow_out[0] == bank.flow_in[0]
+
+    def test_matches_scalar_valves(self):
+        valves = mixed_valves()
+        reference = mixed_valves()
+        bank = ValveBank.from_valves(valves)
+        positions = [0, 100, 50, 37, 100, 99, 12, 0, 64, 1] * 3
+        rejected = bank.turn_handle(positions)
+        for valve, position in zip(reference, positions):
+            valve.turn_handle(position)
+        bank.update_valves(valves)
+        for valve, expected in zip(valves, reference):
+            assert valve.position == expected.position
+            assert valve.flow_out == expected.flow_out
+            assert valve.deltaP == expected.deltaP
+            assert valve.press_out == expected.press_out
+        assert rejected.tolist() == [isinstance(v, Gate) and p not in (0, 100) for v, p in zip(reference, positions)]
+
+    def test_get_press_out(self):
+        valves = mixed_valves()
+        bank = ValveBank.from_valves(valves)
+        bank.get_press_out(np.arange(30.0))
+        for valve, press in zip(valves, range(30)):
+            valve.get_press_out(float(press))
+        bank_valves = mixed_valves()
+        bank.update_valves(bank_valves)
+        for valve, expected in zip(bank_valves, valves):
+            assert valve.press_in == expected.press_in
+            assert valve.press_out == expected.press_out
+
+    def test_turn_handle_integers_only(self):
+        bank = ValveBank.from_valves(mixed_valves())
+        with pytest.raises(TypeError, match="Integer values only."):
+            bank.turn_handle(50.5)
+        with pytest.raises(TypeError, match="Integer values only."):
+            bank.turn_handle(np.full(30, 50.0))
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import utility_formulas
+
+
+class TestGravityFlowArray:
+    def test_matches_scalar(self):
+        diameters = [2, 4, 16, 2, 0.5]
+        slopes = [1.67, 0.6, 0.25, 0.0, 3.1]
+        flows = utility_formulas.gravity_flow_rate_array(diameters, slopes)
+        for flow, diameter, slope in zip(flows, diameters, slopes):
+            assert flow == utility_formulas.gravity_flow_rate(diameter, slope)
+
+    def test_known_value(self):
+        flows = utility_formulas.gravity_flow_rate_array(np.array([2.0]), np.array([1.67]))
+        assert flows[0] == 319.28008077388426
+
+    def test_random_bit_compatible(self):
+        rng = np.random.default_rng(42)
+        diameters = rng.uniform(0.5, 36, 5000)
+        slopes = rng.uniform(0.0, 2.0, 5000)
+        coeffs = rng.choice([100, 120, 140, 150], 5000)
+        flows = utility_formulas.gravity_flow_rate_array(diameters, slopes, coeffs)
+        expected = [utility_formulas.gravity_flow_rate(d, s, c) for d, s, c in zip(diameters, slopes, coeffs)]
+        assert flows.tolist() == expected
+
+    def test_negative_slope(self):
+        with pytest.raises(ValueError):
+            utility_formulas.gravity_flow_rate_array([2, 2], [1.0, -1.0])
+
+
+class TestPressureArrays:
+    def test_static_press(self):
+        heights = np.array([14, 10, 8.0, 36.0])
+        presses = utility_formulas.static_press_array(heights)
+        assert presses.tolist() == [utility_formulas.static_press(h) for h in heights]
+        assert presses[0] == 6.068373888888889
+
+    def test_static_press_density(self):
+        presses = utility_formulas.static_press_array([36.0, 18.0], [1.629869, 1.629869])
+        assert presses.tolist() == [13.109851301499999, 6.5549256507499996]
+
+    def test_press_to_head(self):
+        presses = [3.5198796394144374, 10.206065759637188, 65.0]
+        heads = utility_formulas.press_to_head_array(presses)
+        assert heads.tolist() == [utility_formulas.press_to_head(p) for p in presses]
+        assert heads[0] == 8.119222584669064
+
+    def test_head_to_press(self):
+        heads = np.array([150, 12, 0.0])
+        presses = utility_formulas.head_to_press_array(heads, 0.84)
+        assert presses.tolist() == [utility_formulas.head_to_press(h, 0.84) for h in heads]
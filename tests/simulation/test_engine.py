@@ -0,0 +1,75 @@
+import pytest
+
+from PipingSystems.pump.pump import PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from Simulation.engine import ScanEngine, component_flow
+
+
+class TestScanEngine:
+    def test_bad_dt(self):
+        with pytest.raises(ValueError) as excinfo:
+            ScanEngine(0)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Scan period must be > 0."
+
+    def test_drain(self):
+        tank = Tank("tank1", 10)
+        engine = ScanEngine(dt=6)
+        engine.add_tank(tank, gal_per_ft=100, outflows=[lambda: 100.0])
+        engine.step()
+        assert tank.level == 9.9
+        assert engine.sim_time == 6.0
+        assert engine.scans == 1
+
+    def test_transfer(self):
+        source = Tank("source", 10)
+        dest = Tank("dest", 0)
+        pump = PositiveDisplacement("pump", displacement=0.5, pump_speed=0)
+        pump.adjust_speed(200)
+        engine = ScanEngine(dt=60)
+        engine.add_tank(source, gal_per_ft=100, outflows=[pump])
+        engine.add_tank(dest, gal_per_ft=50, inflows=[pump])
+        engine.run(120)
+        assert source.level == 8.0
+        assert dest.level == 4.0
+
+    def test_empty_tank_clamps(self):
+        tank = Tank("tank1", 1)
+        engine = ScanEngine()
+        engine.add_tank(tank, gal_per_ft=1, outflows=[lambda: 600.0])
+        engine.step()
+        assert tank.level == 0.0
+        assert tank.flow_out == 0.0
+
+    def test_tasks_run_each_scan(self):
+        calls = []
+        engine = ScanEngine(dt=0.5)
+        engine.add_task(lambda: calls.append(engine.sim_time))
+        stats = engine.run(2)
+        assert calls == [0.0, 0.5, 1.0, 1.5]
+        assert stats.scans == 4
+        assert stats.sim_time == 2.0
+
+    def test_paced_run(self):
+        engine = ScanEngine(dt=1.0)
+        stats = engine.run(5, speed=100)
+        assert stats.wall_time >= 0.04
+        assert stats.overruns == 0
+
+    def test_overruns(self):
+        engine = ScanEngine(dt=0.001)
+        engine.add_task(lambda: sum(range(20000)))
+        stats = engine.run(0.005, speed=1000)
+        assert stats.overruns == 5
+        assert engine.overruns == 5
+
+
+class TestComponentFlow:
+    def test_tank(self):
+        tank = Tank("tank1", outlet_diam=2, outlet_slope=1.67)
+        tank.level = 10
+        assert component_flow(tank) == 319.28008077388426
+
+    def test_pump(self):
+        pump = PositiveDisplacement("pump", flow_rate_out=28.8)
+        assert component_flow(pump) == 28.8
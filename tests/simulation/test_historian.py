@@ -0,0 +1,70 @@
+import sqlite3
+import threading
+
+from Models.FuelFarm.components import FuelFarm
+from Simulation.historian import Historian
+
+
+class TestHistorian:
+    def test_record_and_trend(self, tmp_path):
+        historian = Historian(str(tmp_path / "history.db"), batch_size=3)
+        for second in range(10):
+            historian.record(float(second), "tank1", "level", 36.0 - second)
+            historian.record(float(second), "tank2", "level", 18.0)
+        historian.flush()
+        times, values = historian.trend("tank1", "level", start=2, end=4)
+        assert times.tolist() == [2.0, 3.0, 4.0]
+        assert values.tolist() == [34.0, 33.0, 32.0]
+        assert historian.latest("tank1", "level") == (9.0, 27.0)
+        assert historian.latest("tank3", "level") is None
+        assert len(historian.query(start=5, component="tank2")) == 5
+        assert historian.rows_written == 20
+        historian.close()
+
+    def test_record_from_threads(self, tmp_path):
+        historian = Historian(str(tmp_path / "history.db"), batch_size=7)
+
+        def record(thread):
+            for second in range(500):
+                historian.record(float(second), "tank{}".format(thread), "level", 1.0)
+                historian.record_many([(float(second), "gate{}".format(thread), "position", 100.0)])
+
+        threads = [threading.Thread(target=record, args=(thread,)) for thread in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        historian.flush()
+        assert historian.rows_written == 4000
+        assert len(historian.query()) == 4000
+        historian.close()
+
+    def test_wal_and_indexes(self, tmp_path):
+        path = str(tmp_path / "history.db")
+        Historian(path).close()
+        connection = sqlite3.connect(path)
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        indexes = {row[1] for row in connection.execute("PRAGMA index_list(history)")}
+        assert indexes == {"history_component", "history_timestamp"}
+        connection.close()
+
+    def test_record_snapshots(self, tmp_path):
+        historian = Historian(str(tmp_path / "history.db"))
+        historian.record_snapshots([(1.0, {"tank1_static_tank_press": 13.1, "gate3_position": 100}),
+                                    (2.0, {"tank1_static_tank_press": 13.0, "gate3_position": 0})])
+        historian.flush()
+        assert historian.trend("tank1", "static_tank_press")[1].tolist() == [13.1, 13.0]
+        assert historian.trend("gate3", "position")[1].tolist() == [100.0, 0.0]
+        historian.close()
+
+    def test_record_changes(self, tmp_path):
+        farm = FuelFarm()
+        historian = Historian(str(tmp_path / "history.db"))
+        components = {"gate1": farm.gate1, "pump1": farm.pump1}
+        assert historian.record_changes(0.0, components) > 0
+        assert historian.record_changes(1.0, components) == 0
+        farm.gate1.position = 100
+        assert historian.record_changes(2.0, components) == 1
+        historian.flush()
+        assert historian.query(start=1.0) == [(2.0, "gate1", "position", 100.0)]
+        historian.close()
@@ -0,0 +1,90 @@
+import urllib.request
+
+import pytest
+
+import Models.FuelFarm.functionality as fff
+from Models.FuelFarm.components import FuelFarm
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Globe, Valve
+from Simulation.instrumentation import BUCKETS, METRIC, Instrumentation
+
+
+class TestInstrumentation:
+    def test_disabled_restores_originals(self):
+        open_method, level, gate1_open = Valve.__dict__["open"], Tank.__dict__["level"], fff.gate1_open
+        with Instrumentation() as probe:
+            assert probe.enabled
+            assert Valve.__dict__["open"] is not open_method
+            assert fff.gate1_open is not gate1_open
+        assert not probe.enabled
+        assert Valve.__dict__["open"] is open_method
+        assert Tank.__dict__["level"] is level
+        assert fff.gate1_open is gate1_open
+
+    def test_counts(self):
+        farm = FuelFarm()
+        with Instrumentation() as probe:
+            fff.gate1_open(farm)
+            fff.pump1_on(farm)
+            farm.tank1.level = 20.0
+        farm.gate1.close()  # Not counted once disabled
+        calls = {(row.method, row.component): row.count for row in probe.stats()}
+        assert calls["gate1_open", "functionality"] == 1
+        assert calls["Valve.open", farm.gate1.name] == 1
+        assert calls["pump1_on", "functionality"] == 1
+        assert calls["PositiveDisplacement.adjust_speed", farm.pump1.name] == 1
+        assert calls["Pump.pump_power", farm.pump1.name] == 1
+        assert calls["Tank.level", farm.tank1.name] == 1
+        assert calls["Tank.gravity_flow", farm.tank1.name] == 1
+        assert ("Valve.close", farm.gate1.name) not in calls
+        assert farm.tank1.level == 20.0
+
+    def test_results_unchanged(self):
+        plain = Globe("Globe", sys_flow_in=100, flow_coeff=15, press_in=50)
+        plain.turn_handle(40)
+        with Instrumentation():
+            measured = Globe("Globe", sys_flow_in=100, flow_coeff=15, press_in=50)
+            measured.turn_handle(40)
+        assert (measured.flow_out, measured.deltaP, measured.press_out) == (plain.flow_out, plain.deltaP,
+                                                                            plain.press_out)
+
+    def test_exceptions_recorded(self):
+        tank = Tank("Tank")
+        with Instrumentation() as probe:
+            with pytest.raises(TypeError):
+                tank.level = "a"
+        assert {(row.method, row.count) for row in probe.stats()} == {("Tank.level", 1), ("Tank.gravity_flow", 1)}
+
+    def test_single_instance(self):
+        with Instrumentation():
+            with pytest.raises(RuntimeError, match="Instrumentation is already enabled."):
+                Instrumentation().enable()
+
+    def test_prometheus(self, tmp_path):
+        probe = Instrumentation(targets=(), action_modules=())
+        probe.record("Valve.open", 'gate "1"', 3e-7)
+        probe.record("Valve.open", 'gate "1"', 2.0)
+        text = probe.prometheus_text()
+        labels = 'method="Valve.open",component="gate \\"1\\""'
+        assert "# TYPE {} histogram".format(METRIC) in text
+        assert '{}_bucket{{{},le="2.5e-07"}} 0'.format(METRIC, labels) in text
+        assert '{}_bucket{{{},le="5e-07"}} 1'.format(METRIC, labels) in text
+        assert '{}_bucket{{{},le="{}"}} 1'.format(METRIC, labels, BUCKETS[-1]) in text
+        assert '{}_bucket{{{},le="+Inf"}} 2'.format(METRIC, labels) in text
+        assert "{}_count{{{}}} 2".format(METRIC, labels) in text
+        path = str(tmp_path / "vplc.prom")
+        probe.write_prometheus(path)
+        with open(path) as file:
+            assert file.read() == text
+
+    def test_serve(self):
+        probe = Instrumentation(targets=(), action_modules=())
+        probe.record("Tank.level", "tank1", 1e-6)
+        server = probe.serve(port=0)
+        try:
+            url = "http://127.0.0.1:{}/metrics".format(server.server_address[1])
+            with urllib.request.urlopen(url) as response:
+                assert response.read().decode() == probe.prometheus_text()
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,113 @@
+import math
+
+import pytest
+
+from PipingSystems.pump.pump import CentrifPump, PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Gate, Globe
+from Simulation.network import HydraulicNetwork
+
+
+class TestValves:
+    def test_series(self):
+        network = HydraulicNetwork()
+        network.add_node("supply", pressure=10)
+        network.add_node("outlet", pressure=0)
+        network.add_valve(Gate("V1", position=100, flow_coeff=10), "supply", "middle")
+        network.add_valve(Gate("V2", position=100, flow_coeff=10), "middle", "outlet")
+        result = network.solve()
+        assert result.converged
+        assert result.pressure("middle") == pytest.approx(5.0)
+        assert result.valve_flows == pytest.approx([10 * math.sqrt(5)] * 2)
+
+    def test_throttled(self):
+        network = HydraulicNetwork(spec_grav=0.84)
+        network.add_node("supply", pressure=20)
+        network.add_node("outlet", pressure=4)
+        globe = Globe("Throttle", position=50, flow_coeff=21)
+        network.add_valve(globe, "supply", "outlet")
+        network.apply(network.solve())
+        assert globe.flow_out == pytest.approx(10.5 * math.sqrt(16 / 0.84))
+        assert globe.deltaP == 16.0
+
+    def test_closed_valve_isolates(self):
+        network = HydraulicNetwork()
+        network.add_node("supply", pressure=10)
+        network.add_valve(Gate("V1", position=0, flow_coeff=10), "supply", "dead end")
+        result = network.solve()
+        assert result.pressure("dead end") == 0.0
+        assert result.valve_flows.tolist() == [0.0]
+
+    def test_demand(self):
+        tank = Tank("Tank", outlet_diam=2, outlet_slope=1)
+        tank.level = 14
+        network = HydraulicNetwork()
+        network.add_tank(tank)
+        network.add_node("user", demand=30)
+        network.add_valve(Gate("V1", position=100, flow_coeff=20), "Tank", "user")
+        result = network.solve()
+        assert result.valve_flows[0] == pytest.approx(30)
+        assert result.pressure("user") == pytest.approx(tank.static_tank_press - 2.25)
+
+
+class TestPumps:
+    def test_centrifugal(self):
+        pump = CentrifPump("Pump", pump_speed=1750)
+        network = HydraulicNetwork()
+        network.add_node("suction", pressure=0)
+        network.add_node("outlet", pressure=20)
+        network.add_pump(pump, "suction", "discharge", shutoff_press=40, max_flow=100)
+        network.add_valve(Gate("V1", position=100, flow_coeff=30), "discharge", "outlet")
+        network.apply(network.solve())
+        assert 40 * (1 - (pump.flow / 100) ** 2) == pytest.approx(pump.outlet_pressure)
+        assert pump.outlet_pressure - 20 == pytest.approx((pump.flow / 30) ** 2)
+
+    def test_centrifugal_affinity(self):
+        pump = CentrifPump("Pump", pump_speed=1750)
+        network = HydraulicNetwork()
+        network.add_node("suction", pressure=0)
+        network.add_node("outlet", pressure=0)
+        network.add_pump(pump, "suction", "outlet", shutoff_press=40, max_flow=100)
+        pump.speed = 875
+        assert network.solve().pump_flows == pytest.approx([50])
+
+    def test_stopped_centrifugal(self):
+        pump = CentrifPump("Pump", pump_speed=1750)
+        network = HydraulicNetwork()
+        network.add_node("suction", pressure=0)
+        network.add_node("outlet", pressure=10)
+        network.add_pump(pump, "suction", "outlet", shutoff_press=40, max_flow=100)
+        pump.speed = 0
+        assert network.solve().pump_flows.tolist() == [0.0]
+
+    def test_curve_required(self):
+        with pytest.raises(ValueError) as excinfo:
+            HydraulicNetwork().add_pump(CentrifPump("Pump"), "a", "b")
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Pump curve values must be > 0."
+
+    def test_displacement(self):
+        pump = PositiveDisplacement("Gear", displacement=0.1)
+        pump.speed = 300
+        network = HydraulicNetwork()
+        network.add_node("supply", pressure=5)
+        network.add_node("outlet", pressure=30)
+        network.add_valve(Gate("V1", position=100, flow_coeff=10), "supply", "suction")
+        network.add_pump(pump, "suction", "discharge")
+        network.add_valve(Gate("V2", position=100, flow_coeff=10), "discharge", "outlet")
+        network.apply(network.solve())
+        assert pump.flow == pytest.approx(30)
+        assert pump.outlet_pressure == pytest.approx(39)
+
+    def test_displacement_starved(self):
+        pump = PositiveDisplacement("Gear", displacement=0.1)
+        pump.speed = 300
+        network = HydraulicNetwork()
+        network.add_node("supply", pressure=5)
+        network.add_node("outlet", pressure=30)
+        network.add_valve(Gate("V1", position=0, flow_coeff=10), "supply", "suction")
+        network.add_pump(pump, "suction", "discharge")
+        network.add_valve(Gate("V2", position=100, flow_coeff=10), "discharge", "outlet")
+        result = network.solve()
+        assert result.displacement_flows.tolist() == [0.0]
+        assert result.valve_flows.tolist() == [0.0, 0.0]
@@ -0,0 +1,102 @@
+import pytest
+
+from PipingSystems.pump.pump import PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.plant_loader import build_plant, compile_plant
+from PipingSystems.valve.valve import Gate, Globe, Relief, Valve
+from Simulation.propagation import DependencyGraph
+
+
+def branch(graph, source, length):
+    """Connect a chain of open gate valves to a source."""
+    valves = [Gate("V{}".format(i), position=100, flow_coeff=200) for i in range(length)]
+    upstream = source
+    for valve in valves:
+        graph.connect(upstream, valve)
+        upstream = valve
+    return valves
+
+
+class TestDependencyGraph:
+    def setup_method(self):
+        self.tank = Tank("Tank", outlet_diam=2, outlet_slope=1.67)
+        self.tank.level = 14
+        self.graph = DependencyGraph()
+
+    def test_chain(self):
+        valves = branch(self.graph, self.tank, 5)
+        assert self.graph.changed(self.tank) == 5
+        assert valves[-1].flow_out == self.tank.flow_out
+        assert valves[-1].press_out == self.tank.static_tank_press
+
+    def test_closing_stops_downstream(self):
+        valves = branch(self.graph, self.tank, 5)
+        self.graph.changed(self.tank)
+        assert self.graph.run(valves[2].close, valves[2]) == 2
+        assert valves[4].flow_out == 0
+        assert valves[1].flow_out == self.tank.flow_out
+
+    def test_unchanged_stops_propagation(self):
+        valves = branch(self.graph, self.tank, 5)
+        self.graph.changed(self.tank)
+        assert self.graph.changed(valves[0]) == 1
+        assert self.graph.recomputed == 1
+        assert self.graph.events == 2
+        assert self.graph.total_recomputed == 6
+
+    def test_only_affected_branch(self):
+        branches = [branch(self.graph, self.tank, 10) for _ in range(20)]
+        self.graph.changed(self.tank)
+        assert self.graph.recomputed == 200
+        assert self.graph.run(branches[7][5].close, branches[7][5]) == 4
+
+    def test_merge_and_throttle(self):
+        tank2 = Tank("Tank 2", outlet_diam=2, outlet_slope=1.67)
+        tank2.level = 20
+        left = Gate("Left", position=100, flow_coeff=200)
+        right = Gate("Right", position=100, flow_coeff=200)
+        globe = Globe("Throttle", position=50, flow_coeff=21)
+        for upstream, downstream in ((self.tank, left), (tank2, right), (left, globe), (right, globe)):
+            self.graph.connect(upstream, downstream)
+        self.graph.changed(self.tank, tank2)
+        assert globe.flow_in == self.tank.flow_out + tank2.flow_out
+        assert globe.press_in == tank2.static_tank_press
+        assert globe.flow_out == globe.flow_in / 2
+
+    def test_valves_without_throttling(self):
+        relief = Relief("Relief", position=50, flow_coeff=200, open_press=100, close_press=1)  # Holding partly open
+        valve = Valve("Valve", position=50, flow_coeff=200)
+        self.graph.connect(self.tank, relief)
+        self.graph.connect(relief, valve)
+        self.graph.changed(self.tank)
+        assert relief.position == valve.position == 50
+        assert valve.flow_out == relief.flow_out == self.tank.flow_out
+        assert relief.press_out == pytest.approx(self.tank.static_tank_press - relief.deltaP)
+        assert valve.press_out < relief.press_out
+
+    def test_plant_graph_relief(self):
+        plant = build_plant(compile_plant({"components": [
+            {"id": "t1", "type": "tank", "level": 14, "outlet_diam": 2, "outlet_slope": 1.67},
+            {"id": "r1", "type": "relief", "position": 50, "flow_coeff": 200, "open_press": 100, "close_press": 1,
+             "inlets": ["t1"]}]}))
+        graph = plant.graph()
+        assert graph.changed(plant.t1) == 1
+        assert plant.r1.flow_out == plant.t1.flow_out
+
+    def test_pump_suction(self):
+        valve = Gate("Suction", position=100, flow_coeff=200)
+        pump = PositiveDisplacement("Pump", displacement=0.1)
+        self.graph.connect(self.tank, valve)
+        self.graph.connect(valve, pump)
+        self.graph.changed(self.tank)
+        assert pump.head_in == pytest.approx(14, rel=1e-3)
+
+    def test_cycle(self):
+        first = Gate("First")
+        second = Gate("Second")
+        self.graph.connect(first, second)
+        self.graph.connect(second, first)
+        with pytest.raises(ValueError) as excinfo:
+            self.graph.changed(first)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Dependency graph contains a cycle."
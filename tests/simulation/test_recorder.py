@@ -0,0 +1,72 @@
+import sys
+
+import numpy as np
+import pytest
+
+from Models.FuelFarm.components import FuelFarm
+from Models.FuelFarm.runtime import recorder_fields
+from PipingSystems.storage_tank.tank import Tank
+from Simulation.recorder import TelemetryReader, TelemetryRecorder
+
+
+class TestTelemetryRecorder:
+    def test_record_and_read(self, tmp_path):
+        path = str(tmp_path / "scan.rec")
+        tank = Tank("t", level=0.0)
+        recorder = TelemetryRecorder(path, [("level", tank, "level")], capacity=10)
+        reader = TelemetryReader(path)
+        for scan in range(4):
+            tank.level = float(scan)
+            recorder.record(scan * 0.01)
+        assert reader.names == ["level"]
+        assert reader.count() == 4
+        segment, = reader.segments()
+        assert segment[:, 0].tolist() == [0.0, 0.01, 0.02, 0.03]
+        assert segment[:, 1].tolist() == [0.0, 1.0, 2.0, 3.0]
+        assert np.shares_memory(reader.column("level"), reader.records)
+        recorder.close()
+        reader.close()
+
+    def test_wraparound(self, tmp_path):
+        path = str(tmp_path / "scan.rec")
+        farm = FuelFarm()
+        recorder = TelemetryRecorder(path, recorder_fields(farm), capacity=8, clock=lambda: 0.0)
+        for scan in range(21):
+            farm.pump1.speed = scan
+            recorder.record()
+        recorder.close()
+        reader = TelemetryReader(path)
+        assert reader.count() == 21
+        first, second = reader.segments()
+        assert first.base is not None and second.base is not None
+        assert reader.ordered()[:, 1 + reader.names.index("pump1_speed")].tolist() == list(range(13, 21))
+        reader.close()
+
+    def test_portable_writer(self, tmp_path, monkeypatch):
+        tank = Tank("t", level=2.5)
+        native, portable = str(tmp_path / "native.rec"), str(tmp_path / "portable.rec")
+        recorder = TelemetryRecorder(native, [("level", tank, "level")], capacity=4)
+        monkeypatch.setattr(sys, "byteorder", "big")  # Write through the little-endian NumPy views
+        other = TelemetryRecorder(portable, [("level", tank, "level")], capacity=4)
+        monkeypatch.undo()
+        for scan in range(6):
+            recorder.record(scan * 0.5)
+            other.record(scan * 0.5)
+        recorder.close()
+        other.close()
+        with open(native, "rb") as file1, open(portable, "rb") as file2:
+            assert file1.read() == file2.read()
+        reader = TelemetryReader(portable)
+        assert reader.count() == 6
+        assert reader.ordered()[:, 0].tolist() == [1.0, 1.5, 2.0, 2.5]
+        reader.close()
+
+    def test_not_a_recording(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\0" * 128)
+        with pytest.raises(ValueError, match="Not a telemetry recording"):
+            TelemetryReader(str(path))
+
+    def test_bad_capacity(self, tmp_path):
+        with pytest.raises(ValueError, match="Capacity must be > 0."):
+            TelemetryRecorder(str(tmp_path / "scan.rec"), [], capacity=0)
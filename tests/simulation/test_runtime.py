@@ -0,0 +1,142 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from Models.FuelFarm.components import FuelFarm
+from Models.FuelFarm.runtime import build_runtime
+from Simulation.runtime import PLCRuntime
+
+
+class Counter:
+    def __init__(self):
+        self.steps = 0
+
+    def step(self):
+        self.steps += 1
+
+
+class TestPLCRuntime:
+    def test_bad_period(self):
+        with pytest.raises(ValueError, match="Scan period must be > 0."):
+            PLCRuntime(Counter(), period=0)
+
+    def test_fixed_period(self):
+        engine = Counter()
+        runtime = PLCRuntime(engine, period=0.005)
+        stats = asyncio.run(runtime.run(duration=0.1))
+        # 20 periods; the scheduled times accumulate floats, and a loaded machine skips periods it overruns
+        assert engine.steps == stats.scans
+        assert 10 <= stats.scans <= 21
+
+    def test_commands_run_in_scan(self):
+        engine = Counter()
+        runtime = PLCRuntime(engine, period=0.001)
+
+        async def main():
+            task = asyncio.create_task(runtime.run())
+            result = await runtime.command(lambda: engine.steps)
+            runtime.stop()
+            await task
+            return result
+
+        assert asyncio.run(main()) >= 0
+        assert runtime.stats().commands == 1
+
+    def test_slow_client_drops(self):
+        runtime = PLCRuntime(Counter(), period=0.001, queue_size=4)
+
+        async def main():
+            queue = runtime.subscribe()
+            await runtime.run(duration=0.02)
+            return queue
+
+        queue = asyncio.run(main())
+        assert queue.qsize() == 4
+        assert runtime.stats().dropped_telemetry == runtime.scans - 4
+
+    def test_history(self):
+        written = []
+
+        def writer(records):
+            time.sleep(0.01)  # A slow writer must not hold up the scan
+            written.extend(records)
+
+        runtime = PLCRuntime(Counter(), period=0.002, history=writer, history_interval=0.01)
+        stats = asyncio.run(runtime.run(duration=0.05))
+        assert len(written) == stats.history_records == stats.scans
+        assert [snapshot["scan"] for _, snapshot in written] == list(range(1, stats.scans + 1))
+
+    def test_history_writes_one_at_a_time(self):
+        active = []
+        overlaps = []
+        written = []
+
+        def writer(records):
+            active.append(records)
+            overlaps.append(len(active) > 1)
+            time.sleep(0.02)  # Still running when run() ends and flushes the rest
+            written.extend(records)
+            active.remove(records)
+
+        runtime = PLCRuntime(Counter(), period=0.002, history=writer, history_interval=0.01)
+        stats = asyncio.run(runtime.run(duration=0.03))
+        assert not any(overlaps)
+        assert len(written) == stats.scans
+
+    def test_device_command_needs_dispatcher(self):
+        runtime = PLCRuntime(Counter())
+        with pytest.raises(ValueError, match="Device commands need a dispatcher."):
+            runtime.submit(("gate1", True))
+
+
+class TestFuelFarmRuntime:
+    def test_telemetry_server(self):
+        farm = FuelFarm()
+        runtime = build_runtime(period=0.002, farm=farm)
+
+        async def main():
+            server = await runtime.serve_telemetry()
+            host, port = server.sockets[0].getsockname()[:2]
+            task = asyncio.create_task(runtime.run())
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(json.dumps({"group": "gate1", "state": True}).encode() + b"\n")
+            await writer.drain()
+            snapshot = {}
+            while snapshot.get("gate1_position") != 100:
+                snapshot = json.loads(await reader.readline())
+            writer.close()
+            runtime.stop()
+            await task
+            server.close()
+            await server.wait_closed()
+            return snapshot
+
+        snapshot = asyncio.run(main())
+        assert snapshot["gate1_position"] == farm.gate1.position == 100
+
+    def test_telemetry_bad_state(self):
+        farm = FuelFarm()
+        farm.gate1.open()
+        runtime = build_runtime(period=0.002, farm=farm)
+
+        async def main():
+            server = await runtime.serve_telemetry()
+            host, port = server.sockets[0].getsockname()[:2]
+            task = asyncio.create_task(runtime.run())
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(json.dumps({"group": "gate1", "state": "open"}).encode() + b"\n")
+            await writer.drain()
+            reply = {}
+            while "error" not in reply:
+                reply = json.loads(await reader.readline())
+            writer.close()
+            runtime.stop()
+            await task
+            server.close()
+            await server.wait_closed()
+            return reply
+
+        assert asyncio.run(main()) == {"error": "Unknown device state: open"}
+        assert farm.gate1.position == 100
@@ -0,0 +1,160 @@
+import json
+import zlib
+
+import numpy as np
+import pytest
+
+import Models.FuelFarm.functionality as fff
+from Models.FuelFarm.components import PLANT_FILE, FuelFarm
+from PipingSystems.component_state import get_state
+from PipingSystems.plant_loader import load_plant
+from PipingSystems.pump.pump import CentrifPump
+from PipingSystems.pump.pump_curve import PumpCurve
+from PipingSystems.storage_tank import geometry
+from PipingSystems.storage_tank.tank import Tank
+from Simulation import snapshot
+from Simulation.snapshot import load_snapshot, read_snapshot, restore_snapshot, save_snapshot, snapshot_bytes
+
+
+def assert_same(plant, farm):
+    for name, component in vars(farm).items():
+        restored = getattr(plant, name)
+        assert type(restored) is type(component)
+        state = get_state(restored)
+        assert state == get_state(component)
+        assert [type(value) for value in state.values()] == [type(value) for value in get_state(component).values()]
+
+
+def tampered(data, edit, trim=0):
+    """Rewrite a snapshot's metadata with edit(metadata), and drop trim bytes of column data, keeping the CRC valid."""
+    magic, version, reserved, _, length, metadata_length = snapshot._HEADER.unpack_from(data)
+    payload = data[snapshot._HEADER.size:]
+    metadata = json.loads(payload[:metadata_length])
+    edit(metadata)
+    encoded = json.dumps(metadata).encode()
+    payload = encoded + payload[metadata_length:len(payload) - trim]
+    return snapshot._HEADER.pack(magic, version, reserved, zlib.crc32(payload), len(payload), len(encoded)) + payload
+
+
+class TestSnapshot:
+    def test_round_trip(self):
+        farm = FuelFarm()
+        fff.gate1_open(farm)
+        fff.gate5_open(farm)
+        fff.pump1_on(farm)
+        assert_same(read_snapshot(snapshot_bytes(farm)), farm)
+
+    def test_restored_plant_runs(self):
+        farm = FuelFarm()
+        plant = read_snapshot(snapshot_bytes(farm))
+        fff.gate1_open(plant)
+        fff.gate1_open(farm)
+        assert_same(plant, farm)
+
+    def test_file(self, tmp_path):
+        plant = load_plant(PLANT_FILE, cache=False)
+        path = str(tmp_path / "farm.snap")
+        save_snapshot(plant, path)
+        restored = load_snapshot(path)
+        assert restored.connections() == plant.connections()
+        assert_same(restored, FuelFarm())
+
+    def test_restore_in_place(self):
+        farm = FuelFarm()
+        checkpoint = snapshot_bytes(farm)
+        fff.gate2_open(farm)
+        fff.change_tank_level(farm.tank2, 12.0, farm)
+        restore_snapshot(checkpoint, farm)
+        assert_same(farm, FuelFarm())
+
+    def test_corrupt(self):
+        data = bytearray(snapshot_bytes(FuelFarm()))
+        data[-1] ^= 0xFF
+        with pytest.raises(ValueError, match="Snapshot checksum mismatch."):
+            read_snapshot(bytes(data))
+        with pytest.raises(ValueError, match="Snapshot checksum mismatch."):
+            read_snapshot(bytes(data[:-8]))
+        with pytest.raises(ValueError, match="Not a plant snapshot."):
+            read_snapshot(b"PK\x03\x04" + bytes(40))
+
+    def test_malformed_metadata(self):
+        farm = FuelFarm()
+        farm.pump1.curve = PumpCurve([0, 100, 200], [50, 45, 30])
+        data = snapshot_bytes(farm)
+
+        def curve_column(metadata):
+            group = next(group for group in metadata["classes"] if "pump1" in group["components"])
+            return next(column for column in group["columns"] if column[0].endswith("curve"))
+
+        def bad_reference(metadata):
+            curve_column(metadata)[2] = [{"$object": 5}] * len(curve_column(metadata)[2])
+
+        def bad_arguments(metadata):
+            metadata["objects"][0]["arguments"] = {"speeds": [1]}
+
+        edits = [lambda metadata: metadata.pop("classes"), bad_reference, bad_arguments,
+                 lambda metadata: curve_column(metadata)[2].pop(),
+                 lambda metadata: curve_column(metadata).__setitem__(0, "colour")]
+        for edit in edits:
+            with pytest.raises(ValueError):
+                read_snapshot(tampered(data, edit))
+        with pytest.raises(ValueError, match="truncated"):
+            read_snapshot(tampered(data, lambda metadata: None, trim=8))
+        with pytest.raises(ValueError, match="does not match"):
+            restore_snapshot(tampered(data, lambda metadata: metadata["classes"].pop()), farm)
+        restored = read_snapshot(tampered(data, lambda metadata: None))
+        assert restored.pump1.operate(20, 1e-5) == farm.pump1.operate(20, 1e-5)
+
+    def test_version(self):
+        data = bytearray(snapshot_bytes(FuelFarm()))
+        data[8] = 99
+        with pytest.raises(ValueError, match="Unsupported snapshot version: 99"):
+            read_snapshot(bytes(data))
+
+    def test_restore_mismatch(self):
+        checkpoint = snapshot_bytes({"gate1": FuelFarm().gate1})
+        with pytest.raises(ValueError, match="Component gate1 not found in plant"):
+            restore_snapshot(checkpoint, {})
+        with pytest.raises(ValueError, match="Component gate1 is a Tank, not a Gate"):
+            restore_snapshot(checkpoint, {"gate1": FuelFarm().tank1})
+
+    def test_unsupported_value(self):
+        farm = FuelFarm()
+        farm.gate1.press_in = object()
+        with pytest.raises(ValueError, match="Cannot snapshot plant"):
+            snapshot_bytes(farm)
+        with pytest.raises(ValueError, match="Cannot snapshot component pipe of type dict"):
+            snapshot_bytes({"pipe": {}})
+
+    def test_mixed_columns(self):
+        farm = FuelFarm()
+        farm.gate1.press_in = None
+        farm.gate2.press_in = 3
+        farm.gate3.press_in = 2 ** 70
+        assert_same(read_snapshot(snapshot_bytes(farm)), farm)
+
+    def test_curves_and_geometries(self):
+        curve = PumpCurve([0, 500, 1000], [100, 90, 60], efficiency=[0, 0.8, 0.6], rated_speed=1750)
+        shapes = [geometry.VerticalCylinder(60, 36), geometry.HorizontalCylinder(10, 40, resolution=64),
+                  geometry.Sphere(20), geometry.StrappingTable([0, 1, 2], [0, 100, 250])]
+        plant = {"pump1": CentrifPump("Pump 1", pump_speed=1750, curve=curve),
+                 "pump2": CentrifPump("Pump 2", pump_speed=1200, curve=curve)}
+        for number, shape in enumerate(shapes + shapes):
+            name = "tank{}".format(number)
+            plant[name] = Tank(name, 5.0, geometry=shape)
+        restored = read_snapshot(snapshot_bytes(plant))
+        assert restored.pump1.curve is restored.pump2.curve
+        assert restored.pump1.curve.npshr is None
+        assert restored.pump1.curve.efficiency.tolist() == curve.efficiency.tolist()
+        assert restored.pump1.operate(20, 1e-5) == plant["pump1"].operate(20, 1e-5)
+        for number, shape in enumerate(shapes):
+            tank = getattr(restored, "tank{}".format(number))
+            assert type(tank.geometry) is type(shape)
+            assert tank.geometry is getattr(restored, "tank{}".format(number + len(shapes))).geometry
+            assert np.array_equal(tank.geometry.levels, shape.levels)
+            assert tank.volume == plant["tank{}".format(number)].volume
+
+    def test_version_1(self):
+        data = bytearray(snapshot_bytes(FuelFarm()))
+        data[8] = 1  # Plants without curves or geometries are stored the same way
+        assert_same(read_snapshot(bytes(data)), FuelFarm())